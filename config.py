@@ -114,6 +114,157 @@ SCAM_KEYWORD_THRESHOLD  = 2
 VOICE_ANOMALY_THRESHOLD = 0.6
 VIDEO_DEEPFAKE_THRESHOLD = 0.5
 
+# ── Voice pipeline ───────────────────────────────────────────
+# Call-level language pinning: after N confident chunks agree, Whisper
+# is told the language instead of re-detecting it on every chunk.
+LANGUAGE_PIN_CONFIRM_CHUNKS = 3      # agreeing chunks before pinning
+LANGUAGE_PIN_MIN_PROB       = 0.70   # Whisper language probability
+LANGUAGE_PIN_RECHECK_CHUNKS = 12     # re-detect once every N pinned chunks
+
+# Recorded-call ingestion: files are read and transcribed in windows of
+# this length so memory stays constant and alerts surface as they happen.
+AUDIO_FILE_WINDOW_SECS      = 30     # Whisper's native context length
+
+# Per-stage latency histograms (record / wav / transcribe / filter / nlp)
+STAGE_TIMER_WINDOW          = 200    # recent chunks kept per stage
+
+# Live mic backpressure: bounded queue between capture and Whisper.
+# Policies: "drop_oldest", "merge" (longer Whisper calls), "degrade"
+# (switch to MIC_DEGRADE_MODEL while behind real time).
+MIC_QUEUE_MAX_CHUNKS        = 3
+MIC_QUEUE_POLICY            = "drop_oldest"
+MIC_MAX_MERGE_SECS          = 15
+MIC_DEGRADE_MODEL           = "tiny"
+
+# On-audio keyword spotting in front of live transcription. Template
+# recordings live in KWS_TEMPLATE_DIR, one phrase per file name.
+KWS_TEMPLATE_DIR            = "assets/kws/"
+KWS_THRESHOLD               = 0.35   # max normalized DTW cost for a hit
+KWS_SILENCE_RMS             = 0.005  # below this a chunk is treated as silence
+KWS_SAMPLE_EVERY            = 4      # benign chunks: transcribe 1 in N
+KWS_HOLD_CHUNKS             = 3      # stay at full beam after a hit
+KWS_ESCALATE_BEAM           = 8
+
+# Multi-channel call recordings: caller and victim on separate channels.
+# Only the caller channel is scored by the NLP engine.
+CALL_CHANNELS               = 1      # 2 for stereo call recordings
+CALLER_CHANNEL              = 0
+
+# Capture at the input device's native rate (None = ask the device) and
+# resample to Whisper's 16 kHz with a streaming polyphase filter.
+MIC_CAPTURE_RATE            = None
+
+# ── Video pipeline ───────────────────────────────────────────
+# Detect-then-track: full Haar detection every N frames (or on track
+# loss); in between the face is template-matched near its last position.
+VIDEO_DETECT_INTERVAL       = 10     # 0 or 1 = detect every frame
+VIDEO_TRACK_MIN_SCORE       = 0.60   # normalized correlation to keep a track
+VIDEO_TRACK_MARGIN          = 0.25   # search window padding, fraction of face size
+VIDEO_TRACK_SCALE           = 0.5    # match on a downscaled window
+# Haar detection runs on a downscaled gray frame; boxes are mapped back
+# and signals still read the full-resolution ROI. "auto" picks the scale
+# from the last face width so it lands near VIDEO_DETECT_TARGET_FACE px.
+VIDEO_DETECT_SCALE          = "auto" # float in (0, 1] or "auto"
+VIDEO_DETECT_TARGET_FACE    = 48     # face width (px) to aim for at detection scale
+VIDEO_DETECT_MIN_SCALE      = 0.25
+VIDEO_MIN_FACE              = 120    # smallest face (px, full resolution)
+# Face detector backend for the full detections: "haar" (frontal cascade,
+# above), "res10" (cv2.dnn SSD, Caffe) or "yunet" (cv2.FaceDetectorYN,
+# ONNX). The DNN backends run on a fixed-size input and need their model
+# files (OpenCV samples / opencv_zoo); compare them with
+# `python -m core.video.benchmark` on the deployment machine.
+VIDEO_FACE_BACKEND          = "haar"
+VIDEO_RES10_PROTO           = None   # e.g. "assets/models/deploy.prototxt"
+VIDEO_RES10_MODEL           = None   # e.g. "assets/models/res10_300x300_ssd_iter_140000.caffemodel"
+VIDEO_RES10_INPUT           = 300    # px, square blob
+VIDEO_YUNET_MODEL           = None   # e.g. "assets/models/face_detection_yunet_2023mar.onnx"
+VIDEO_YUNET_INPUT           = 320    # px, input width (height keeps the frame's aspect)
+VIDEO_DNN_CONFIDENCE        = 0.6    # minimum face score for the DNN backends
+# Movement signal: "lk" (sparse Lucas-Kanade) or "farneback" (dense flow),
+# both on the canonical 100x100 face patch
+VIDEO_MOTION_ENGINE         = "lk"
+VIDEO_LK_MAX_POINTS         = 40
+# Blinks are timed rather than counted in frames, so they hold at any
+# analysis rate; movement restarts after a gap (face lost) this long.
+VIDEO_BLINK_MIN_SECS        = 0.12   # eyes-seen to eyes-seen gap for a blink (3 missing frames at 30 fps)
+VIDEO_MOTION_MAX_GAP        = 0.5    # seconds
+# Blink engine: "cascade" (eye cascade on the upper-face band) or "lbf"
+# (68-point landmarks → eye aspect ratio; needs opencv-contrib-python and
+# the LBF model file, e.g. lbfmodel.yaml from the OpenCV model zoo).
+VIDEO_BLINK_ENGINE          = "cascade"
+VIDEO_EYE_BAND              = (0.15, 0.55)  # face-box rows searched for eyes
+VIDEO_EYE_FACE_WIDTH        = 120    # band resized so the face is this wide (px)
+VIDEO_LANDMARK_MODEL        = None   # e.g. "assets/models/lbfmodel.yaml"
+VIDEO_EAR_CLOSED            = 0.21   # eye aspect ratio below this = eyes shut
+# Frame governor: analyze every k-th frame so analysis stays within a
+# share of one core; skipped frames show the last result.
+VIDEO_CPU_BUDGET            = 0.5    # share of one core; None = every frame it can reach
+VIDEO_GOVERNOR_MAX_INTERVAL = 0.10   # seconds between analyses, at most: k ≤ 3 at 30 fps
+                                     # still times every blink of 100 ms or longer
+VIDEO_GOVERNOR_MIN_STRIDE   = 2      # ...but k may always reach this, so the budget
+                                     # still applies to 15 fps and slower cameras
+# Spectral artifact signal: radial power spectrum of a native-resolution
+# crop from the middle of the face (one rfft2 + one bincount per frame)
+VIDEO_SPECTRAL_PATCH        = 64     # px, square
+# Repeated / looped footage: 64-bit DCT hash of the frame with the face
+# blanked, kept for the last VIDEO_HASH_INDEX analyzed face frames.
+# Pixel-identical consecutive frames reuse the previous analysis.
+VIDEO_HASH_INDEX            = 512    # entries (~17 s at 30 fps)
+VIDEO_HASH_NEAR_BITS        = 4      # ≤ this many differing bits (of 64) = repeat
+VIDEO_HASH_CHANGE_BITS      = 6      # some frame in between must be this much further away
+VIDEO_LOOP_MIN_SECS         = 1.0    # shortest loop period considered
+VIDEO_LOOP_WINDOW           = 60     # recent frames scored for periodicity
+VIDEO_LOOP_TOLERANCE        = 0.1    # seconds; lags this close count as one period
+# Optional learned classifier (ONNX Runtime, CPU). None = heuristics only.
+VIDEO_CLASSIFIER_MODEL      = None   # e.g. "assets/models/deepfake_face.onnx"
+VIDEO_CLASSIFIER_INPUT      = 224    # used when the model's input size is dynamic
+VIDEO_CLASSIFIER_THREADS    = 2
+VIDEO_CLASSIFIER_STRIDE     = 5      # classify every Nth frame per stream
+VIDEO_CLASSIFIER_MAX_BATCH  = 8
+VIDEO_CLASSIFIER_MAX_WAIT_MS = 200   # flush a partial batch after this long
+VIDEO_CLASSIFIER_MAX_PENDING = 32    # crops waiting at most; the oldest are dropped
+VIDEO_CLASSIFIER_THRESHOLD  = 0.5    # mean fake probability that adds risk
+VIDEO_CLASSIFIER_WEIGHT     = 40     # risk points at probability 1.0
+# Risk scoring. A signal adds its *_points when its rolling mean crosses
+# the threshold; replay recordings with core.video.replay to tune these.
+VIDEO_THRESHOLDS = {
+    "calibration_secs"  : 15,     # blink / stillness are judged after this
+    "blink_low"         : 4,      # blinks per minute
+    "blink_low_points"  : 30,
+    "blink_high"        : 45,
+    "blink_high_points" : 15,
+    "texture"           : 0.55,   # over-smoothing, above
+    "texture_points"    : 25,
+    "lighting"          : 0.25,   # left/right asymmetry, above
+    "lighting_points"   : 20,
+    "symmetry"          : 0.18,   # mirror difference, above
+    "symmetry_points"   : 15,
+    "spectral"          : 0.35,   # high-band rise over power law + noise floor, above
+    "spectral_points"   : 15,
+    "stillness"         : 0.15,   # mean movement, below
+    "stillness_points"  : 15,
+    "loop"              : 0.5,    # share of recent frames repeating at one period
+    "loop_points"       : 40,
+    "frozen_secs"       : 2.0,    # face picture pixel-identical for longer than this
+    "frozen_ramp_secs"  : 5.0,    # ...ramps up to frozen_points over this many more seconds
+    "frozen_points"     : 25,     # cap, below suspicious_level: a stall alone never alerts
+    "classifier"        : VIDEO_CLASSIFIER_THRESHOLD,
+    "classifier_points" : VIDEO_CLASSIFIER_WEIGHT,
+    "deepfake_level"    : 55,     # total risk for DEEPFAKE DETECTED
+    "suspicious_level"  : 30,
+}
+
+# Per-frame feature recording (columnar, for replay)
+VIDEO_RECORD_BUFFER_FRAMES  = 256    # rows held in memory between flushes
+
+# Offline (recorded call) analysis
+VIDEO_OFFLINE_SEGMENT_SECS  = 60     # video seconds per worker task
+VIDEO_OFFLINE_WARMUP_SECS   = 15     # extra lead-in so rolling histories are full
+
+# In-process video service (dashboard)
+VIDEO_BUS_SLOTS             = 4      # shared-memory frame slots between service and UI
+VIDEO_RESULT_QUEUE          = 32     # analysis results buffered for the UI; extras dropped
+
 # ── Paths ────────────────────────────────────────────────────
 LOG_PATH    = "logs/alerts.json"
 ASSETS_PATH = "assets/"
@@ -8,6 +8,14 @@ from datetime import datetime
 from config import (SCAM_KEYWORDS, LANGUAGE_KEYWORDS, LANGUAGE_NAMES,
                     SCAM_PATTERNS, SCAM_KEYWORD_THRESHOLD, LOG_PATH)
 
+# Native scripts recognised in transcripts (Unicode blocks). A script is
+# shared by several languages: Hindi, Marathi and Nepali are all Devanagari.
+SCRIPT_RANGES = {
+    "kannada"   : ("\u0C80", "\u0CFF"),
+    "devanagari": ("\u0900", "\u097F"),
+    "tamil"     : ("\u0B80", "\u0BFF"),
+}
+
 class ScamDetector:
     def __init__(self):
         self.detected_keywords = []
@@ -49,6 +57,16 @@ class ScamDetector:
 
         return "en"
 
+    def detect_script(self, text: str):
+        """
+        Native script family of the text ('devanagari', 'kannada', 'tamil'),
+        or None for Latin/other text or fewer than 3 native characters.
+        """
+        counts = {name: sum(1 for c in text if lo <= c <= hi)
+                  for name, (lo, hi) in SCRIPT_RANGES.items()}
+        name, n = max(counts.items(), key=lambda kv: kv[1])
+        return name if n > 2 else None
+
     def analyze_text(self, text: str) -> dict:
         text_lower      = text.lower()
         found_keywords  = []
@@ -0,0 +1,86 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+
+class StageTimer:
+    """
+    Lightweight per-stage latency recorder for real-time pipelines.
+
+    Each stage is timed with perf_counter() and appended to a bounded
+    deque, so the hot path costs two clock reads and a dict update.
+    Percentiles are only computed when summary() is asked for.
+    """
+
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, window: int = 200, realtime_exclude=("record",)):
+        """
+        window: number of recent chunks kept per stage.
+        realtime_exclude: stages that are bound to wall-clock audio length
+                          (e.g. mic recording) and so are left out of the
+                          real-time factor.
+        """
+        self.window           = window
+        self.realtime_exclude = set(realtime_exclude)
+        self.history          = {}
+        self.rtf_history      = deque(maxlen=window)
+        self.current          = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - t0) * 1000.0)
+
+    def add(self, name: str, ms: float):
+        self.current[name] = self.current.get(name, 0.0) + ms
+
+    def end_chunk(self, audio_secs: float = None) -> dict:
+        """Close the current chunk; return its per-stage timings in ms."""
+        current, self.current = self.current, {}
+        compute_ms = sum(v for k, v in current.items() if k not in self.realtime_exclude)
+
+        for name, ms in current.items():
+            self._push(name, ms)
+        self._push("total", compute_ms)
+
+        chunk = {f"{name}_ms": round(ms, 1) for name, ms in current.items()}
+        chunk["total_ms"] = round(compute_ms, 1)
+        if audio_secs:
+            rtf = compute_ms / 1000.0 / audio_secs
+            self.rtf_history.append(rtf)
+            chunk["rtf"] = round(rtf, 3)
+        return chunk
+
+    def _push(self, name: str, ms: float):
+        if name not in self.history:
+            self.history[name] = deque(maxlen=self.window)
+        self.history[name].append(ms)
+
+    def summary(self) -> dict:
+        """Rolling p50/p95/p99 (ms) per stage plus real-time factor."""
+        out = {}
+        for name, values in self.history.items():
+            out[name] = self._percentiles(values)
+        if self.rtf_history:
+            out["rtf"] = self._percentiles(self.rtf_history, digits=3)
+        return out
+
+    def _percentiles(self, values, digits: int = 1) -> dict:
+        arr = np.fromiter(values, dtype=np.float64, count=len(values))
+        p   = np.percentile(arr, self.PERCENTILES)
+        stats = {f"p{q}": round(float(v), digits) for q, v in zip(self.PERCENTILES, p)}
+        stats["count"] = len(arr)
+        return stats
+
+    def reset(self):
+        self.history.clear()
+        self.rtf_history.clear()
+        self.current = {}
@@ -0,0 +1,657 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import io
+import cv2
+import json
+import time
+import hashlib
+import argparse
+import platform
+import tracemalloc
+import contextlib
+import numpy as np
+from core.video.deepfake import DeepfakeDetector
+from core.video.sources import FileSource, SyntheticSource, VideoClock
+
+# ── Helpers ──────────────────────────────────────────────────
+def iou(a, b) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def center_drift(a, b) -> float:
+    """Distance between box centers, as a fraction of the reference face width."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    d = np.hypot((ax + aw / 2) - (bx + bw / 2), (ay + ah / 2) - (by + bh / 2))
+    return float(d / bw) if bw else 0.0
+
+
+# ── Face localization: detect every frame vs detect-then-track ─
+def benchmark_tracking(frames, intervals=(1, 5, 10, 20)) -> list:
+    """
+    Time face localization alone (the dominant per-frame cost) for each
+    detection interval, and measure how far the tracked box drifts from
+    the box full per-frame detection would have given.
+
+    Per-frame Haar is itself jittery and occasionally locks onto a false
+    positive; `ref_jumps` counts frames where the reference box jumped
+    away from the previous one, which show up as drift outliers.
+    """
+    frames    = list(frames)
+    reference = DeepfakeDetector(detect_interval=1)
+    truth     = [reference._detect_face(cv2.cvtColor(f, cv2.COLOR_BGR2GRAY)) for f in frames]
+    ref_jumps = sum(1 for a, b in zip(truth, truth[1:])
+                    if a is not None and b is not None and iou(a, b) < 0.3)
+
+    results = []
+    for interval in intervals:
+        det     = DeepfakeDetector(detect_interval=interval)
+        ious    = []
+        drifts  = []
+        detects = 0
+        t_loc   = 0.0
+        for frame, ref in zip(frames, truth):
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            t0   = time.perf_counter()
+            rect, source = det._locate_face(gray)
+            t_loc += time.perf_counter() - t0
+            detects += source == "detect"
+            if rect is not None and ref is not None:
+                ious.append(iou(rect, ref))
+                drifts.append(center_drift(rect, ref))
+
+        n = len(frames)
+        results.append({
+            "interval"       : interval,
+            "frames"         : n,
+            "detections"     : detects,
+            "locate_ms"      : round(t_loc * 1000 / n, 2) if n else 0.0,
+            "locate_fps"     : round(n / t_loc, 1) if t_loc else 0.0,
+            "median_iou"     : round(float(np.median(ious)), 3) if ious else None,
+            "median_drift"   : round(float(np.median(drifts)), 3) if drifts else None,
+            "p95_drift"      : round(float(np.percentile(drifts, 95)), 3) if drifts else None,
+            "ref_jumps"      : ref_jumps,
+        })
+    return results
+
+
+# ── Detection scale: full resolution vs downscaled pyramid ───
+def benchmark_detection_scale(frames, sizes=((1280, 720), (1920, 1080)),
+                              scales=(1.0, 0.5, 0.25, "auto")) -> list:
+    """
+    Haar detection cost per frame at each capture size and detection
+    scale, with IoU of the remapped box against full-resolution detection.
+    """
+    frames  = list(frames)
+    results = []
+    for size in sizes:
+        grays = [cv2.cvtColor(cv2.resize(f, size, interpolation=cv2.INTER_AREA),
+                              cv2.COLOR_BGR2GRAY) for f in frames]
+        baseline_ms = None
+        reference   = None
+        for scale in scales:
+            det   = DeepfakeDetector(detect_interval=1, detect_scale=scale)
+            boxes = []
+            t0    = time.perf_counter()
+            for g in grays:
+                boxes.append(det._detect_face(g))
+            ms = (time.perf_counter() - t0) * 1000 / len(grays)
+            if reference is None:
+                reference, baseline_ms = boxes, ms
+            ious = [iou(b, r) for b, r in zip(boxes, reference) if b and r]
+            results.append({
+                "size"       : f"{size[0]}x{size[1]}",
+                "scale"      : scale,
+                "detect_ms"  : round(ms, 2),
+                "speedup"    : round(baseline_ms / ms, 2) if ms else 0.0,
+                "found"      : sum(b is not None for b in boxes),
+                "frames"     : len(grays),
+                "median_iou" : round(float(np.median(ious)), 3) if ious else None,
+            })
+    return results
+
+
+def print_detection_scale(results):
+    for r in results:
+        iou_txt = f"IoU vs full-res p50 {r['median_iou']:.3f}" if r["median_iou"] is not None else "no face"
+        print(f"  {r['size']:>9} @ {str(r['scale']):>4} | {r['detect_ms']:>6.2f} ms | "
+              f"x{r['speedup']:<5} | found {r['found']:>3}/{r['frames']} | {iou_txt}")
+
+
+# ── Face backends: Haar cascade vs DNN detectors ─────────────
+def benchmark_face_backends(frames, backends=("haar", "res10", "yunet"),
+                            sizes=((1280, 720), (1920, 1080)), angle: float = 30.0) -> list:
+    """
+    Full-detection cost and recall of each face backend at each capture
+    size, on the clip as is and rotated by `angle` degrees (a stand-in
+    for tilted heads, which the frontal Haar cascade misses). The clip is
+    assumed to show a face in every frame, so recall is the share of
+    frames with a detection; IoU is against Haar on the upright clip.
+    Backends whose models are missing are skipped.
+    """
+    from core.video.resources import SharedResources
+    from core.video.face_backends import make_face_backend
+
+    resources = SharedResources()
+    available = []
+    for name in backends:
+        try:
+            make_face_backend(name, resources)
+            available.append(name)
+        except RuntimeError as e:
+            print(f"  [!] {name} skipped: {e}")
+
+    frames  = list(frames)
+    results = []
+    for size in sizes:
+        upright = [cv2.resize(f, size, interpolation=cv2.INTER_AREA) for f in frames]
+        M       = cv2.getRotationMatrix2D((size[0] / 2, size[1] / 2), angle, 1.0)
+        rotated = [cv2.warpAffine(f, M, size, borderMode=cv2.BORDER_REPLICATE) for f in upright]
+        reference = None
+        for name in available:
+            for label, clip in (("upright", upright), (f"rot {angle:.0f}°", rotated)):
+                backend = make_face_backend(name, resources)
+                boxes   = []
+                t0      = time.perf_counter()
+                for f in clip:
+                    boxes.append(backend.detect(cv2.cvtColor(f, cv2.COLOR_BGR2GRAY), f))
+                ms = (time.perf_counter() - t0) * 1000 / len(clip)
+                if label == "upright" and reference is None:
+                    reference = boxes
+                ious = [iou(b, r) for b, r in zip(boxes, reference) if b and r] if label == "upright" else []
+                results.append({
+                    "size"       : f"{size[0]}x{size[1]}",
+                    "backend"    : name,
+                    "clip"       : label,
+                    "detect_ms"  : round(ms, 2),
+                    "recall"     : round(sum(b is not None for b in boxes) / len(clip), 3),
+                    "median_iou" : round(float(np.median(ious)), 3) if ious else None,
+                })
+    return results
+
+
+def print_face_backends(results):
+    for r in results:
+        iou_txt = f" | IoU vs haar p50 {r['median_iou']:.3f}" if r["median_iou"] is not None else ""
+        print(f"  {r['size']:>9} {r['backend']:>6} {r['clip']:>8} | {r['detect_ms']:>6.2f} ms | "
+              f"recall {r['recall'] * 100:5.1f}%{iou_txt}")
+
+
+# ── Movement engines: dense Farneback vs sparse Lucas-Kanade ─
+def benchmark_motion(frames, engines=("farneback", "lk")) -> list:
+    """
+    Per-frame cost and scores of each motion engine on the canonical face
+    patch, for the moving clip and for a frozen copy of its first frame
+    (which should read as near-zero movement).
+    """
+    from core.video.context import FrameContext
+    from core.video.motion import make_motion_engine
+
+    det     = DeepfakeDetector()                # live localization (tracked)
+    patches = []
+    for f in frames:
+        gray    = cv2.cvtColor(f, cv2.COLOR_BGR2GRAY)
+        rect, _ = det._locate_face(gray)
+        if rect is not None:
+            patches.append(FrameContext(f, gray, rect).face_patch)
+    if not patches:
+        return []
+    still = [patches[0]] * len(patches)
+
+    results = []
+    scores  = {}
+    for name in engines:
+        for label, seq in (("moving", patches), ("still", still)):
+            engine = make_motion_engine(name)
+            vals   = []
+            t0     = time.perf_counter()
+            for p in seq:
+                vals.append(engine.update(p))
+            ms = (time.perf_counter() - t0) * 1000 / len(seq)
+            if label == "moving":
+                scores[name] = vals[1:]
+            results.append({
+                "engine"    : name,
+                "clip"      : label,
+                "frames"    : len(seq),
+                "ms"        : round(ms, 3),
+                "mean_score": round(float(np.mean(vals[1:])), 3) if len(vals) > 1 else None,
+            })
+    if len(scores) == 2 and len(next(iter(scores.values()))) > 2:
+        a, b = scores.values()
+        corr = float(np.corrcoef(a, b)[0, 1])
+        for r in results:
+            r["corr"] = round(corr, 3)
+    return results
+
+
+def print_motion(results):
+    for r in results:
+        corr = f" | corr {r['corr']:.3f}" if "corr" in r else ""
+        print(f"  {r['engine']:>9} {r['clip']:>6} | {r['ms']:>7.3f} ms/frame | "
+              f"mean movement {r['mean_score']}{corr}")
+
+
+# ── Blink engines: eye cascade (whole face / upper band) vs landmarks ─
+def _close_eyes(frame, gray, rect, eye_cascade) -> bool:
+    """Paint both eyes shut (skin-coloured lid + lash line), in place."""
+    x, y, w, h = rect
+    eyes = eye_cascade.detectMultiScale(gray[y:y + h // 2, x:x+w], 1.1, 5, minSize=(20, 20))
+    left  = [e for e in eyes if 2 * e[0] + e[2] < w]
+    right = [e for e in eyes if 2 * e[0] + e[2] >= w]
+    if not left or not right:
+        return False
+    for ex, ey, ew, eh in (max(left, key=lambda e: e[2]), max(right, key=lambda e: e[2])):
+        cx, cy = x + ex + ew // 2, y + ey + eh // 2
+        box    = frame[y + ey:y + ey + eh, x + ex:x + ex + ew]
+        skin   = np.median(np.concatenate([box[0], box[-1]]), axis=0)
+        cv2.ellipse(frame, (cx, cy), (int(ew * 0.4), int(eh * 0.25)), 0, 0, 360,
+                    skin.tolist(), -1)
+        cv2.ellipse(frame, (cx, cy), (int(ew * 0.35), int(eh * 0.08)), 0, 0, 180,
+                    (40, 40, 40), 2)
+    return True
+
+
+def benchmark_blink(timed_frames, every: float = 2.0, length: float = 0.2) -> list:
+    """
+    Script a blink of `length` seconds every `every` seconds by painting
+    the eyes shut, then replay the clip through a detector with each blink
+    engine: the whole-face cascade (the old search), the upper-band
+    cascade and, when cv2.face and VIDEO_LANDMARK_MODEL are available,
+    LBF landmarks. Reports ms per face frame for the blink signal, blinks
+    counted against the script, and blinks counted on the untouched clip
+    (all false).
+    """
+    from core.video.blink import CascadeBlink, LandmarkBlink
+
+    scout    = _quiet_detector()
+    scripted = []
+    painted  = set()
+    for frame, t in timed_frames:
+        frame = frame.copy()
+        if t % every < length:
+            gray    = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            rect, _ = scout._locate_face(gray)
+            if rect is not None and _close_eyes(frame, gray, rect, scout.eye_cascade):
+                painted.add(int(t // every))
+        scripted.append((frame, t))
+
+    engines = [("cascade, whole face", lambda r: CascadeBlink(r, band=(0.0, 1.0), face_width=None)),
+               ("cascade, upper band", CascadeBlink)]
+    try:
+        LandmarkBlink(scout.resources)          # cv2.face and the model present?
+        engines.append(("lbf landmarks", LandmarkBlink))
+    except RuntimeError as e:
+        print(f"  [!] lbf skipped: {e}")
+
+    results = []
+    for label, make in engines:
+        row = {"engine": label, "scripted": len(painted)}
+        for clip, frames in (("counted", scripted), ("false", timed_frames)):
+            clock = VideoClock()
+            det   = _quiet_detector(clock=clock)
+            det.blink = make(det.resources)
+            total = {"blink": 0.0}
+            fn    = det._detect_blink
+
+            def timed(ctx, _fn=fn):
+                t0 = time.perf_counter()
+                try:
+                    return _fn(ctx)
+                finally:
+                    total["blink"] += time.perf_counter() - t0
+            det._detect_blink = timed
+            faces = 0
+            for frame, t in frames:
+                clock.t = t
+                _, a = det.analyze_frame(frame, draw=False)
+                faces += a["face_detected"]
+            row[clip] = det.blink_count
+            if clip == "counted":
+                row["ms"] = round(total["blink"] * 1000 / max(1, faces), 2)
+                row["ear_mean"] = round(det.ear_history.mean(), 3) if len(det.ear_history) else None
+        results.append(row)
+    return results
+
+
+def print_blink(results):
+    for r in results:
+        ear = f" | EAR mean {r['ear_mean']}" if r["ear_mean"] is not None else ""
+        print(f"  {r['engine']:>20} | {r['ms']:>6.2f} ms/face | blinks {r['counted']}/{r['scripted']} "
+              f"scripted | {r['false']} on the untouched clip{ear}")
+
+
+# ── Frozen feed: stalls of increasing length ─────────────────
+def benchmark_stall(timed_frames, stalls=(0.5, 1.0, 2.0, 4.0, 8.0)) -> list:
+    """
+    Freeze the feed on a face frame in the middle of the clip (the same
+    picture repeated while the clock keeps running) for each stall
+    length, and report the risk and level just before the stall against
+    the worst during it. Stalls up to VIDEO_THRESHOLDS["frozen_secs"]
+    must leave the level unchanged; "ok" checks exactly that and that
+    the penalty stays within "frozen_points".
+    """
+    T     = _quiet_detector().thresholds
+    fps   = (len(timed_frames) - 1) / (timed_frames[-1][1] - timed_frames[0][1])
+    scout = _quiet_detector(clock=VideoClock())
+    faces = []
+    for i, (frame, t) in enumerate(timed_frames):
+        scout.clock.t = t
+        faces.append(scout.analyze_frame(frame, draw=False)[1]["face_detected"])
+    if not any(faces):
+        return []
+    mid = len(faces) // 2
+    k   = min((i for i, f in enumerate(faces) if f), key=lambda i: abs(i - mid))
+
+    results = []
+    for stall in stalls:
+        clock = VideoClock()
+        det   = _quiet_detector(clock=clock)
+        for frame, t in timed_frames[:k + 1]:
+            clock.t = t
+            _, before = det.analyze_frame(frame, draw=False)
+        worst = before
+        for j in range(1, int(round(stall * fps)) + 1):
+            clock.t = timed_frames[k][1] + j / fps
+            _, a = det.analyze_frame(timed_frames[k][0], draw=False)
+            if a["risk_score"] > worst["risk_score"]:
+                worst = a
+        added = worst["risk_score"] - before["risk_score"]
+        same  = worst["risk_level"] == before["risk_level"]
+        results.append({
+            "stall_secs"  : stall,
+            "risk_before" : before["risk_score"],
+            "risk_added"  : round(added, 1),
+            "level_before": before["risk_level"],
+            "level_during": worst["risk_level"],
+            "ok"          : (same or stall > T["frozen_secs"]) and added <= T["frozen_points"],
+        })
+    return results
+
+
+def print_stall(results):
+    for r in results:
+        print(f"  {r['stall_secs']:>4.1f} s stall | risk {r['risk_before']:>5.1f} +{r['risk_added']:>4.1f} | "
+              f"{r['level_before']} → {r['level_during']} | {'ok' if r['ok'] else 'FAIL'}")
+
+
+# ── Frame governor: analyze every k-th frame ───────────────
+def benchmark_governor(timed_frames, strides=(1, 2, 3, 6), budget=None) -> list:
+    """
+    Replay (frame, t) pairs with the governor pinned at each stride, plus
+    one run under `budget` (config default) where it picks k itself.
+    Reports analysis cost per input frame and how far blink rate and
+    mean movement drift from k=1; "agree" is the share of frames whose
+    displayed level (held on skipped frames) matches k=1. Large k shows
+    why the governor caps the gap between analyses.
+    """
+    from config import VIDEO_CPU_BUDGET
+    from core.video.governor import FrameGovernor
+
+    runs = [(f"k={k}", FrameGovernor(stride=k)) for k in strides]
+    runs.append((f"budget {budget or VIDEO_CPU_BUDGET:.0%}", FrameGovernor(budget or VIDEO_CPU_BUDGET)))
+
+    results  = []
+    baseline = None
+    for label, gov in runs:
+        clock  = VideoClock()
+        det    = _quiet_detector(clock=clock)
+        levels = []
+        moves  = []
+        last   = None
+        for frame, t in timed_frames:
+            clock.t = t
+            a = gov.step(det, frame, t)
+            levels.append(a["risk_level"] if a["face_detected"] else "NO FACE")
+            if not a["held"] and a["face_detected"]:
+                moves.append(a["movement_score"])
+            last = a
+        if baseline is None:
+            baseline = levels
+        n = len(levels)
+        g = gov.stats()
+        results.append({
+            "run"          : label,
+            "stride"       : g["stride"],
+            "frames"       : n,
+            "analyzed"     : g["analyzed"],
+            "ms_per_frame" : round(gov.cost.mean() * g["analyzed"] / n * 1000, 2) if n else 0.0,
+            "load"         : g["load"],
+            "blinks"       : det.blink_count,
+            "blink_rate"   : last["blink_rate"] if last else 0.0,
+            "movement"     : round(float(np.mean(moves[1:])), 3) if len(moves) > 1 else None,
+            "agree"        : round(float(np.mean([x == y for x, y in zip(levels, baseline)])), 3),
+        })
+    return results
+
+
+def print_governor(results):
+    for r in results:
+        print(f"  {r['run']:>11} | k={r['stride']} analyzed {r['analyzed']:>4}/{r['frames']} | "
+              f"{r['ms_per_frame']:>6.2f} ms per input frame (~{r['load'] * 100:.0f}% core) | "
+              f"blinks {r['blinks']} ({r['blink_rate']}/min) | movement {r['movement']} | "
+              f"level agrees {r['agree'] * 100:.1f}%")
+
+
+def print_tracking(results):
+    for r in results:
+        iou_txt = (f"IoU p50 {r['median_iou']:.3f} | drift p50 {r['median_drift']:.3f} "
+                   f"p95 {r['p95_drift']:.3f} (ref jumps {r['ref_jumps']})"
+                   if r["median_iou"] is not None else "no face matched")
+        print(f"  every {r['interval']:>2} | detections {r['detections']:>4}/{r['frames']} | "
+              f"{r['locate_ms']:>6.2f} ms ({r['locate_fps']:>6.1f} fps) | {iou_txt}")
+
+
+# ── Full pipeline suite (deterministic replay) ───────────────
+PROFILED = {
+    "locate"    : "_locate_face",
+    "buffers"   : "_prepare_buffers",
+    "texture"   : "_texture_score",
+    "spectral"  : "_spectral_score",
+    "lighting"  : "_lighting_asymmetry",
+    "symmetry"  : "_face_symmetry",
+    "movement"  : "_movement_score",
+    "blink"     : "_detect_blink",
+    "loop"      : "_loop_signal",
+    "classifier": "_classifier_probability",
+}
+
+
+def _max_rss_mb():
+    """Peak resident set size of this process, or None where unsupported (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (2**20 if sys.platform == "darwin" else 1024), 1)    # bytes on macOS
+
+
+def _quiet_detector(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return DeepfakeDetector(**kwargs)
+
+
+def _profile_signals(detector, totals: dict):
+    """Wrap the detector's signal methods (on this instance) with timers."""
+    for label, attr in PROFILED.items():
+        fn = getattr(detector, attr)
+
+        def timed(*args, _fn=fn, _label=label, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return _fn(*args, **kwargs)
+            finally:
+                totals[_label] += time.perf_counter() - t0
+        setattr(detector, attr, timed)
+
+
+def benchmark_pipeline(make_source, size, memory_frames: int = 60) -> dict:
+    """
+    One resolution: replay the source through a fresh detector driven by
+    the source's timestamps, and time the whole frame and each signal.
+    The shared FrameContext buffers are built before any signal runs
+    and timed on their own as "buffers". A second, shorter pass under tracemalloc measures
+    allocation peak. risk_digest hashes the per-frame risk and level
+    so behaviour changes show up next to speed changes.
+    """
+    clock    = VideoClock()
+    det      = _quiet_detector(clock=clock)
+    totals   = {k: 0.0 for k in PROFILED}
+    _profile_signals(det, totals)
+
+    frame_ms  = []
+    render_ms = []
+    faces     = 0
+    digest    = hashlib.sha1()
+    for frame, t in make_source(size):
+        clock.t = t
+        t0 = time.perf_counter()
+        _, a = det.analyze_frame(frame, draw=False)
+        frame_ms.append((time.perf_counter() - t0) * 1000)
+        det.render(frame, a)
+        render_ms.append(a["render_ms"])
+        faces += a["face_detected"]
+        digest.update(f"{a['risk_score']:.1f}|{a['risk_level']};".encode())
+
+    n = len(frame_ms)
+    if not n:
+        return {"size": f"{size[0]}x{size[1]}", "frames": 0}
+    signals = {k: round(v * 1000 / n, 3) for k, v in totals.items()}
+    signals["other"] = round(max(0.0, float(np.mean(frame_ms)) - sum(signals.values())), 3)
+
+    # Memory pass
+    clock = VideoClock()
+    det   = _quiet_detector(clock=clock)
+    tracemalloc.start()
+    for i, (frame, t) in enumerate(make_source(size)):
+        if i >= memory_frames:
+            break
+        clock.t = t
+        det.analyze_frame(frame, draw=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "size"             : f"{size[0]}x{size[1]}",
+        "frames"           : n,
+        "face_frames"      : faces,
+        "fps"              : round(1000 / np.mean(frame_ms), 1),
+        "frame_ms_mean"    : round(float(np.mean(frame_ms)), 3),
+        "frame_ms_p95"     : round(float(np.percentile(frame_ms, 95)), 3),
+        "render_ms_mean"   : round(float(np.mean(render_ms)), 3),
+        "signals_ms"       : signals,
+        "alloc_peak_mb"    : round(peak / 2**20, 2),
+        "max_rss_mb"       : _max_rss_mb(),
+        "risk_digest"      : digest.hexdigest()[:12],
+    }
+
+
+def benchmark_suite(make_source, sizes) -> dict:
+    from config import (VIDEO_DETECT_INTERVAL, VIDEO_DETECT_SCALE, VIDEO_MOTION_ENGINE,
+                        VIDEO_BLINK_ENGINE, VIDEO_FACE_BACKEND)
+    return {
+        "env": {
+            "python"    : platform.python_version(),
+            "platform"  : platform.platform(),
+            "cpus"      : os.cpu_count(),
+            "numpy"     : np.__version__,
+            "opencv"    : cv2.__version__,
+            "cv_threads": cv2.getNumThreads(),
+        },
+        "config": {
+            "detect_interval": VIDEO_DETECT_INTERVAL,
+            "detect_scale"   : VIDEO_DETECT_SCALE,
+            "motion_engine"  : VIDEO_MOTION_ENGINE,
+            "blink_engine"   : VIDEO_BLINK_ENGINE,
+            "face_backend"   : VIDEO_FACE_BACKEND,
+        },
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "runs"     : [benchmark_pipeline(make_source, size) for size in sizes],
+    }
+
+
+def print_suite(suite: dict):
+    for r in suite["runs"]:
+        if not r["frames"]:
+            print(f"  {r['size']:>9} | no frames")
+            continue
+        sig = " ".join(f"{k} {v:.2f}" for k, v in r["signals_ms"].items() if v)
+        print(f"  {r['size']:>9} | {r['fps']:>6.1f} fps | {r['frame_ms_mean']:>7.2f} ms "
+              f"(p95 {r['frame_ms_p95']:.2f}) | render {r['render_ms_mean']:.2f} ms | "
+              f"faces {r['face_frames']}/{r['frames']} | alloc peak {r['alloc_peak_mb']} MB | "
+              f"digest {r['risk_digest']}")
+        print(f"  {'':>9}   ms/frame: {sig}")
+
+
+def parse_sizes(text: str) -> list:
+    return [tuple(int(v) for v in s.lower().split("x")) for s in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SENTINEL-GUARD video benchmarks")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--video", help="recorded clip to replay")
+    src.add_argument("--image", help="still image with a face, panned synthetically")
+    src.add_argument("--synthetic", metavar="WxH",
+                     help="seeded noise frames, no input needed (no-face path only)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--classifier", help="ONNX face classifier to benchmark batching")
+    parser.add_argument("--suite", action="store_true",
+                        help="full pipeline: fps, per-signal ms and memory per resolution")
+    parser.add_argument("--sizes", default="960x540,1280x720,1920x1080")
+    parser.add_argument("--json", help="write suite results to this file")
+    args = parser.parse_args()
+
+    def make_source(size=None):
+        if args.video:
+            return FileSource(args.video, args.frames, size)
+        if args.synthetic:
+            return SyntheticSource(None, args.frames, size=size or parse_sizes(args.synthetic)[0])
+        return SyntheticSource(args.image, args.frames, size=size)
+
+    print("=" * 60)
+    print("   SENTINEL-GUARD — Video Benchmark")
+    print("=" * 60)
+
+    if args.suite:
+        suite = benchmark_suite(make_source, parse_sizes(args.sizes))
+        print_suite(suite)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(suite, f, indent=2)
+            print(f"\n[✓] Results written to {args.json}")
+        sys.exit(0)
+
+    timed  = list(make_source())
+    frames = [frame for frame, _ in timed]
+    print("\n  Detect-then-track (interval = frames between full detections)")
+    print_tracking(benchmark_tracking(frames))
+    print("\n  Detection scale")
+    print_detection_scale(benchmark_detection_scale(frames))
+    print("\n  Face backends (full detection; recall = frames with a face)")
+    print_face_backends(benchmark_face_backends(frames))
+    print("\n  Movement engines (100x100 face patch)")
+    print_motion(benchmark_motion(frames))
+    print("\n  Blink engines (scripted blinks: eyes painted shut 0.2 s every 2 s)")
+    print_blink(benchmark_blink(timed))
+    print("\n  Frozen feed (one face frame repeated; short stalls must not move the level)")
+    print_stall(benchmark_stall(timed))
+    print("\n  Frame governor (analyze every k-th frame, hold results in between)")
+    print_governor(benchmark_governor(timed))
+
+    if args.classifier:
+        from core.video.classifier import FaceClassifier, benchmark_batching
+        b = benchmark_batching(FaceClassifier(args.classifier))
+        print("\n  Learned classifier batching (ONNX Runtime, CPU)")
+        for r in b["rows"]:
+            print(f"  batch {r['batch']:>3} | {r['batch_ms']:>8.2f} ms/batch | {r['ms_per_frame']:>7.2f} ms/frame")
+        print(f"  fixed {b['fixed_ms']} ms per batch + {b['ms_per_extra_frame']} ms per extra frame")
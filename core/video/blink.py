@@ -0,0 +1,93 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+from config import VIDEO_BLINK_ENGINE, VIDEO_EYE_BAND, VIDEO_EYE_FACE_WIDTH, VIDEO_EAR_CLOSED
+
+class CascadeBlink:
+    """
+    Eye cascade on the upper band of the face only.
+
+    The band (rows VIDEO_EYE_BAND of the face box) is resized so the face
+    is face_width px wide and searched for eye-sized windows only, so the
+    cost no longer grows with the face, and the mouth and nostrils, which
+    the cascade also fires on, are out of view. Eyes are open when one is
+    found on each side of the face. band=(0, 1), face_width=None is the
+    old whole-face search (benchmark baseline).
+    """
+
+    name = "cascade"
+
+    def __init__(self, resources, band=VIDEO_EYE_BAND, face_width=VIDEO_EYE_FACE_WIDTH):
+        self.resources  = resources
+        self.band       = band
+        self.face_width = face_width
+
+    def measure(self, ctx):
+        """(eyes open, eyes found, EAR) — no EAR from a cascade."""
+        face   = ctx.face_gray
+        h, w   = face.shape[:2]
+        region = face[int(h * self.band[0]):int(h * self.band[1])]
+        if self.face_width:
+            s      = self.face_width / w
+            region = cv2.resize(region, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+            width  = self.face_width
+            eyes   = self.resources.eye_cascade.detectMultiScale(
+                region, 1.1, 5, minSize=(max(20, width // 8),) * 2, maxSize=(width // 3,) * 2)
+        else:
+            width  = w
+            eyes   = self.resources.eye_cascade.detectMultiScale(region, 1.1, 5, minSize=(20, 20))
+        sides = {2 * ex + ew < width for ex, _, ew, _ in eyes}
+        return len(sides) == 2, len(eyes), None
+
+
+def eye_aspect_ratio(p: np.ndarray) -> float:
+    """EAR of six eye landmarks (corner, 2 upper, corner, 2 lower): ~0.3 open, <0.2 shut."""
+    vertical   = np.linalg.norm(p[1] - p[5]) + np.linalg.norm(p[2] - p[4])
+    horizontal = np.linalg.norm(p[0] - p[3])
+    return float(vertical / (2.0 * horizontal)) if horizontal > 0 else 0.0
+
+
+class LandmarkBlink:
+    """
+    68-point LBF landmarks (cv2.face, opencv-contrib) fitted inside the
+    face box; eyes are open while the mean eye aspect ratio of both eyes
+    stays at or above closed_ear. The model is shared via SharedResources.
+    """
+
+    name = "lbf"
+
+    RIGHT_EYE = slice(36, 42)   # subject's right, iBUG 68-point numbering
+    LEFT_EYE  = slice(42, 48)
+
+    def __init__(self, resources, closed_ear: float = VIDEO_EAR_CLOSED):
+        self.resources  = resources
+        self.closed_ear = closed_ear
+        resources.facemark                      # fail fast if unavailable
+
+    def measure(self, ctx):
+        """(eyes open, 2 while open else 0, EAR or None if the fit failed)."""
+        rect      = np.array([ctx.face_rect], dtype=np.int32)
+        ok, shape = self.resources.facemark.fit(ctx.gray, rect)
+        if not ok:
+            return False, 0, None
+        pts = shape[0].reshape(-1, 2)
+        ear = (eye_aspect_ratio(pts[self.RIGHT_EYE]) + eye_aspect_ratio(pts[self.LEFT_EYE])) / 2
+        is_open = ear >= self.closed_ear
+        return is_open, 2 if is_open else 0, round(ear, 3)
+
+
+BLINK_ENGINES = {
+    CascadeBlink.name : CascadeBlink,
+    LandmarkBlink.name: LandmarkBlink,
+}
+
+
+def make_blink_engine(name: str = VIDEO_BLINK_ENGINE, resources=None):
+    try:
+        engine = BLINK_ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Unknown blink engine '{name}' — choose from {sorted(BLINK_ENGINES)}")
+    return engine(resources)
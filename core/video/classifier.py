@@ -0,0 +1,201 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import time
+import threading
+import numpy as np
+from core.video.rolling import RollingStats
+from config import (VIDEO_CLASSIFIER_MODEL, VIDEO_CLASSIFIER_INPUT, VIDEO_CLASSIFIER_THREADS,
+                    VIDEO_CLASSIFIER_MAX_BATCH, VIDEO_CLASSIFIER_MAX_WAIT_MS,
+                    VIDEO_CLASSIFIER_MAX_PENDING)
+
+IMAGENET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGENET_STD  = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+class FaceClassifier:
+    """
+    Learned real/fake classifier for face crops, run with ONNX Runtime on CPU.
+
+    The model takes (N, 3, S, S) ImageNet-normalized RGB. It returns
+    either (N, 2) logits [real, fake] or (N, 1) fake logits. The batch
+    dimension must be dynamic so crops can be batched.
+    """
+
+    def __init__(self, model_path: str, input_size: int = VIDEO_CLASSIFIER_INPUT,
+                 threads: int = VIDEO_CLASSIFIER_THREADS):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("onnxruntime not installed — pip install onnxruntime "
+                               "to enable the learned classifier stage.")
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = threads
+        opts.inter_op_num_threads = 1
+        self.session    = ort.InferenceSession(model_path, opts, providers=["CPUExecutionProvider"])
+        inp             = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        dims            = inp.shape[-1]
+        self.input_size = dims if isinstance(dims, int) else input_size
+
+    def preprocess(self, face_bgr: np.ndarray) -> np.ndarray:
+        """BGR crop → (3, S, S) float32, a fresh array safe to queue."""
+        s   = self.input_size
+        rgb = cv2.cvtColor(cv2.resize(face_bgr, (s, s), interpolation=cv2.INTER_AREA),
+                           cv2.COLOR_BGR2RGB)
+        x   = (rgb.astype(np.float32) * (1.0 / 255.0) - IMAGENET_MEAN) / IMAGENET_STD
+        return x.transpose(2, 0, 1)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """(N, 3, S, S) → (N,) probability that each face is fake."""
+        out = self.session.run(None, {self.input_name: np.ascontiguousarray(batch)})[0]
+        out = out.reshape(len(batch), -1).astype(np.float64)
+        if out.shape[1] == 1:
+            return 1.0 / (1.0 + np.exp(-out[:, 0]))
+        e = np.exp(out - out.max(axis=1, keepdims=True))
+        return e[:, 1] / e.sum(axis=1)
+
+
+class ClassifierBatcher:
+    """
+    Collects face crops from any number of detectors/streams and runs
+    them through the classifier in batches on a background thread.
+
+    A batch is sent when max_batch crops are waiting or the oldest one
+    has waited max_wait_ms. Detectors never block: submit() returns
+    immediately and latest(key) gives the newest probability for that
+    stream, typically a few frames old.
+
+    If inference falls behind, at most max_pending crops wait; older ones
+    are dropped. A batch whose inference fails is logged and dropped, and
+    the thread carries on with the next one.
+    """
+
+    def __init__(self, classifier: FaceClassifier, max_batch: int = VIDEO_CLASSIFIER_MAX_BATCH,
+                 max_wait_ms: float = VIDEO_CLASSIFIER_MAX_WAIT_MS,
+                 max_pending: int = VIDEO_CLASSIFIER_MAX_PENDING):
+        self.classifier  = classifier
+        self.max_batch   = max_batch
+        self.max_wait    = max_wait_ms / 1000.0
+        self.max_pending = max(max_pending, max_batch)
+        self.cond        = threading.Condition()
+        self.pending     = []              # (key, seq, tensor, submitted_at)
+        self.results     = {}              # key → (seq, probability)
+        self.batch_log   = []              # (batch_size, ms), bounded below
+        self.batch_ms    = RollingStats(200)
+        self.batch_sizes = RollingStats(200)
+        self.dropped     = 0               # crops discarded unclassified (backlog)
+        self.errors      = 0               # batches whose inference failed
+        self._seq        = 0
+        self._stop       = False
+        self.thread      = threading.Thread(target=self._loop, daemon=True, name="df-classifier")
+        self.thread.start()
+
+    def submit(self, key, face_bgr: np.ndarray):
+        tensor = self.classifier.preprocess(face_bgr)
+        with self.cond:
+            self._seq += 1
+            self.pending.append((key, self._seq, tensor, time.perf_counter()))
+            if len(self.pending) > self.max_pending:
+                excess        = len(self.pending) - self.max_pending
+                del self.pending[:excess]
+                self.dropped += excess
+            if len(self.pending) >= self.max_batch:
+                self.cond.notify()
+
+    def latest(self, key):
+        """(seq, probability) of the newest classified crop for key, or None."""
+        return self.results.get(key)
+
+    def _loop(self):
+        while True:
+            with self.cond:
+                while not self._stop:
+                    if len(self.pending) >= self.max_batch:
+                        break
+                    if self.pending:
+                        wait = self.pending[0][3] + self.max_wait - time.perf_counter()
+                        if wait <= 0:
+                            break
+                        self.cond.wait(wait)
+                    else:
+                        self.cond.wait()
+                if self._stop:
+                    return
+                batch, self.pending = self.pending[:self.max_batch], self.pending[self.max_batch:]
+
+            t0 = time.perf_counter()
+            try:
+                probs = self.classifier.predict(np.stack([b[2] for b in batch]))
+            except Exception as e:
+                self.errors += 1
+                print(f"[!] Classifier batch of {len(batch)} failed ({self.errors} so far): {e}")
+                continue
+            ms = (time.perf_counter() - t0) * 1000
+            self.batch_ms.append(ms)
+            self.batch_sizes.append(len(batch))
+            self.batch_log.append((len(batch), ms))
+            del self.batch_log[:-500]
+            for (key, seq, _, _), p in zip(batch, probs):
+                prev = self.results.get(key)
+                if prev is None or seq > prev[0]:
+                    self.results[key] = (seq, float(p))
+
+    def stats(self) -> dict:
+        """Per-batch latency, and fixed vs per-extra-frame cost from a line fit."""
+        out = {
+            "batches"       : len(self.batch_log),
+            "mean_batch"    : round(self.batch_sizes.mean(), 2),
+            "batch_ms_mean" : round(self.batch_ms.mean(), 2),
+            "batch_ms_max"  : round(self.batch_ms.max(), 2),
+            "dropped"       : self.dropped,
+            "errors"        : self.errors,
+        }
+        sizes = np.array([b for b, _ in self.batch_log], dtype=np.float64)
+        if len(np.unique(sizes)) >= 2:
+            slope, intercept = np.polyfit(sizes, [ms for _, ms in self.batch_log], 1)
+            out["fixed_ms"]           = round(float(intercept), 2)
+            out["ms_per_extra_frame"] = round(float(slope), 2)
+        return out
+
+    def close(self):
+        with self.cond:
+            self._stop = True
+            self.cond.notify_all()
+        self.thread.join(timeout=2)
+
+
+def benchmark_batching(classifier: FaceClassifier, sizes=(1, 2, 4, 8, 16), repeats: int = 10) -> dict:
+    """Latency per batch size, and the marginal cost of each extra frame."""
+    rng  = np.random.default_rng(0)
+    s    = classifier.input_size
+    rows = []
+    for n in sizes:
+        batch = rng.standard_normal((n, 3, s, s)).astype(np.float32)
+        classifier.predict(batch)                       # warm-up
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            classifier.predict(batch)
+        ms = (time.perf_counter() - t0) * 1000 / repeats
+        rows.append({"batch": n, "batch_ms": round(ms, 2), "ms_per_frame": round(ms / n, 2)})
+    slope, intercept = np.polyfit([r["batch"] for r in rows], [r["batch_ms"] for r in rows], 1)
+    return {"rows": rows, "fixed_ms": round(float(intercept), 2),
+            "ms_per_extra_frame": round(float(slope), 2)}
+
+
+def load_batcher(model_path: str = None):
+    """Shared batcher for the configured model, or None if disabled/unavailable."""
+    model_path = model_path or VIDEO_CLASSIFIER_MODEL
+    if not model_path:
+        return None
+    if not os.path.exists(model_path):
+        print(f"[!] Classifier model not found: {model_path} — heuristics only.")
+        return None
+    try:
+        batcher = ClassifierBatcher(FaceClassifier(model_path))
+    except RuntimeError as e:
+        print(f"[!] {e}")
+        return None
+    print(f"[✓] Face classifier loaded: {os.path.basename(model_path)}")
+    return batcher
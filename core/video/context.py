@@ -0,0 +1,106 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+from functools import cached_property
+from config import VIDEO_SPECTRAL_PATCH
+
+class FrameContext:
+    """
+    Derived buffers for one frame, computed on first use and shared by
+    every signal. Crops are views into the full-frame gray image, so the
+    face is converted to grayscale exactly once per frame. t is the
+    frame's timestamp (detector clock) for time-based signals. face_rect
+    may be filled in after construction; face buffers read it lazily.
+    """
+
+    # Buffers a signal may declare in @requires(...)
+    BUFFERS = ("frame", "gray", "thumb", "face_bgr", "face_gray", "face_flipped",
+               "left_half", "right_half", "laplacian", "face_patch", "spectral_patch")
+
+    PATCH_SIZE    = (100, 100)
+    SPECTRAL_SIZE = VIDEO_SPECTRAL_PATCH
+    THUMB_SIZE    = (32, 32)
+
+    def __init__(self, frame: np.ndarray, gray: np.ndarray, face_rect, t: float = 0.0):
+        self.frame     = frame
+        self.gray      = gray
+        self.face_rect = face_rect
+        self.t         = t
+
+    @cached_property
+    def thumb(self) -> np.ndarray:
+        """Whole frame, gray, area-averaged to 32x32 (frame hashing)."""
+        return cv2.resize(self.gray, self.THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+    @cached_property
+    def face_bgr(self) -> np.ndarray:
+        x, y, w, h = self.face_rect
+        return self.frame[y:y+h, x:x+w]
+
+    @cached_property
+    def face_gray(self) -> np.ndarray:
+        x, y, w, h = self.face_rect
+        return self.gray[y:y+h, x:x+w]
+
+    @cached_property
+    def face_flipped(self) -> np.ndarray:
+        return cv2.flip(self.face_gray, 1)
+
+    @cached_property
+    def left_half(self) -> np.ndarray:
+        return self.face_gray[:, :self.face_gray.shape[1] // 2]
+
+    @cached_property
+    def right_half(self) -> np.ndarray:
+        return self.face_gray[:, self.face_gray.shape[1] // 2:]
+
+    @cached_property
+    def laplacian(self) -> np.ndarray:
+        return cv2.Laplacian(self.face_gray, cv2.CV_64F)
+
+    @cached_property
+    def face_patch(self) -> np.ndarray:
+        """Face resized to a fixed canonical patch (motion)."""
+        return cv2.resize(self.face_gray, self.PATCH_SIZE)
+
+    @cached_property
+    def spectral_patch(self) -> np.ndarray:
+        """
+        Fixed-size crop from the middle of the face at native resolution,
+        so pixel-level up-sampling traces survive (resizing smears them).
+        Faces smaller than the crop are up-scaled to fit.
+        """
+        n    = self.SPECTRAL_SIZE
+        face = self.face_gray
+        h, w = face.shape[:2]
+        if h < n or w < n:
+            return cv2.resize(face, (n, n), interpolation=cv2.INTER_LINEAR)
+        y, x = (h - n) // 2, (w - n) // 2
+        return face[y:y+n, x:x+n]
+
+    def prepare(self, names):
+        """Compute the named buffers up front, in BUFFERS order (see buffers_for)."""
+        for name in names:
+            getattr(self, name)
+        return self
+
+
+def requires(*names):
+    """Declare which FrameContext buffers a signal reads."""
+    unknown = set(names) - set(FrameContext.BUFFERS)
+    if unknown:
+        raise ValueError(f"Unknown frame buffers: {sorted(unknown)}")
+
+    def wrap(fn):
+        fn.requires = names
+        return fn
+    return wrap
+
+
+def buffers_for(*fns) -> tuple:
+    """Union of the signals' @requires, ordered so a buffer follows its inputs."""
+    needed = {name for fn in fns for name in fn.requires}
+    return tuple(name for name in FrameContext.BUFFERS if name in needed)
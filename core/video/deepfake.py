@@ -7,78 +7,165 @@ import time
 import json
 import numpy as np
 from datetime import datetime
-from collections import deque
-from config import LOG_PATH
+from core.video.context import FrameContext, requires, buffers_for
+from core.video.rolling import RollingStats
+from core.video.motion import make_motion_engine
+from core.video.blink import make_blink_engine
+from core.video.face_backends import make_face_backend
+from core.video.spectral import RadialSpectrum
+from core.video.framehash import FrameHashIndex, dct_hash
+from core.video.resources import SharedResources
+from config import (LOG_PATH, VIDEO_DETECT_INTERVAL, VIDEO_TRACK_MIN_SCORE,
+                    VIDEO_TRACK_MARGIN, VIDEO_TRACK_SCALE, VIDEO_DETECT_SCALE,
+                    VIDEO_FACE_BACKEND, VIDEO_MOTION_ENGINE, VIDEO_MOTION_MAX_GAP, VIDEO_BLINK_MIN_SECS,
+                    VIDEO_BLINK_ENGINE,
+                    VIDEO_CLASSIFIER_STRIDE, VIDEO_THRESHOLDS)
 
 class DeepfakeDetector:
-    def __init__(self):
+    def __init__(self, detect_interval=VIDEO_DETECT_INTERVAL, detect_scale=VIDEO_DETECT_SCALE,
+                 clock=time.time, motion_engine=VIDEO_MOTION_ENGINE, resources=None,
+                 classifier=None, stream_key="live", thresholds=None, recorder=None,
+                 blink_engine=VIDEO_BLINK_ENGINE, face_backend=VIDEO_FACE_BACKEND):
         print("[*] Loading Deepfake Detector (OpenCV)...")
 
-        # Load OpenCV's built-in face + eye detectors
-        cascade_base = cv2.data.haarcascades
-        self.face_cascade = cv2.CascadeClassifier(cascade_base + "haarcascade_frontalface_default.xml")
-        self.eye_cascade  = cv2.CascadeClassifier(cascade_base + "haarcascade_eye.xml")
-
-        if self.face_cascade.empty() or self.eye_cascade.empty():
-            raise RuntimeError("Could not load cascade classifiers.")
+        # OpenCV's built-in face + eye detectors, shareable across streams
+        self.resources = resources or SharedResources()
 
         # History buffers
-        self.ear_history        = deque(maxlen=60)
-        self.texture_history    = deque(maxlen=30)
-        self.movement_history   = deque(maxlen=60)
-        self.symmetry_history   = deque(maxlen=30)
-        self.lighting_history   = deque(maxlen=30)
-
-        # Blink tracking
+        self.ear_history        = RollingStats(60)
+        self.texture_history    = RollingStats(30)
+        self.movement_history   = RollingStats(60)
+        self.symmetry_history   = RollingStats(30)
+        self.lighting_history   = RollingStats(30)
+        self.spectral_history   = RollingStats(30)
+
+        # Blink tracking (by time, so it holds when frames are skipped)
         self.blink_count        = 0
-        self.eyes_closed_frames = 0
-        self.BLINK_THRESHOLD    = 3
-        self.prev_eyes_detected = True
+        self.eyes_closed_since  = None       # last time eyes were seen before they went
+        self.eyes_seen_t        = None
+        self.BLINK_MIN_SECS     = VIDEO_BLINK_MIN_SECS
+        self.blink              = make_blink_engine(blink_engine, self.resources)
 
         # Frame tracking
         self.frame_count        = 0
-        self.analysis_start     = time.time()
-        self.prev_gray          = None
+        self.clock              = clock      # swap in video timestamps for offline files
+        self.analysis_start     = clock()
         self.prev_face_rect     = None
+        self.motion             = make_motion_engine(motion_engine)
+        self.spectrum           = RadialSpectrum()
+
+        # Repeated footage: looped clips, and pixel-identical frames
+        self.hash_index         = FrameHashIndex()
+        self.prev_ctx           = None
+        self.last_analysis      = None
+        self.last_risk          = 0.0        # raw (uncapped) risk of last_analysis
+        self.last_eyes          = (False, 0)
+        self.duplicate_frames   = 0
+        self.last_motion_t      = None
+
+        # Detect-then-track
+        self.detect_interval     = detect_interval
+        self.frames_since_detect = 0
+        self.track_template      = None
+        self.face_backend        = make_face_backend(face_backend, self.resources, detect_scale)
+
+        # Optional learned classifier (a shared ClassifierBatcher)
+        self.classifier         = classifier
+        self.stream_key         = stream_key
+        self.classify_stride    = VIDEO_CLASSIFIER_STRIDE
+        self.fake_prob_history  = RollingStats(10)
+        self._classifier_seq    = None
 
         # Risk
-        self.risk_scores        = deque(maxlen=30)
+        self.thresholds         = {**VIDEO_THRESHOLDS, **(thresholds or {})}
+        self.recorder           = recorder     # FeatureRecorder, optional
+        self.risk_scores        = RollingStats(30)
+        if recorder is not None:
+            recorder.describe(thresholds=self.thresholds, windows={
+                "texture" : self.texture_history.capacity,
+                "lighting": self.lighting_history.capacity,
+                "symmetry": self.symmetry_history.capacity,
+                "movement": self.movement_history.capacity,
+                "spectral": self.spectral_history.capacity,
+            })
         self.last_alert_time    = 0
 
         print("[✓] Deepfake Detector ready.")
 
+    @property
+    def face_cascade(self):
+        return self.resources.face_cascade
+
+    @property
+    def eye_cascade(self):
+        return self.resources.eye_cascade
+
     # ── Texture Score (Laplacian variance) ───────────────────
-    def _texture_score(self, face_roi):
+    @requires("laplacian")
+    def _texture_score(self, ctx):
         """Low variance = over-smoothed = deepfake artifact."""
         try:
-            gray = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY)
-            lap_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+            lap_var = ctx.laplacian.var()
             # Normalize: lower variance = higher artifact score
             score = max(0.0, 1.0 - (lap_var / 600.0))
             return round(float(score), 3)
         except:
             return 0.0
 
+    # ── Spectral Artifacts (radial power spectrum) ───────────
+    @requires("spectral_patch")
+    def _spectral_score(self, ctx):
+        """Up-sampling bumps in the face's high frequencies; see RadialSpectrum."""
+        return round(self.spectrum.artifact_score(ctx.spectral_patch), 3)
+
+    # ── Looped Footage (perceptual frame hashes) ─────────────
+    @requires("thumb")
+    def _loop_signal(self, ctx):
+        """
+        Hash the background (thumbnail with the face box blanked) and look
+        it up in the hash index. Returns (share of recent frames repeating
+        at one period, that period in seconds). The face itself is left
+        out: its crop follows the tracker box, and that jitter alone moves
+        its hash as far as a real change does.
+        """
+        H, W       = ctx.gray.shape[:2]
+        x, y, w, h = ctx.face_rect
+        th, tw     = ctx.thumb.shape[:2]
+        y0, y1     = y * th // H, -(-(y + h) * th // H)     # face box → thumb cells,
+        x0, x1     = x * tw // W, -(-(x + w) * tw // W)     # rounded outwards
+        bg         = ctx.thumb.copy()
+        bg[y0:y1, x0:x1] = int(bg.mean())
+        self.hash_index.add(dct_hash(bg), ctx.t)
+        period, share = self.hash_index.loop_period()
+        return round(float(share), 3), period
+
+    def _is_duplicate(self, ctx) -> bool:
+        """Pixel-identical to the previous frame (frozen or padded feed)?"""
+        prev = self.prev_ctx
+        if prev is None or self.last_analysis is None or prev.gray.shape != ctx.gray.shape:
+            return False
+        if not np.array_equal(prev.thumb, ctx.thumb):  # cheap gate, rejects almost every frame
+            return False
+        return cv2.norm(prev.gray, ctx.gray, cv2.NORM_INF) == 0
+
     # ── Lighting Asymmetry ───────────────────────────────────
-    def _lighting_asymmetry(self, face_roi):
+    @requires("left_half", "right_half")
+    def _lighting_asymmetry(self, ctx):
         """Real faces have roughly symmetric lighting. Deepfakes often don't."""
         try:
-            gray = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY)
-            h, w = gray.shape
-            left_mean  = np.mean(gray[:, :w//2])
-            right_mean = np.mean(gray[:, w//2:])
+            left_mean  = np.mean(ctx.left_half)
+            right_mean = np.mean(ctx.right_half)
             asymmetry  = abs(left_mean - right_mean) / 255.0
             return round(float(asymmetry), 3)
         except:
             return 0.0
 
     # ── Face Symmetry ────────────────────────────────────────
-    def _face_symmetry(self, face_roi):
+    @requires("face_gray", "face_flipped")
+    def _face_symmetry(self, ctx):
         """Real faces are naturally symmetric. Deepfake blending breaks symmetry."""
         try:
-            gray    = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY)
-            flipped = cv2.flip(gray, 1)
-            diff    = cv2.absdiff(gray, flipped)
+            diff    = cv2.absdiff(ctx.face_gray, ctx.face_flipped)
             score   = np.mean(diff) / 255.0
             # Higher diff = more asymmetric = more suspicious
             return round(float(score), 3)
@@ -86,155 +173,358 @@ class DeepfakeDetector:
             return 0.0
 
     # ── Optical Flow Movement ────────────────────────────────
-    def _movement_score(self, gray, face_rect):
-        """Measure natural micro-movements. Deepfakes are unnaturally still."""
-        try:
-            x, y, w, h = face_rect
-            face_gray = gray[y:y+h, x:x+w]
-            face_gray = cv2.resize(face_gray, (100, 100))
-
-            if self.prev_gray is None:
-                self.prev_gray = face_gray
-                return 1.0
-
-            flow = cv2.calcOpticalFlowFarneback(
-                self.prev_gray, face_gray,
-                None, 0.5, 3, 15, 3, 5, 1.2, 0
-            )
-            magnitude = np.sqrt(flow[..., 0]**2 + flow[..., 1]**2)
-            self.prev_gray = face_gray
-            return round(float(np.mean(magnitude)), 3)
-        except:
-            return 1.0
+    @requires("face_patch")
+    def _movement_score(self, ctx):
+        """
+        Measure natural micro-movements. Deepfakes are unnaturally still.
+        On the tracked face patch this is mostly bounded residual motion,
+        so it barely changes when frames are skipped (benchmark_governor);
+        after a gap longer than VIDEO_MOTION_MAX_GAP it starts over.
+        """
+        if self.last_motion_t is not None and ctx.t - self.last_motion_t > VIDEO_MOTION_MAX_GAP:
+            self.motion.reset()                 # too long ago to compare against
+        self.last_motion_t = ctx.t
+        return round(self.motion.update(ctx.face_patch), 3)
 
     # ── Blink Detection ──────────────────────────────────────
-    def _detect_blink(self, face_roi):
-        """Detect eyes using cascade. Missing eyes = possible blink."""
-        gray = cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY)
-        eyes = self.eye_cascade.detectMultiScale(gray, 1.1, 5, minSize=(20, 20))
-        eyes_detected = len(eyes) >= 2
+    @requires("gray", "face_gray")
+    def _detect_blink(self, ctx):
+        """
+        Ask the blink engine (core.video.blink) whether the eyes are open.
+        A blink counts when they are back if BLINK_MIN_SECS passed between
+        the last frame that saw them and this one. Timed this way, one
+        missing sample still counts when frames are being skipped.
+        Landmark engines also feed ear_history.
+        """
+        eyes_detected, eye_count, ear = self.blink.measure(ctx)
+        if ear is not None:
+            self.ear_history.append(ear)
 
         if not eyes_detected:
-            self.eyes_closed_frames += 1
+            if self.eyes_closed_since is None:
+                self.eyes_closed_since = self.eyes_seen_t if self.eyes_seen_t is not None else ctx.t
         else:
-            if self.eyes_closed_frames >= self.BLINK_THRESHOLD:
+            if (self.eyes_closed_since is not None
+                    and ctx.t - self.eyes_closed_since >= self.BLINK_MIN_SECS):
                 self.blink_count += 1
-            self.eyes_closed_frames = 0
-
-        return eyes_detected, len(eyes)
+            self.eyes_closed_since = None
+            self.eyes_seen_t       = ctx.t
+
+        return eyes_detected, eye_count
+
+    # ── Learned Classifier ───────────────────────────────────
+    @requires("face_bgr")
+    def _classifier_probability(self, ctx):
+        """
+        Queue every Nth face crop for batched inference and return the mean
+        of recent fake probabilities (None until the first result lands).
+        """
+        if self.classifier is None:
+            return None
+        if self.frame_count % self.classify_stride == 0:
+            self.classifier.submit(self.stream_key, ctx.face_bgr)
+        latest = self.classifier.latest(self.stream_key)
+        if latest is not None and latest[0] != self._classifier_seq:
+            self._classifier_seq = latest[0]
+            self.fake_prob_history.append(latest[1])
+        return self.fake_prob_history.mean() if len(self.fake_prob_history) else None
+
+    # ── Shared Buffers ───────────────────────────────────────
+    FACE_BUFFERS = buffers_for(_texture_score, _spectral_score, _loop_signal,
+                               _lighting_asymmetry, _face_symmetry, _movement_score,
+                               _detect_blink, _classifier_probability)
+
+    def _prepare_buffers(self, ctx):
+        """
+        Build every buffer the face signals declare, once, before any of
+        them runs, so no signal's cost includes conversions it shares.
+        """
+        return ctx.prepare(self.FACE_BUFFERS)
+
+    # ── Face Localization (detect, then track) ───────────────
+    def _detect_face(self, gray, frame=None):
+        """
+        Full detection with the configured backend (core.video.face_backends);
+        returns the largest face in full-resolution coordinates, or None.
+        DNN backends use the colour frame when given one.
+        """
+        return self.face_backend.detect(gray, frame)
+
+    def _track_face(self, gray):
+        """Template-match the last detected face inside a window around it."""
+        if self.prev_face_rect is None or self.track_template is None:
+            return None
+        H, W       = gray.shape[:2]
+        x, y, w, h = self.prev_face_rect
+        mx, my     = int(w * VIDEO_TRACK_MARGIN), int(h * VIDEO_TRACK_MARGIN)
+        x0, y0     = max(0, x - mx), max(0, y - my)
+        x1, y1     = min(W, x + w + mx), min(H, y + h + my)
+
+        s      = VIDEO_TRACK_SCALE
+        window = cv2.resize(gray[y0:y1, x0:x1], None, fx=s, fy=s,
+                            interpolation=cv2.INTER_AREA)
+        tmpl   = self.track_template
+        if window.shape[0] < tmpl.shape[0] or window.shape[1] < tmpl.shape[1]:
+            return None
+
+        res = cv2.matchTemplate(window, tmpl, cv2.TM_CCOEFF_NORMED)
+        _, score, _, loc = cv2.minMaxLoc(res)
+        if score < VIDEO_TRACK_MIN_SCORE:
+            return None
+        return (x0 + int(round(loc[0] / s)), y0 + int(round(loc[1] / s)), w, h)
+
+    def _locate_face(self, gray, frame=None):
+        """
+        Returns (face_rect or None, source). Full detection runs every
+        `detect_interval` frames or when the track is lost; otherwise the
+        face is tracked from prev_face_rect.
+        """
+        if (self.detect_interval > 1 and self.prev_face_rect is not None
+                and self.frames_since_detect < self.detect_interval - 1):
+            rect = self._track_face(gray)
+            if rect is not None:
+                self.frames_since_detect += 1
+                self.prev_face_rect = rect
+                return rect, "track"
+
+        rect = self._detect_face(gray, frame)
+        self.frames_since_detect = 0
+        self.prev_face_rect      = rect
+        if rect is not None and self.detect_interval > 1:
+            x, y, w, h = rect
+            s = VIDEO_TRACK_SCALE
+            self.track_template = cv2.resize(gray[y:y+h, x:x+w], None, fx=s, fy=s,
+                                             interpolation=cv2.INTER_AREA)
+        return rect, "detect"
 
     # ── Main Frame Analysis ──────────────────────────────────
-    def analyze_frame(self, frame):
+    def analyze_frame(self, frame, draw=True):
+        """
+        Analyze one BGR frame. Returns (frame, analysis); with draw=False
+        the frame is left untouched so rendering can happen elsewhere
+        (see render() and core.video.pipeline).
+        """
         self.frame_count += 1
+        now  = self.clock()
         h, w = frame.shape[:2]
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        ctx  = FrameContext(frame, gray, None, now)
+
+        # A repeat of the previous frame can't change any signal: reuse it
+        if self._is_duplicate(ctx):
+            self.duplicate_frames += 1
+            analysis = self._frozen_analysis(now)
+            if self.recorder is not None:
+                self.recorder.append(self.frame_count, now, max(1, now - self.analysis_start),
+                                     analysis, *self.last_eyes, self.blink_count)
+            if draw:
+                frame = self.render(frame, analysis)
+            return frame, analysis
+        self.prev_ctx = ctx
 
         analysis = {
             "face_detected"     : False,
             "blink_count"       : self.blink_count,
             "blink_rate"        : 0.0,
             "texture_score"     : 0.0,
+            "spectral_score"    : 0.0,
             "lighting_asymmetry": 0.0,
             "face_symmetry"     : 0.0,
             "movement_score"    : 0.0,
             "risk_score"        : 0.0,
             "risk_level"        : "ANALYZING...",
             "flags"             : [],
+            "face_rect"         : None,
+            "face_source"       : None,
+            "render_ms"         : None,
+            "fake_probability"  : None,
+            "loop_score"        : 0.0,
+            "loop_period"       : None,
+            "eye_aspect_ratio"  : None,
+            "duplicate"         : False,
+            "frozen_secs"       : 0.0,
         }
 
-        # Detect face
-        faces = self.face_cascade.detectMultiScale(
-            gray, scaleFactor=1.1, minNeighbors=5, minSize=(120, 120)
-        )
-
-        if len(faces) == 0:
-            frame = self._draw_no_face(frame)
+        # Locate face (largest detection, or tracked between detections)
+        face_rect, source = self._locate_face(gray, frame)
+        analysis["face_source"] = source
+
+        if face_rect is None:
+            if self.recorder is not None:
+                self.recorder.append(self.frame_count, now, max(1, now - self.analysis_start),
+                                     analysis, False, 0, self.blink_count)
+            self.last_analysis = analysis
+            self.last_risk     = 0.0
+            self.last_eyes     = (False, 0)
+            if draw:
+                frame = self.render(frame, analysis)
             return frame, analysis
 
-        # Use largest face
-        x, y, fw, fh = max(faces, key=lambda f: f[2] * f[3])
-        face_roi  = frame[y:y+fh, x:x+fw]
         analysis["face_detected"] = True
-
-        # Run all checks
-        texture     = self._texture_score(face_roi)
-        lighting    = self._lighting_asymmetry(face_roi)
-        symmetry    = self._face_symmetry(face_roi)
-        movement    = self._movement_score(gray, (x, y, fw, fh))
-        eyes_open, eye_count = self._detect_blink(face_roi)
+        analysis["face_rect"]     = face_rect
+
+        # Run all checks against one shared set of per-frame buffers
+        ctx.face_rect = face_rect
+        self._prepare_buffers(ctx)
+        texture     = self._texture_score(ctx)
+        spectral    = self._spectral_score(ctx)
+        lighting    = self._lighting_asymmetry(ctx)
+        symmetry    = self._face_symmetry(ctx)
+        movement    = self._movement_score(ctx)
+        eyes_open, eye_count = self._detect_blink(ctx)
+        loop_score, loop_period = self._loop_signal(ctx)
 
         self.texture_history.append(texture)
+        self.spectral_history.append(spectral)
         self.lighting_history.append(lighting)
         self.symmetry_history.append(symmetry)
         self.movement_history.append(movement)
+        fake_prob = self._classifier_probability(ctx)
 
-        elapsed     = max(1, time.time() - self.analysis_start)
+        elapsed     = max(1, now - self.analysis_start)
         blink_rate  = (self.blink_count / elapsed) * 60
 
         analysis.update({
             "blink_rate"        : round(blink_rate, 1),
             "texture_score"     : texture,
+            "spectral_score"    : spectral,
             "lighting_asymmetry": lighting,
             "face_symmetry"     : symmetry,
             "movement_score"    : round(movement, 3),
+            "fake_probability"  : round(fake_prob, 3) if fake_prob is not None else None,
+            "loop_score"        : loop_score,
+            "loop_period"       : round(loop_period, 2) if loop_period is not None else None,
+            "eye_aspect_ratio"  : self.ear_history.last() if len(self.ear_history) else None,
         })
 
         # ── Risk Calculation ─────────────────────────────────
         risk  = 0.0
         flags = []
 
-        # 1. Blink rate (normal 12-20/min, need 15s to judge)
-        if elapsed > 15:
-            if blink_rate < 4:
-                risk += 30
+        T          = self.thresholds
+        calibrated = elapsed > T["calibration_secs"]
+
+        # 1. Blink rate (normal 12-20/min, need the calibration window to judge)
+        if calibrated:
+            if blink_rate < T["blink_low"]:
+                risk += T["blink_low_points"]
                 flags.append(f"Abnormal blink rate: {blink_rate:.1f}/min")
-            elif blink_rate > 45:
-                risk += 15
+            elif blink_rate > T["blink_high"]:
+                risk += T["blink_high_points"]
                 flags.append(f"High blink rate: {blink_rate:.1f}/min")
 
         # 2. Texture smoothing
-        avg_texture = np.mean(list(self.texture_history)) if self.texture_history else 0
-        if avg_texture > 0.55:
-            risk += 25
+        avg_texture = self.texture_history.mean()
+        if avg_texture > T["texture"]:
+            risk += T["texture_points"]
             flags.append(f"Face over-smoothing: {avg_texture:.2f}")
 
         # 3. Lighting asymmetry
-        avg_lighting = np.mean(list(self.lighting_history)) if self.lighting_history else 0
-        if avg_lighting > 0.25:
-            risk += 20
+        avg_lighting = self.lighting_history.mean()
+        if avg_lighting > T["lighting"]:
+            risk += T["lighting_points"]
             flags.append(f"Lighting inconsistency: {avg_lighting:.2f}")
 
         # 4. Face asymmetry
-        avg_symmetry = np.mean(list(self.symmetry_history)) if self.symmetry_history else 0
-        if avg_symmetry > 0.18:
-            risk += 15
+        avg_symmetry = self.symmetry_history.mean()
+        if avg_symmetry > T["symmetry"]:
+            risk += T["symmetry_points"]
             flags.append(f"Face asymmetry detected: {avg_symmetry:.2f}")
 
         # 5. Unnatural stillness
-        avg_movement = np.mean(list(self.movement_history)) if self.movement_history else 1
-        if elapsed > 15 and avg_movement < 0.15:
-            risk += 15
+        avg_movement = self.movement_history.mean(default=1)
+        if calibrated and avg_movement < T["stillness"]:
+            risk += T["stillness_points"]
             flags.append(f"Unnatural stillness: {avg_movement:.3f}")
 
+        # 6. Learned classifier
+        if fake_prob is not None and fake_prob >= T["classifier"]:
+            risk += T["classifier_points"] * fake_prob
+            flags.append(f"Classifier fake probability: {fake_prob:.2f}")
+
+        # 7. Frequency-domain (up-sampling) artifacts
+        avg_spectral = self.spectral_history.mean()
+        if avg_spectral > T["spectral"]:
+            risk += T["spectral_points"]
+            flags.append(f"Spectral artifacts: {avg_spectral:.2f}")
+
+        # 8. Looped footage (the same frames coming back at a fixed period)
+        if loop_score >= T["loop"]:
+            risk += T["loop_points"]
+            flags.append(f"Looped video: repeats every {loop_period:.1f}s")
+
         analysis["risk_score"] = min(100, round(risk, 1))
         analysis["flags"]      = flags
         self.risk_scores.append(risk)
 
-        # Risk level
-        if risk >= 55:
-            analysis["risk_level"] = "DEEPFAKE DETECTED"
-        elif risk >= 30:
-            analysis["risk_level"] = "SUSPICIOUS"
-        elif elapsed < 15:
-            analysis["risk_level"] = "ANALYZING..."
-        else:
-            analysis["risk_level"] = "REAL"
+        analysis["risk_level"] = self._risk_level(risk, elapsed)
+
+        if self.recorder is not None:
+            self.recorder.append(self.frame_count, now, elapsed, analysis,
+                                 eyes_open, eye_count, self.blink_count)
+        self.last_analysis = analysis
+        self.last_risk     = risk
+        self.last_eyes     = (eyes_open, eye_count)
 
         # Draw everything
-        frame = self._draw_overlay(frame, analysis, (x, y, fw, fh))
+        if draw:
+            frame = self.render(frame, analysis)
         return frame, analysis
 
+    def _risk_level(self, risk, elapsed):
+        T = self.thresholds
+        if risk >= T["deepfake_level"]:
+            return "DEEPFAKE DETECTED"
+        if risk >= T["suspicious_level"]:
+            return "SUSPICIOUS"
+        if elapsed < T["calibration_secs"]:
+            return "ANALYZING..."
+        return "REAL"
+
+    def _frozen_analysis(self, now):
+        """
+        Result for a frame pixel-identical to the previous one: the last
+        analysis, reused. Real sensors never repeat a frame exactly, so a
+        face picture frozen past VIDEO_THRESHOLDS["frozen_secs"] (a stalled
+        or injected virtual-camera feed) adds risk growing over
+        "frozen_ramp_secs" to "frozen_points". Network and decoder stalls
+        shorter than frozen_secs add nothing.
+        """
+        T        = self.thresholds
+        frozen   = now - self.prev_ctx.t        # since the picture first appeared
+        analysis = {**self.last_analysis, "duplicate": True, "frozen_secs": round(frozen, 2)}
+        if analysis["face_detected"] and frozen > T["frozen_secs"]:
+            ramp = min(1.0, (frozen - T["frozen_secs"]) / T["frozen_ramp_secs"])
+            risk = self.last_risk + T["frozen_points"] * ramp
+            analysis["flags"]      = analysis["flags"] + [f"Frozen video: identical frames for {frozen:.1f}s"]
+            analysis["risk_score"] = min(100, round(risk, 1))
+            analysis["risk_level"] = self._risk_level(risk, max(1, now - self.analysis_start))
+        return analysis
+
     # ── Drawing ──────────────────────────────────────────────
+    def render(self, frame, analysis):
+        """Draw an analysis result onto a frame (in place); records render_ms."""
+        t0 = time.perf_counter()
+        if analysis["face_detected"]:
+            frame = self._draw_overlay(frame, analysis, analysis["face_rect"])
+        else:
+            frame = self._draw_no_face(frame)
+        analysis["render_ms"] = round((time.perf_counter() - t0) * 1000, 3)
+        return frame
+
+    @staticmethod
+    def _blend_rect(frame, x0, y0, x1, y1, color, alpha):
+        """Translucent filled rectangle; only the covered pixels are blended."""
+        h, w   = frame.shape[:2]
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(w, x1), min(h, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        roi  = frame[y0:y1, x0:x1]
+        fill = np.empty_like(roi)
+        fill[:] = color
+        cv2.addWeighted(fill, alpha, roi, 1 - alpha, 0, roi)
+
     def _draw_overlay(self, frame, analysis, face_rect):
         h, w   = frame.shape[:2]
         risk   = analysis["risk_score"]
@@ -257,9 +547,7 @@ class DeepfakeDetector:
                     cv2.FONT_HERSHEY_SIMPLEX, 0.65, color, 2)
 
         # Top bar background
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0, 0), (w, 95), (10, 10, 10), -1)
-        cv2.addWeighted(overlay, 0.75, frame, 0.25, 0, frame)
+        self._blend_rect(frame, 0, 0, w, 96, (10, 10, 10), 0.75)
 
         # Title
         cv2.putText(frame, "SENTINEL-GUARD  |  Live Deepfake Detector",
@@ -282,14 +570,13 @@ class DeepfakeDetector:
             f"Blink Rate  : {analysis['blink_rate']:.1f}/min  (normal: 12-20)",
             f"Blinks      : {analysis['blink_count']}",
             f"Texture     : {analysis['texture_score']:.3f}",
+            f"Spectral    : {analysis['spectral_score']:.3f}",
             f"Lighting    : {analysis['lighting_asymmetry']:.3f}",
             f"Symmetry    : {analysis['face_symmetry']:.3f}",
             f"Movement    : {analysis['movement_score']:.3f}",
         ]
         panel_top = h - len(stats) * 22 - 15
-        overlay2  = frame.copy()
-        cv2.rectangle(overlay2, (0, panel_top-8), (370, h), (10,10,10), -1)
-        cv2.addWeighted(overlay2, 0.6, frame, 0.4, 0, frame)
+        self._blend_rect(frame, 0, panel_top-8, 371, h, (10, 10, 10), 0.6)
         for i, s in enumerate(stats):
             cv2.putText(frame, s, (10, panel_top + i*22),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.44, (200, 200, 200), 1)
@@ -301,9 +588,7 @@ class DeepfakeDetector:
 
         # Alert banner
         if "DEEPFAKE" in level:
-            ab = frame.copy()
-            cv2.rectangle(ab, (0, h//2-35), (w, h//2+35), (0, 0, 180), -1)
-            cv2.addWeighted(ab, 0.7, frame, 0.3, 0, frame)
+            self._blend_rect(frame, 0, h//2-35, w, h//2+36, (0, 0, 180), 0.7)
             cv2.putText(frame, "DEEPFAKE DETECTED — DO NOT TRUST THIS CALL",
                         (w//2-340, h//2+10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
@@ -312,9 +597,7 @@ class DeepfakeDetector:
 
     def _draw_no_face(self, frame):
         h, w = frame.shape[:2]
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (0,0), (w, 55), (10,10,10), -1)
-        cv2.addWeighted(overlay, 0.75, frame, 0.25, 0, frame)
+        self._blend_rect(frame, 0, 0, w, 56, (10, 10, 10), 0.75)
         cv2.putText(frame, "SENTINEL-GUARD  |  No face detected",
                     (10, 35), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (100,100,100), 2)
         return frame
@@ -327,7 +610,8 @@ class DeepfakeDetector:
                     "type"     : "deepfake_alert",
                     "risk"     : analysis["risk_score"],
                     "level"    : analysis["risk_level"],
-                    "flags"    : analysis["flags"]
+                    "flags"    : analysis["flags"],
+                    **({"stream": analysis["stream"]} if "stream" in analysis else {}),
                 }) + "\n")
         except Exception as e:
             print(f"Log error: {e}")
@@ -335,36 +619,46 @@ class DeepfakeDetector:
 
 # ── Standalone runner ────────────────────────────────────────
 if __name__ == "__main__":
-    detector = DeepfakeDetector()
-    cap      = cv2.VideoCapture(0)
-
-    if not cap.isOpened():
-        print("[!] Cannot open webcam.")
-        exit()
-
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH,  1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-
-    print("\n[✓] Webcam live. Press Q to quit.")
-    print("[*] Keep face in frame. Calibrating for 15 seconds...\n")
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame = cv2.flip(frame, 1)
-        frame, analysis = detector.analyze_frame(frame)
-
-        if "DEEPFAKE" in analysis.get("risk_level", ""):
-            if time.time() - detector.last_alert_time > 10:
-                detector._log_alert(analysis)
-                detector.last_alert_time = time.time()
-
-        cv2.imshow("SENTINEL-GUARD | Deepfake Detector", frame)
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
-
-    cap.release()
-    cv2.destroyAllWindows()
-    print(f"\n[✓] Session ended. Total blinks detected: {detector.blink_count}")
+    import argparse
+    import contextlib
+    from core.video.classifier import load_batcher
+    from core.video.pipeline import PipelinedRunner
+    from core.video.recorder import FeatureRecorder
+    from core.video.blink import BLINK_ENGINES
+    from core.video.face_backends import FACE_BACKENDS
+    from config import VIDEO_CPU_BUDGET
+
+    parser = argparse.ArgumentParser(description="SENTINEL-GUARD live deepfake detector")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window; print one JSON analysis per line")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--classifier", default=None, help="ONNX face classifier (overrides config)")
+    parser.add_argument("--record", default=None, metavar="DIR",
+                        help="record per-frame features to a new (or empty) directory")
+    parser.add_argument("--budget", type=float, default=VIDEO_CPU_BUDGET,
+                        help="share of one core for analysis (0 = analyze every frame it can); "
+                             "analyses stay 0.1 s apart, or every 2nd frame at 15 fps and below")
+    parser.add_argument("--faces", choices=sorted(FACE_BACKENDS), default=VIDEO_FACE_BACKEND,
+                        help="face detector backend (res10/yunet need their model files)")
+    parser.add_argument("--blink", choices=sorted(BLINK_ENGINES), default=VIDEO_BLINK_ENGINE,
+                        help="blink engine (lbf needs opencv-contrib and VIDEO_LANDMARK_MODEL)")
+    args   = parser.parse_args()
+    source = int(args.source) if args.source.isdigit() else args.source
+    if args.record and os.path.isdir(args.record) and os.listdir(args.record):
+        parser.error(f"--record directory is not empty: {args.record}")
+
+    log = sys.stderr if args.headless else sys.stdout
+    with contextlib.redirect_stdout(log):      # keep stdout pure JSON when headless
+        recorder = FeatureRecorder(args.record, meta={"source": args.source}) if args.record else None
+        detector = DeepfakeDetector(classifier=load_batcher(args.classifier), recorder=recorder,
+                                    blink_engine=args.blink, face_backend=args.faces)
+    print("\n[✓] Webcam live. " + ("Ctrl+C to stop." if args.headless else "Press Q to quit."), file=log)
+    print("[*] Keep face in frame. Calibrating for 15 seconds...\n", file=log)
+
+    PipelinedRunner(detector, source=source, width=1280, height=720,
+                    headless=args.headless, budget=args.budget).run()
+    print(f"\n[✓] Session ended. Total blinks detected: {detector.blink_count}", file=log)
+    if recorder is not None:
+        recorder.close()
+        print(f"[✓] {recorder.rows} frames recorded to {args.record} "
+              f"(replay: python -m core.video.replay {args.record})", file=log)
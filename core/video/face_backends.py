@@ -0,0 +1,145 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+from config import (VIDEO_FACE_BACKEND, VIDEO_DETECT_SCALE, VIDEO_DETECT_TARGET_FACE,
+                    VIDEO_DETECT_MIN_SCALE, VIDEO_MIN_FACE, VIDEO_RES10_INPUT,
+                    VIDEO_YUNET_INPUT, VIDEO_DNN_CONFIDENCE)
+
+def largest_face(boxes, width: int, height: int, min_face: int = VIDEO_MIN_FACE):
+    """
+    Largest (x, y, w, h) box at least min_face wide, made square around
+    its centre and kept inside the frame, as the Haar cascade returns
+    them: FrameContext crops, the tracker template and the eye band all
+    assume that framing. None when nothing qualifies.
+    """
+    boxes = [b for b in boxes if b[2] >= min_face]
+    if not boxes:
+        return None
+    x, y, w, h = max(boxes, key=lambda b: b[2] * b[3])
+    side = int(min(round(w), width, height))
+    cx, cy = x + w / 2, y + h / 2
+    x0 = int(min(max(0, round(cx - side / 2)), width - side))
+    y0 = int(min(max(0, round(cy - side / 2)), height - side))
+    return (x0, y0, side, side)
+
+
+class HaarBackend:
+    """
+    Frontal-face Haar cascade on a downscaled copy of the gray frame.
+    "auto" scale picks the factor from the last face width so the face
+    lands near VIDEO_DETECT_TARGET_FACE px at detection scale.
+    """
+
+    name = "haar"
+
+    def __init__(self, resources, detect_scale=VIDEO_DETECT_SCALE):
+        self.resources       = resources
+        self.detect_scale    = detect_scale
+        self.last_face_width = None
+
+    def scale(self) -> float:
+        """Downscale factor for detection (1.0 = full resolution)."""
+        if self.detect_scale != "auto":
+            return float(self.detect_scale)
+        ref = self.last_face_width or VIDEO_MIN_FACE
+        return min(1.0, max(VIDEO_DETECT_MIN_SCALE, VIDEO_DETECT_TARGET_FACE / ref))
+
+    def detect(self, gray, frame=None):
+        """Largest face in full-resolution coordinates, or None."""
+        s     = self.scale()
+        small = gray if s >= 1.0 else cv2.resize(gray, None, fx=s, fy=s,
+                                                 interpolation=cv2.INTER_AREA)
+        min_face = max(24, int(VIDEO_MIN_FACE * s))
+        faces = self.resources.face_cascade.detectMultiScale(
+            small, scaleFactor=1.1, minNeighbors=5, minSize=(min_face, min_face)
+        )
+        if len(faces) == 0:
+            self.last_face_width = None
+            return None
+        fx, fy, fw, fh = max(faces, key=lambda f: f[2] * f[3])
+        rect = (int(fx / s), int(fy / s), int(fw / s), int(fh / s))
+        self.last_face_width = rect[2]
+        return rect
+
+
+class Res10Backend:
+    """
+    OpenCV's res10 SSD (ResNet-10, Caffe) through cv2.dnn on the CPU.
+    The colour frame is resized to one fixed square blob, so the cost
+    does not depend on the capture resolution. Trained on colour images;
+    a gray-only caller gets the gray frame replicated to three channels.
+    """
+
+    name = "res10"
+    MEAN = (104.0, 177.0, 123.0)
+
+    def __init__(self, resources, input_size: int = VIDEO_RES10_INPUT,
+                 confidence: float = VIDEO_DNN_CONFIDENCE):
+        self.resources  = resources
+        self.input_size = input_size
+        self.confidence = confidence
+        resources.res10_net                     # fail fast if unavailable
+
+    def detect(self, gray, frame=None):
+        img  = frame if frame is not None else cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        H, W = img.shape[:2]
+        n    = self.input_size
+        blob = cv2.dnn.blobFromImage(cv2.resize(img, (n, n), interpolation=cv2.INTER_AREA),
+                                     1.0, (n, n), self.MEAN)
+        net  = self.resources.res10_net
+        net.setInput(blob)
+        out  = net.forward()[0, 0]              # (N, 7): id, class, score, x0, y0, x1, y1
+        out  = out[out[:, 2] >= self.confidence]
+        boxes = [(x0 * W, y0 * H, (x1 - x0) * W, (y1 - y0) * H)
+                 for x0, y0, x1, y1 in np.clip(out[:, 3:7], 0.0, 1.0)]
+        return largest_face(boxes, W, H)
+
+
+class YuNetBackend:
+    """
+    YuNet (cv2.FaceDetectorYN, ONNX) on the CPU. The frame is resized to
+    a fixed input width, keeping its aspect ratio; the detector's input
+    size is set to match on every call, since one instance per thread
+    serves streams of any size.
+    """
+
+    name = "yunet"
+
+    def __init__(self, resources, input_width: int = VIDEO_YUNET_INPUT):
+        self.resources   = resources
+        self.input_width = input_width
+        resources.yunet                         # fail fast if unavailable
+
+    def detect(self, gray, frame=None):
+        img   = frame if frame is not None else cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        H, W  = img.shape[:2]
+        w     = self.input_width
+        h     = max(1, int(round(H * w / W)))
+        small = cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)
+        model = self.resources.yunet
+        model.setInputSize((w, h))
+        _, faces = model.detect(small)
+        if faces is None:
+            return None
+        s = W / w
+        boxes = [(f[0] * s, f[1] * s, f[2] * s, f[3] * s) for f in faces]
+        return largest_face(boxes, W, H)
+
+
+FACE_BACKENDS = {
+    HaarBackend.name : HaarBackend,
+    Res10Backend.name: Res10Backend,
+    YuNetBackend.name: YuNetBackend,
+}
+
+
+def make_face_backend(name: str = VIDEO_FACE_BACKEND, resources=None,
+                      detect_scale=VIDEO_DETECT_SCALE):
+    if name not in FACE_BACKENDS:
+        raise ValueError(f"Unknown face backend '{name}' — choose from {sorted(FACE_BACKENDS)}")
+    if name == HaarBackend.name:
+        return HaarBackend(resources, detect_scale)
+    return FACE_BACKENDS[name](resources)
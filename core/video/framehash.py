@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+from collections import deque
+from config import (VIDEO_HASH_INDEX, VIDEO_HASH_NEAR_BITS, VIDEO_HASH_CHANGE_BITS,
+                    VIDEO_LOOP_MIN_SECS, VIDEO_LOOP_WINDOW, VIDEO_LOOP_TOLERANCE)
+
+HASH_SIZE = 32                                          # DCT input, px (FrameContext.thumb)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1)
+
+def dct_hash(gray: np.ndarray) -> np.uint64:
+    """
+    64-bit perceptual hash: 32x32 area-downsample, DCT, and one bit per
+    8x8 low-frequency coefficient (above/below their median; DC left 0).
+    Small shifts, noise and compression flip few bits.
+    """
+    small = gray if gray.shape[:2] == (HASH_SIZE, HASH_SIZE) else \
+        cv2.resize(gray, (HASH_SIZE, HASH_SIZE), interpolation=cv2.INTER_AREA)
+    coef = cv2.dct(small.astype(np.float32))[:8, :8].ravel()
+    bits = np.zeros(64, dtype=bool)
+    bits[1:] = coef[1:] > np.median(coef[1:])
+    return np.packbits(bits).view(">u8")[0].astype(np.uint64)
+
+
+def hamming(h: np.uint64, table: np.ndarray) -> np.ndarray:
+    """Bit distance from h to every hash in a uint64 array."""
+    x = np.bitwise_xor(table, h)
+    return _POPCOUNT[x.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class FrameHashIndex:
+    """
+    Bounded ring of (scene hash, timestamp) for the last `capacity`
+    analyzed face frames, used to spot looped footage.
+
+    A frame repeats an earlier one when its hash is within near_bits of
+    it, at least min_lag seconds back, and the scene moved away and came
+    back: some frame in between is at least change_bits further from the
+    current one than the match is. Without that rule a static room would
+    "repeat" at every lag. A looped clip repeats at one fixed lag on frame
+    after frame, while chance look-alikes land at scattered lags, so
+    loop_period() reports the share of the last `window` frames that
+    matched at the dominant lag.
+    """
+
+    def __init__(self, capacity: int = VIDEO_HASH_INDEX, near_bits: int = VIDEO_HASH_NEAR_BITS,
+                 change_bits: int = VIDEO_HASH_CHANGE_BITS, min_lag: float = VIDEO_LOOP_MIN_SECS,
+                 window: int = VIDEO_LOOP_WINDOW, tolerance: float = VIDEO_LOOP_TOLERANCE):
+        self.capacity    = capacity
+        self.near_bits   = near_bits
+        self.change_bits = change_bits
+        self.min_lag     = min_lag
+        self.tolerance   = tolerance
+        self.hashes      = np.zeros(capacity, dtype=np.uint64)
+        self.times       = np.zeros(capacity, dtype=np.float64)
+        self.n           = 0                     # entries ever added
+        self.lags        = deque(maxlen=window)  # matched lag per frame, None = no repeat
+
+    def _ordered(self):
+        """Index positions oldest → newest."""
+        k = min(self.n, self.capacity)
+        return (np.arange(self.n - k, self.n) % self.capacity) if k else np.empty(0, np.intp)
+
+    def add(self, frame_hash: np.uint64, t: float):
+        """Look the frame up, then store it. Returns the repeat lag (s) or None."""
+        idx = self._ordered()
+        lag = None
+        if len(idx):
+            dist  = hamming(frame_hash, self.hashes[idx])
+            # largest distance from the current frame among entries after each one
+            after = np.maximum.accumulate(dist[::-1])[::-1]
+            after = np.append(after[1:], 0)
+            ok    = ((dist <= self.near_bits) & (after - dist >= self.change_bits)
+                     & (t - self.times[idx] >= self.min_lag))
+            if ok.any():
+                cand = np.flatnonzero(ok)
+                j    = cand[dist[cand] == dist[cand].min()][-1]   # closest, then most recent
+                lag  = float(t - self.times[idx[j]])
+
+        i = self.n % self.capacity
+        self.hashes[i], self.times[i] = frame_hash, t
+        self.n += 1
+        self.lags.append(lag)
+        return lag
+
+    def loop_period(self):
+        """(dominant lag in seconds, share of the window repeating at it)."""
+        lags = np.array([l for l in self.lags if l is not None])
+        if not len(lags) or not self.lags.maxlen:
+            return None, 0.0
+        near   = np.abs(lags[:, None] - lags[None, :]) <= self.tolerance
+        counts = near.sum(axis=1)
+        best   = int(counts.argmax())
+        return float(np.median(lags[near[best]])), counts[best] / self.lags.maxlen
+
+    def reset(self):
+        self.n = 0
+        self.lags.clear()
@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import math
+import time
+from core.video.rolling import RollingStats
+from config import VIDEO_CPU_BUDGET, VIDEO_GOVERNOR_MAX_INTERVAL, VIDEO_GOVERNOR_MIN_STRIDE
+
+class FrameGovernor:
+    """
+    Keeps deepfake analysis inside a CPU budget by analyzing every k-th frame.
+
+    budget is the share of one core analysis may use. The governor tracks
+    the mean analysis cost and the input frame period and picks
+    k = ceil(cost / (budget × period)). Decisions are made on frame
+    timestamps, so frames dropped upstream (e.g. by PipelinedRunner's
+    latest-frame hand-off) still count towards k.
+
+    k is capped from the source frame rate so analyses are at most
+    max_interval apart: blinks are timed from the frames that are
+    analyzed, and one that falls entirely between two samples is lost.
+    Past that point the budget gives way. At 15 fps and below that cap
+    would be k = 1, so it never goes under min_stride: slow webcams get
+    coarser blink timing rather than no budget at all. Skipped frames
+    reuse the last result, marked "held". Pass stride= to pin k instead
+    (benchmarks).
+    """
+
+    def __init__(self, budget: float = VIDEO_CPU_BUDGET,
+                 max_interval: float = VIDEO_GOVERNOR_MAX_INTERVAL,
+                 min_stride: int = VIDEO_GOVERNOR_MIN_STRIDE, stride: int = None):
+        self.budget       = budget
+        self.max_interval = max_interval
+        self.min_stride   = min_stride
+        self.fixed        = stride
+        self.stride       = stride or 1
+
+        self.cost         = RollingStats(30)  # seconds per analyzed frame
+        self.period       = RollingStats(30)  # seconds between offered frames
+        self.last_t       = None
+        self.last_run_t   = None
+        self.last         = None              # last fresh analysis (step())
+        self.offered      = 0
+        self.analyzed     = 0
+
+    def offer(self, t: float) -> bool:
+        """Should the frame stamped t be analyzed?"""
+        if self.last_t is not None and t > self.last_t:
+            self.period.append(t - self.last_t)
+        self.last_t   = t
+        self.offered += 1
+
+        # min, not mean: dropped frames only add whole multiples of the period
+        period = self.period.min(default=0.0)
+        if (self.last_run_t is not None and self.stride > 1
+                and t - self.last_run_t < (self.stride - 0.5) * period):
+            return False
+        self.last_run_t = t
+        self.analyzed  += 1
+        return True
+
+    def record(self, cost_secs: float):
+        """Report how long the analysis of an offered frame took."""
+        self.cost.append(cost_secs)
+        period = self.period.min(default=0.0)
+        if self.fixed or not self.budget or period <= 0:
+            return
+        k     = math.ceil(self.cost.mean() / (self.budget * period))
+        max_k = max(self.min_stride, int(self.max_interval / period + 1e-6))
+        self.stride = int(min(max_k, max(1, k)))
+
+    def step(self, detector, frame, t: float) -> dict:
+        """Analyze or hold, for callers that run the detector inline."""
+        if self.offer(t):
+            t0 = time.perf_counter()
+            _, analysis = detector.analyze_frame(frame, draw=False)
+            self.record(time.perf_counter() - t0)
+            analysis["held"] = False
+            self.last = analysis
+            return analysis
+        return {**self.last, "held": True}
+
+    @property
+    def load(self) -> float:
+        """Estimated share of one core spent on analysis at the current k."""
+        period = self.period.min(default=0.0)
+        if not len(self.cost) or period <= 0:
+            return 0.0
+        return self.cost.mean() / (self.stride * period)
+
+    def stats(self) -> dict:
+        return {
+            "budget"       : self.budget,
+            "stride"       : self.stride,
+            "analysis_ms"  : round(self.cost.mean() * 1000, 2),
+            "load"         : round(self.load, 3),
+            "offered"      : self.offered,
+            "analyzed"     : self.analyzed,
+        }
@@ -0,0 +1,99 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+from config import VIDEO_MOTION_ENGINE, VIDEO_LK_MAX_POINTS
+
+class FarnebackMotion:
+    """Dense optical flow over the whole canonical face patch."""
+
+    name = "farneback"
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.prev = None
+
+    def update(self, patch: np.ndarray) -> float:
+        """Mean flow magnitude (px/frame) since the previous patch; 1.0 on the first."""
+        if self.prev is None or self.prev.shape != patch.shape:
+            self.prev = patch
+            return 1.0
+        flow = cv2.calcOpticalFlowFarneback(
+            self.prev, patch, None, 0.5, 3, 15, 3, 5, 1.2, 0
+        )
+        self.prev = patch
+        return float(np.mean(np.sqrt(flow[..., 0]**2 + flow[..., 1]**2)))
+
+
+class LucasKanadeMotion:
+    """
+    Sparse pyramidal Lucas-Kanade on the canonical face patch.
+
+    Up to max_points corners are tracked from patch to patch and
+    re-seeded when too few survive. Cost depends on the point count,
+    not on the face size. Returns the mean displacement of the points
+    tracked successfully, in patch pixels per frame (the same units as
+    the Farneback engine).
+    """
+
+    name = "lk"
+
+    LK_PARAMS = dict(
+        winSize  = (15, 15),
+        maxLevel = 2,
+        criteria = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+    )
+
+    def __init__(self, max_points: int = VIDEO_LK_MAX_POINTS, min_points: int = None):
+        self.max_points = max_points
+        self.min_points = min_points or max(4, max_points // 3)
+        self.reset()
+
+    def reset(self):
+        self.prev   = None
+        self.points = None
+
+    def _seed(self, patch):
+        self.points = cv2.goodFeaturesToTrack(
+            patch, maxCorners=self.max_points, qualityLevel=0.01, minDistance=5, blockSize=5
+        )
+
+    def update(self, patch: np.ndarray) -> float:
+        if self.prev is None or self.prev.shape != patch.shape:
+            self.prev = patch
+            self._seed(patch)
+            return 1.0
+
+        if self.points is None or len(self.points) < self.min_points:
+            self._seed(self.prev)
+            if self.points is None or len(self.points) < self.min_points:
+                self.prev = patch
+                return 1.0              # featureless patch: nothing to measure
+
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(self.prev, patch, self.points, None,
+                                                  **self.LK_PARAMS)
+        good = status.ravel() == 1
+        self.prev = patch
+        if not good.any():
+            self.points = None
+            return 1.0
+        disp = np.linalg.norm((nxt[good] - self.points[good]).reshape(-1, 2), axis=1)
+        self.points = nxt[good].reshape(-1, 1, 2)
+        return float(disp.mean())
+
+
+MOTION_ENGINES = {
+    FarnebackMotion.name  : FarnebackMotion,
+    LucasKanadeMotion.name: LucasKanadeMotion,
+}
+
+
+def make_motion_engine(name: str = VIDEO_MOTION_ENGINE):
+    try:
+        return MOTION_ENGINES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown motion engine '{name}' — choose from {sorted(MOTION_ENGINES)}")
@@ -0,0 +1,259 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import io
+import cv2
+import json
+import time
+import argparse
+import threading
+import contextlib
+import numpy as np
+from collections import deque
+from core.video.classifier import load_batcher
+from core.video.deepfake import DeepfakeDetector
+from core.video.pipeline import RateMeter
+from core.video.resources import SharedResources
+from core.video.rolling import RollingStats
+
+class StreamSession:
+    """One monitored call: its source, its own detector state and its stats."""
+
+    def __init__(self, stream_id: str, source, resources: SharedResources, classifier=None):
+        self.id     = stream_id
+        self.source = source
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.detector = DeepfakeDetector(resources=resources, classifier=classifier,
+                                             stream_key=stream_id)
+
+        self.lock      = threading.Lock()
+        self.frame     = None           # newest unanalyzed (frame, captured_at)
+        self.queued    = False          # sitting in the ready queue
+        self.in_flight = False          # a worker is analyzing it
+        self.finished  = False
+
+        self.analysis  = None
+        self.latency   = RollingStats(300)  # capture → result, ms
+        self.rate      = RateMeter()
+        self.captured  = 0
+        self.analyzed  = 0
+        self.dropped   = 0              # frames overwritten before analysis
+
+
+class MultiStreamServer:
+    """
+    Watches several video calls with one fixed pool of analysis workers.
+
+    Cascades are loaded once per worker thread (SharedResources). Every
+    stream keeps its own DeepfakeDetector state. Each capture thread keeps
+    only the newest frame of its stream. A stream with a fresh frame joins
+    a FIFO ready queue at most once, and a worker only takes a stream no
+    other worker is analyzing. So streams are served round-robin: a busy
+    or high-fps source cannot starve the others, and each detector sees
+    its frames in order.
+
+    With a classifier (ClassifierBatcher), one batcher is shared by every
+    stream, so face crops from different calls are batched together.
+    """
+
+    def __init__(self, sources, workers: int = 2, on_result=None, pace_files: bool = True,
+                 classifier=None):
+        self.resources  = SharedResources()
+        self.classifier = classifier
+        self.sessions   = [StreamSession(f"s{i}", src, self.resources, classifier)
+                           for i, src in enumerate(sources)]
+        self.workers    = workers
+        self.on_result  = on_result
+        self.pace_files = pace_files
+
+        self.ready      = deque()
+        self.cond       = threading.Condition()
+        self.stop_evt   = threading.Event()
+        self.total_rate = RateMeter(window=240)
+        self.started_at = None
+
+    # ── Capture ──────────────────────────────────────────────
+    def _capture_loop(self, s: StreamSession):
+        cap = cv2.VideoCapture(s.source)
+        if not cap.isOpened():
+            print(f"[!] {s.id}: cannot open {s.source}")
+            s.finished = True
+            return
+        is_file  = not isinstance(s.source, int)
+        interval = 1.0 / (cap.get(cv2.CAP_PROP_FPS) or 30.0) if is_file and self.pace_files else 0
+        next_at  = time.perf_counter()
+        try:
+            while not self.stop_evt.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if interval:                     # replay recordings at their own frame rate
+                    next_at += interval
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self._offer(s, frame)
+        finally:
+            cap.release()
+            s.finished = True
+
+    def _offer(self, s: StreamSession, frame):
+        with s.lock:
+            if s.frame is not None:
+                s.dropped += 1
+            s.frame     = (frame, time.perf_counter())
+            s.captured += 1
+            enqueue     = not s.queued and not s.in_flight
+            if enqueue:
+                s.queued = True
+        if enqueue:
+            with self.cond:
+                self.ready.append(s)
+                self.cond.notify()
+
+    # ── Workers ──────────────────────────────────────────────
+    def _worker_loop(self):
+        cv2.setNumThreads(1)
+        while not self.stop_evt.is_set():
+            with self.cond:
+                self.cond.wait_for(lambda: self.ready or self.stop_evt.is_set(), timeout=0.5)
+                if not self.ready:
+                    continue
+                s = self.ready.popleft()
+
+            with s.lock:
+                item, s.frame = s.frame, None
+                s.queued, s.in_flight = False, True
+            if item is None:
+                s.in_flight = False
+                continue
+
+            frame, captured_at = item
+            _, analysis = s.detector.analyze_frame(frame, draw=False)
+            latency_ms  = (time.perf_counter() - captured_at) * 1000
+            analysis["stream"]     = s.id
+            analysis["latency_ms"] = round(latency_ms, 1)
+
+            s.analysis = analysis
+            s.latency.append(latency_ms)
+            s.analyzed += 1
+            s.rate.tick()
+            self.total_rate.tick()
+            self._maybe_alert(s, analysis)
+            if self.on_result:
+                self.on_result(s.id, analysis)
+
+            with s.lock:
+                s.in_flight = False
+                requeue = s.frame is not None and not s.queued
+                if requeue:
+                    s.queued = True
+            if requeue:
+                with self.cond:
+                    self.ready.append(s)
+                    self.cond.notify()
+
+    @staticmethod
+    def _maybe_alert(s: StreamSession, analysis: dict):
+        det = s.detector
+        if "DEEPFAKE" in analysis["risk_level"] and time.time() - det.last_alert_time > 10:
+            det._log_alert(analysis)
+            det.last_alert_time = time.time()
+
+    # ── Stats ────────────────────────────────────────────────
+    def stats(self) -> dict:
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0
+        streams = []
+        for s in self.sessions:
+            lat = s.latency.values()
+            streams.append({
+                "stream"        : s.id,
+                "source"        : str(s.source),
+                "captured"      : s.captured,
+                "analyzed"      : s.analyzed,
+                "dropped"       : s.dropped,
+                "fps"           : round(s.rate.fps, 1),
+                "latency_p50_ms": round(float(np.percentile(lat, 50)), 1) if len(lat) else None,
+                "latency_p95_ms": round(float(np.percentile(lat, 95)), 1) if len(lat) else None,
+                "risk_level"    : s.analysis["risk_level"] if s.analysis else None,
+            })
+        analyzed = sum(s.analyzed for s in self.sessions)
+        return {
+            "workers"      : self.workers,
+            "streams"      : len(self.sessions),
+            "aggregate_fps": round(analyzed / elapsed, 1) if elapsed else 0.0,
+            "recent_fps"   : round(self.total_rate.fps, 1),
+            "per_stream"   : streams,
+            "classifier"   : self.classifier.stats() if self.classifier else None,
+        }
+
+    # ── Run ──────────────────────────────────────────────────
+    def run(self, duration: float = None, report_every: float = 5.0):
+        self.started_at = time.perf_counter()
+        captures = [threading.Thread(target=self._capture_loop, args=(s,), daemon=True)
+                    for s in self.sessions]
+        workers  = [threading.Thread(target=self._worker_loop, daemon=True, name=f"df-worker-{i}")
+                    for i in range(self.workers)]
+        for t in captures + workers:
+            t.start()
+
+        next_report = time.perf_counter() + report_every
+        try:
+            while not self.stop_evt.is_set():
+                time.sleep(0.1)
+                now = time.perf_counter()
+                if duration and now - self.started_at >= duration:
+                    break
+                if all(s.finished and s.frame is None and not s.in_flight for s in self.sessions):
+                    break
+                if report_every and now >= next_report:
+                    print_stats(self.stats())
+                    next_report = now + report_every
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop_evt.set()
+            with self.cond:
+                self.cond.notify_all()
+            for t in captures + workers:
+                t.join(timeout=2)
+        return self.stats()
+
+
+def print_stats(stats: dict):
+    print(f"\n  {stats['streams']} streams | {stats['workers']} workers | "
+          f"aggregate {stats['aggregate_fps']} fps (recent {stats['recent_fps']})")
+    for r in stats["per_stream"]:
+        print(f"   {r['stream']:>4} {r['source'][-24:]:>24} | {r['fps']:>5} fps | "
+              f"analyzed {r['analyzed']:>5} dropped {r['dropped']:>5} | "
+              f"latency p50 {r['latency_p50_ms']} ms p95 {r['latency_p95_ms']} ms | "
+              f"{r['risk_level']}")
+    c = stats.get("classifier")
+    if c:
+        print(f"   classifier | {c['batches']} batches, mean size {c['mean_batch']} | "
+              f"{c['batch_ms_mean']} ms/batch (max {c['batch_ms_max']})"
+              + (f" | fixed {c['fixed_ms']} ms + {c['ms_per_extra_frame']} ms per extra frame"
+                 if "fixed_ms" in c else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SENTINEL-GUARD multi-stream deepfake monitor")
+    parser.add_argument("sources", nargs="+", help="camera indices and/or video files")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--duration", type=float, default=None, help="stop after N seconds")
+    parser.add_argument("--json", help="write final stats to this file")
+    parser.add_argument("--classifier", default=None, help="ONNX face classifier (overrides config)")
+    args = parser.parse_args()
+
+    sources = [int(s) if s.isdigit() else s for s in args.sources]
+    print("=" * 60)
+    print("   SENTINEL-GUARD — Multi-Stream Deepfake Monitor")
+    print("=" * 60)
+    server = MultiStreamServer(sources, workers=args.workers,
+                               classifier=load_batcher(args.classifier))
+    final  = server.run(duration=args.duration)
+    print_stats(final)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(final, f, indent=2)
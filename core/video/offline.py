@@ -0,0 +1,208 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import io
+import cv2
+import csv
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from core.video.sources import VideoClock
+from config import VIDEO_OFFLINE_SEGMENT_SECS, VIDEO_OFFLINE_WARMUP_SECS
+
+LEVEL_RANK = {"NO FACE": 0, "ANALYZING...": 1, "REAL": 2, "SUSPICIOUS": 3, "DEEPFAKE DETECTED": 4}
+
+# ── Planning ─────────────────────────────────────────────────
+def probe(path: str) -> dict:
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open video: {path}")
+    fps    = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return {"fps": fps, "frames": frames, "duration": frames / fps if frames > 0 else None}
+
+
+def plan_segments(duration, segment_secs: float, warmup_secs: float) -> list:
+    """
+    [(warm_start, start, end)] covering the video. Each segment begins
+    decoding warmup_secs early, so its histories and calibration window
+    are already full when its own frames start being scored.
+    """
+    if not duration:
+        return [(0.0, 0.0, float("inf"))]
+    segments = []
+    start    = 0.0
+    while start < duration:
+        end = min(duration, start + segment_secs)
+        segments.append((max(0.0, start - warmup_secs), start, end))
+        start = end
+    return segments
+
+
+# ── Worker ───────────────────────────────────────────────────
+def analyze_segment(path: str, fps: float, warm_start: float, start: float, end: float) -> dict:
+    """Run one detector over [warm_start, end); keep rows for [start, end)."""
+    from core.video.deepfake import DeepfakeDetector
+    cv2.setNumThreads(1)                    # one core per worker
+
+    clock = VideoClock(warm_start)
+    with contextlib.redirect_stdout(io.StringIO()):
+        detector = DeepfakeDetector(clock=clock)
+
+    cap = cv2.VideoCapture(path)
+    if warm_start > 0:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(round(warm_start * fps)))
+    cpu0   = time.process_time()
+    rows   = []
+    frames = 0
+    try:
+        while True:
+            t = cap.get(cv2.CAP_PROP_POS_FRAMES) / fps
+            if t >= end:
+                break
+            ret, frame = cap.read()
+            if not ret:
+                break
+            clock.t = t
+            _, a = detector.analyze_frame(frame, draw=False)
+            frames += 1
+            if t >= start:
+                rows.append({
+                    "t"     : round(t, 3),
+                    "risk"  : a["risk_score"],
+                    "level" : a["risk_level"] if a["face_detected"] else "NO FACE",
+                    "face"  : a["face_detected"],
+                    "flags" : a["flags"],
+                })
+    finally:
+        cap.release()
+
+    return {
+        "start"   : start,
+        "end"     : end,
+        "frames"  : frames,                 # decoded, including warm-up
+        "cpu_secs": time.process_time() - cpu0,
+        "rows"    : rows,
+    }
+
+
+def _run_segment(args):
+    return analyze_segment(*args)
+
+
+# ── Timeline ─────────────────────────────────────────────────
+def per_second_timeline(rows: list) -> list:
+    """Frame rows → one entry per video second (peak and mean risk, worst level)."""
+    buckets = {}
+    for r in rows:
+        buckets.setdefault(int(r["t"]), []).append(r)
+
+    timeline = []
+    for sec in sorted(buckets):
+        group = buckets[sec]
+        risks = [r["risk"] for r in group]
+        flags = sorted({f.split(":")[0] for r in group for f in r["flags"]})
+        timeline.append({
+            "second"    : sec,
+            "frames"    : len(group),
+            "max_risk"  : max(risks),
+            "mean_risk" : round(sum(risks) / len(risks), 1),
+            "level"     : max((r["level"] for r in group), key=LEVEL_RANK.get),
+            "face_ratio": round(sum(r["face"] for r in group) / len(group), 2),
+            "flags"     : flags,
+        })
+    return timeline
+
+
+def write_timeline(timeline: list, path: str, summary: dict = None):
+    """.csv → one row per second; anything else → JSON with the summary."""
+    if path.lower().endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["second", "frames", "max_risk", "mean_risk",
+                                                   "level", "face_ratio", "flags"])
+            writer.writeheader()
+            for row in timeline:
+                writer.writerow({**row, "flags": "; ".join(row["flags"])})
+    else:
+        with open(path, "w") as f:
+            json.dump({"summary": summary, "timeline": timeline}, f, indent=2)
+
+
+# ── API ──────────────────────────────────────────────────────
+def analyze_video(path: str, output: str = None, workers: int = None,
+                  segment_secs: float = VIDEO_OFFLINE_SEGMENT_SECS,
+                  warmup_secs: float = VIDEO_OFFLINE_WARMUP_SECS) -> dict:
+    """
+    Score a recorded video call. The file is cut into segments that are
+    analyzed in a process pool, then merged into a per-second timeline.
+    Detector time comes from the video's frame timestamps, so calibration
+    and blink rates match real playback regardless of processing speed.
+
+    Blink rate is cumulative per detector, so in segments after the first
+    it covers warm-up + segment rather than the whole call.
+    """
+    info     = probe(path)
+    segments = plan_segments(info["duration"], segment_secs, warmup_secs)
+    workers  = workers or min(len(segments), os.cpu_count() or 1)
+    tasks    = [(path, info["fps"], w, s, e) for w, s, e in segments]
+
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [_run_segment(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_segment, tasks))
+    wall = time.perf_counter() - t0
+
+    rows     = [r for res in results for r in res["rows"]]
+    timeline = per_second_timeline(rows)
+    decoded  = sum(res["frames"] for res in results)
+    cpu      = sum(res["cpu_secs"] for res in results)
+    worst    = max((s["level"] for s in timeline), key=LEVEL_RANK.get, default="NO FACE")
+
+    summary = {
+        "file"              : os.path.basename(path),
+        "duration_secs"     : round(info["duration"] or (rows[-1]["t"] if rows else 0), 1),
+        "segments"          : len(segments),
+        "workers"           : workers,
+        "frames_scored"     : len(rows),
+        "frames_decoded"    : decoded,
+        "peak_risk"         : max((r["risk"] for r in rows), default=0.0),
+        "worst_level"       : worst,
+        "deepfake_seconds"  : sum(1 for s in timeline if s["level"] == "DEEPFAKE DETECTED"),
+        "suspicious_seconds": sum(1 for s in timeline if s["level"] == "SUSPICIOUS"),
+        "wall_secs"         : round(wall, 2),
+        "fps"               : round(len(rows) / wall, 1) if wall else 0.0,
+        "fps_per_core"      : round(decoded / cpu, 1) if cpu else 0.0,
+    }
+    if output:
+        write_timeline(timeline, output, summary)
+    return {"summary": summary, "timeline": timeline}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SENTINEL-GUARD offline deepfake analysis")
+    parser.add_argument("video")
+    parser.add_argument("-o", "--output", help="timeline file (.json or .csv)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--segment", type=float, default=VIDEO_OFFLINE_SEGMENT_SECS)
+    parser.add_argument("--warmup", type=float, default=VIDEO_OFFLINE_WARMUP_SECS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("   SENTINEL-GUARD — Offline Deepfake Analysis")
+    print("=" * 60)
+    result = analyze_video(args.video, args.output, args.workers, args.segment, args.warmup)
+    s = result["summary"]
+    print(f"  File        : {s['file']} ({s['duration_secs']} s, {s['segments']} segments, "
+          f"{s['workers']} workers)")
+    print(f"  Verdict     : {s['worst_level']} | peak risk {s['peak_risk']}% | "
+          f"deepfake {s['deepfake_seconds']} s | suspicious {s['suspicious_seconds']} s")
+    print(f"  Throughput  : {s['fps']} fps wall | {s['fps_per_core']} fps per core "
+          f"({s['frames_decoded']} decoded incl. warm-up)")
+    if args.output:
+        print(f"[✓] Timeline written to {args.output}")
@@ -0,0 +1,256 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import json
+import time
+import threading
+from collections import deque
+from core.video.governor import FrameGovernor
+from core.video.rolling import RollingStats
+from config import VIDEO_CPU_BUDGET
+
+class LatestFrame:
+    """
+    Single-slot hand-off between pipeline stages. Writers overwrite the
+    slot; readers always get the newest item and never see a backlog.
+    """
+
+    def __init__(self):
+        self._cond   = threading.Condition()
+        self._item   = None
+        self._seq    = 0
+        self.closed  = False
+
+    def put(self, item):
+        with self._cond:
+            self._item = item
+            self._seq += 1
+            self._cond.notify_all()
+
+    def get(self, last_seq: int = 0, timeout: float = None):
+        """Wait for an item newer than last_seq → (seq, item), or (last_seq, None)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > last_seq or self.closed, timeout)
+            if self._seq <= last_seq:
+                return last_seq, None
+            return self._seq, self._item
+
+    def peek(self):
+        with self._cond:
+            return self._seq, self._item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class RateMeter:
+    """Events per second over a short sliding window."""
+
+    def __init__(self, window: int = 60):
+        self._ticks = deque(maxlen=window)
+        self._lock  = threading.Lock()
+
+    def tick(self):
+        with self._lock:
+            self._ticks.append(time.perf_counter())
+
+    @property
+    def fps(self) -> float:
+        with self._lock:
+            if len(self._ticks) < 2:
+                return 0.0
+            span = self._ticks[-1] - self._ticks[0]
+            return (len(self._ticks) - 1) / span if span > 0 else 0.0
+
+
+class PipelinedRunner:
+    """
+    Capture → analysis → display, each on its own cadence.
+
+    A capture thread keeps pulling frames so the camera buffer never
+    holds stale ones. The analysis worker always takes the freshest
+    captured frame and skips any it could not get to. Display runs on
+    the main thread (HighGUI requires it). It redraws every new
+    captured frame with the latest analysis result, so it stays smooth
+    even when analysis is slow. A FrameGovernor (budget=None to disable)
+    spaces analyses out so they stay within a share of one core; the
+    display keeps showing the last result in between.
+
+    With headless=True nothing is drawn or shown; each analysis dict goes
+    to on_result (printed as a JSON line by default). With a sink (e.g. a
+    FrameBus), annotated frames are published to it instead of a window.
+    """
+
+    WINDOW = "SENTINEL-GUARD | Deepfake Detector"
+
+    def __init__(self, detector, source=0, width=1280, height=720, mirror=True,
+                 headless=False, on_result=None, sink=None, stop_event=None,
+                 budget=VIDEO_CPU_BUDGET):
+        self.detector  = detector
+        self.source    = source
+        self.width     = width
+        self.height    = height
+        self.mirror    = mirror
+        self.headless  = headless
+        self.on_result = on_result or (self._print_result if headless else None)
+        self.sink      = sink
+        self.governor  = FrameGovernor(budget) if budget else None
+
+        self.captured = LatestFrame()     # (frame, capture_time)
+        self.analyzed = LatestFrame()     # analysis dict
+        self.stop_evt = stop_event or threading.Event()
+
+        self.capture_rate  = RateMeter()
+        self.analysis_rate = RateMeter()
+        self.display_rate  = RateMeter()
+        self.render_ms     = RollingStats(120)
+
+    # ── Stages ───────────────────────────────────────────────
+    def _capture_loop(self, cap):
+        while not self.stop_evt.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if self.mirror:
+                frame = cv2.flip(frame, 1)
+            self.captured.put((frame, time.time()))
+            self.capture_rate.tick()
+        self.stop_evt.set()
+        self.captured.close()
+
+    def _analysis_loop(self):
+        detector = self.detector
+        seq      = 0
+        while not self.stop_evt.is_set():
+            seq, item = self.captured.get(seq, timeout=0.5)
+            if item is None:
+                continue
+            frame, captured_at = item
+            if self.governor and not self.governor.offer(captured_at):
+                continue
+            t0 = time.perf_counter()
+            _, analysis = detector.analyze_frame(frame, draw=False)
+            if self.governor:
+                self.governor.record(time.perf_counter() - t0)
+            analysis["alert"] = False
+            if "DEEPFAKE" in analysis.get("risk_level", ""):
+                if time.time() - detector.last_alert_time > 10:
+                    detector._log_alert(analysis)
+                    detector.last_alert_time = time.time()
+                    analysis["alert"] = True
+
+            self.analyzed.put(analysis)
+            self.analysis_rate.tick()
+            if self.on_result:
+                self.on_result(analysis)
+
+    def _draw_rates(self, frame):
+        h, w = frame.shape[:2]
+        text = (f"cap {self.capture_rate.fps:4.1f} | ana {self.analysis_rate.fps:4.1f} | "
+                f"disp {self.display_rate.fps:4.1f} fps")
+        if self.governor:
+            text += f" | k={self.governor.stride}"
+        cv2.putText(frame, text, (w - 410, h - 12),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.45, (160, 160, 160), 1)
+
+    @staticmethod
+    def _print_result(analysis):
+        print(json.dumps(analysis, default=str), flush=True)
+
+    def stats(self) -> dict:
+        return {
+            "capture_fps" : round(self.capture_rate.fps, 1),
+            "analysis_fps": round(self.analysis_rate.fps, 1),
+            "display_fps" : round(self.display_rate.fps, 1),
+            "render_ms"   : round(self.render_ms.mean(), 2),
+            "render_ms_max": round(self.render_ms.max(), 2),
+            "governor"    : self.governor.stats() if self.governor else None,
+        }
+
+    def _display_loop(self):
+        seq = 0
+        while not self.stop_evt.is_set():
+            seq, item = self.captured.get(seq, timeout=0.1)
+            if item is not None:
+                _, analysis = self.analyzed.peek()
+                frame = item[0].copy()          # analysis may still be reading it
+                if analysis is not None:
+                    frame = self.detector.render(frame, analysis)
+                    self.render_ms.append(analysis["render_ms"])
+                self._draw_rates(frame)
+                cv2.imshow(self.WINDOW, frame)
+                self.display_rate.tick()
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+
+    def _headless_loop(self):
+        while not self.stop_evt.is_set():
+            self.stop_evt.wait(0.5)
+
+    def _sink_loop(self):
+        """Render each new captured frame straight into the sink's next slot."""
+        seq = 0
+        while not self.stop_evt.is_set():
+            seq, item = self.captured.get(seq, timeout=0.1)
+            if item is None:
+                continue
+            _, analysis = self.analyzed.peek()
+
+            def draw(frame, analysis=analysis):
+                if analysis is not None:
+                    self.detector.render(frame, analysis)
+                    self.render_ms.append(analysis["render_ms"])
+                self._draw_rates(frame)
+
+            self.sink.publish(item[0], draw)
+            self.display_rate.tick()
+
+    # ── Run ──────────────────────────────────────────────────
+    def run(self):
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            print("[!] Cannot open webcam.")
+            return
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH,  self.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+
+        threads = [
+            threading.Thread(target=self._capture_loop, args=(cap,), daemon=True),
+            threading.Thread(target=self._analysis_loop, daemon=True),
+        ]
+        for t in threads:
+            t.start()
+
+        try:
+            if self.headless:
+                self._headless_loop()
+            elif self.sink is not None:
+                self._sink_loop()
+            else:
+                self._display_loop()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop_evt.set()
+            self.captured.close()
+            self.analyzed.close()
+            for t in threads:
+                t.join(timeout=2)
+            cap.release()
+            if not self.headless and self.sink is None:
+                cv2.destroyAllWindows()
+
+        s = self.stats()
+        print(f"\n[✓] FPS — capture {s['capture_fps']} | analysis {s['analysis_fps']} | "
+              f"display {s['display_fps']}", file=sys.stderr if self.headless else sys.stdout)
+        g = s["governor"]
+        if g:
+            print(f"[✓] Governor — every {g['stride']} frame(s), {g['analysis_ms']} ms/analysis, "
+                  f"~{g['load'] * 100:.0f}% of a core (budget {g['budget'] * 100:.0f}%)",
+                  file=sys.stderr if self.headless else sys.stdout)
+        if not self.headless:
+            print(f"[✓] Render cost — mean {s['render_ms']} ms | max {s['render_ms_max']} ms")
@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import json
+import numpy as np
+from config import VIDEO_RECORD_BUFFER_FRAMES
+
+FORMAT = "sentinel-features/1"
+
+# name → dtype. Signals are stored at full precision so replaying with the
+# recorded thresholds reproduces the live decisions exactly.
+COLUMNS = {
+    "frame"      : "<i8",
+    "t"          : "<f8",       # detector clock (epoch or video seconds)
+    "elapsed"    : "<f8",       # seconds since analysis start (as scored)
+    "face"       : "u1",
+    "x"          : "<i4",       # face rect, -1 without a face
+    "y"          : "<i4",
+    "w"          : "<i4",
+    "h"          : "<i4",
+    "texture"    : "<f8",
+    "spectral"   : "<f8",
+    "lighting"   : "<f8",
+    "symmetry"   : "<f8",
+    "movement"   : "<f8",
+    "loop"       : "<f8",       # share of recent frames repeating at one period
+    "duplicate"  : "u1",        # pixel-identical to the previous frame (result reused)
+    "frozen"     : "<f8",       # seconds the picture has been frozen, 0 if not
+    "eyes_open"  : "u1",
+    "eye_count"  : "u1",
+    "blink_count": "<i4",
+    "fake_prob"  : "<f8",       # NaN without a classifier result
+    "risk"       : "<f4",
+}
+
+
+class FeatureRecorder:
+    """
+    Writes per-frame signals to a columnar recording: one raw
+    little-endian .bin file per column plus header.json. The directory
+    must be new or empty; one directory holds exactly one session.
+
+    Frames that duplicate the previous one exactly are recorded with
+    duplicate=1: the detector reuses the previous result for them and its
+    histories don't advance, which replay mirrors.
+
+    Rows are buffered in preallocated arrays and written column by column
+    every `buffer_frames` rows. The row count is derived from file sizes
+    on load, so a recording cut short by a crash is still readable up to
+    the last flush.
+    """
+
+    def __init__(self, path: str, buffer_frames: int = VIDEO_RECORD_BUFFER_FRAMES, meta: dict = None):
+        os.makedirs(path, exist_ok=True)
+        if os.listdir(path):
+            raise FileExistsError(f"Recording directory is not empty: {path} "
+                                  "(choose a new one per session).")
+        self.path    = path
+        self.meta    = dict(meta or {})
+        self.buffers = {name: np.empty(buffer_frames, dtype=dt) for name, dt in COLUMNS.items()}
+        self.files   = {name: open(os.path.join(path, f"{name}.bin"), "xb") for name in COLUMNS}
+        self.n       = 0
+        self.rows    = 0
+        self._write_header()
+
+    def _write_header(self):
+        header = {
+            "format" : FORMAT,
+            "columns": [{"name": n, "dtype": dt} for n, dt in COLUMNS.items()],
+            "meta"   : self.meta,
+        }
+        with open(os.path.join(self.path, "header.json"), "w") as f:
+            json.dump(header, f, indent=2)
+
+    def describe(self, **meta):
+        """Attach context (thresholds, window sizes, source) to the header."""
+        self.meta.update(meta)
+        self._write_header()
+
+    def append(self, frame_idx: int, t: float, elapsed: float, analysis: dict,
+               eyes_open: bool, eye_count: int, blink_count: int):
+        i    = self.n
+        b    = self.buffers
+        rect = analysis["face_rect"] or (-1, -1, -1, -1)
+        prob = analysis.get("fake_probability")
+        b["frame"][i]       = frame_idx
+        b["t"][i]           = t
+        b["elapsed"][i]     = elapsed
+        b["face"][i]        = analysis["face_detected"]
+        b["x"][i], b["y"][i], b["w"][i], b["h"][i] = rect
+        b["texture"][i]     = analysis["texture_score"]
+        b["spectral"][i]    = analysis["spectral_score"]
+        b["lighting"][i]    = analysis["lighting_asymmetry"]
+        b["symmetry"][i]    = analysis["face_symmetry"]
+        b["movement"][i]    = analysis["movement_score"]
+        b["loop"][i]        = analysis["loop_score"]
+        b["duplicate"][i]   = analysis["duplicate"]
+        b["frozen"][i]      = analysis["frozen_secs"]
+        b["eyes_open"][i]   = eyes_open
+        b["eye_count"][i]   = min(eye_count, 255)
+        b["blink_count"][i] = blink_count
+        b["fake_prob"][i]   = np.nan if prob is None else prob
+        b["risk"][i]        = analysis["risk_score"]
+        self.n += 1
+        if self.n == len(b["frame"]):
+            self.flush()
+
+    def flush(self):
+        if self.n:
+            for name, buf in self.buffers.items():
+                self.files[name].write(buf[:self.n].tobytes())
+                self.files[name].flush()
+            self.rows += self.n
+            self.n = 0
+
+    def close(self):
+        self.flush()
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_recording(path: str) -> dict:
+    """Recording → {"meta": ..., "rows": N, "columns": {name: read-only array}}."""
+    with open(os.path.join(path, "header.json")) as f:
+        header = json.load(f)
+    if header.get("format") != FORMAT:
+        raise ValueError(f"Not a feature recording: {path}")
+
+    sizes = {}
+    for col in header["columns"]:
+        fp = os.path.join(path, f"{col['name']}.bin")
+        sizes[col["name"]] = os.path.getsize(fp) // np.dtype(col["dtype"]).itemsize
+    rows = min(sizes.values()) if sizes else 0
+
+    columns = {}
+    for col in header["columns"]:
+        fp = os.path.join(path, f"{col['name']}.bin")
+        columns[col["name"]] = (np.memmap(fp, dtype=col["dtype"], mode="r", shape=(rows,))
+                                if rows else np.empty(0, dtype=col["dtype"]))
+    return {"meta": header.get("meta", {}), "rows": rows, "columns": columns}
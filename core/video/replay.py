@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import time
+import argparse
+import numpy as np
+from core.video.recorder import load_recording
+from config import VIDEO_THRESHOLDS
+
+LEVELS = ["NO FACE", "ANALYZING...", "REAL", "SUSPICIOUS", "DEEPFAKE DETECTED"]
+DEFAULT_WINDOWS = {"texture": 30, "lighting": 30, "symmetry": 30, "movement": 60, "spectral": 30}
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the last `window` values at every position (shorter at the start)."""
+    c   = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    idx = np.arange(1, len(values) + 1)
+    lo  = np.maximum(0, idx - window)
+    return (c[idx] - c[lo]) / (idx - lo)
+
+
+def rescore(rec: dict, thresholds: dict = None) -> dict:
+    """
+    Re-run DeepfakeDetector's risk rules over a recording, all frames at
+    once. Histories only advance on fresh frames with a face, and a
+    duplicate frame reuses the score of the frame it repeats, as live.
+    Returns per-frame risk (raw, uncapped) and level index into LEVELS.
+    """
+    T    = {**VIDEO_THRESHOLDS, **rec["meta"].get("thresholds", {}), **(thresholds or {})}
+    win  = {**DEFAULT_WINDOWS, **rec["meta"].get("windows", {})}
+    cols = rec["columns"]
+    n    = rec["rows"]
+
+    face    = cols["face"][:n].astype(bool)
+    elapsed = np.asarray(cols["elapsed"][:n])
+    risk    = np.zeros(n)
+    level   = np.zeros(n, dtype=np.int8)            # NO FACE
+    if not face.any():
+        return {"risk": risk, "level": level, "thresholds": T}
+
+    # Duplicate frames reuse the previous result live: score the fresh face
+    # frames, then give each duplicate the score of the frame it repeats
+    dup     = (cols["duplicate"][:n].astype(bool) if "duplicate" in cols
+               else np.zeros(n, dtype=bool))
+    fresh   = face & ~dup
+    src     = np.cumsum(fresh)[face] - 1            # face row → its fresh row
+    el      = elapsed[fresh]
+    means   = {k: rolling_mean(np.asarray(cols[k][:n])[fresh], win[k])
+               for k in ("texture", "lighting", "symmetry", "movement", "spectral") if k in cols}
+    blink   = np.asarray(cols["blink_count"][:n])[fresh] / el * 60
+    prob    = np.asarray(cols["fake_prob"][:n])[fresh]
+    calib   = el > T["calibration_secs"]
+
+    r  = np.where(calib & (blink < T["blink_low"]), T["blink_low_points"], 0.0)
+    r += np.where(calib & (blink >= T["blink_low"]) & (blink > T["blink_high"]),
+                  T["blink_high_points"], 0.0)
+    r += np.where(means["texture"]  > T["texture"],  T["texture_points"],  0.0)
+    r += np.where(means["lighting"] > T["lighting"], T["lighting_points"], 0.0)
+    r += np.where(means["symmetry"] > T["symmetry"], T["symmetry_points"], 0.0)
+    r += np.where(calib & (means["movement"] < T["stillness"]), T["stillness_points"], 0.0)
+    if "spectral" in means:                         # recordings made before the signal existed
+        r += np.where(means["spectral"] > T["spectral"], T["spectral_points"], 0.0)
+    if "loop" in cols:
+        r += np.where(np.asarray(cols["loop"][:n])[fresh] >= T["loop"], T["loop_points"], 0.0)
+    with np.errstate(invalid="ignore"):
+        r += np.where(prob >= T["classifier"], T["classifier_points"] * np.nan_to_num(prob), 0.0)
+
+    r  = r[src]
+    el = elapsed[face]
+    if "frozen" in cols:
+        over = np.asarray(cols["frozen"][:n])[face] - T["frozen_secs"]
+        r += T["frozen_points"] * np.clip(over / T["frozen_ramp_secs"], 0.0, 1.0)
+
+    lv = np.where(r >= T["deepfake_level"], 4,
+         np.where(r >= T["suspicious_level"], 3,
+         np.where(el < T["calibration_secs"], 1, 2)))
+    risk[face]  = r
+    level[face] = lv
+    return {"risk": risk, "level": level, "thresholds": T}
+
+
+def level_counts(level: np.ndarray) -> dict:
+    counts = np.bincount(level, minlength=len(LEVELS))
+    return {name: int(c) for name, c in zip(LEVELS, counts)}
+
+
+def parse_assignments(items) -> dict:
+    out = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        if key not in VIDEO_THRESHOLDS:
+            raise SystemExit(f"[!] Unknown threshold '{key}' — one of: {', '.join(VIDEO_THRESHOLDS)}")
+        out[key] = float(value)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score a feature recording under new thresholds")
+    parser.add_argument("recording", help="directory written by FeatureRecorder")
+    parser.add_argument("--set", action="append", metavar="KEY=VALUE",
+                        help="override a VIDEO_THRESHOLDS entry (repeatable)")
+    parser.add_argument("--sweep", metavar="KEY=START:STOP:STEP",
+                        help="flagged-frame rate across a range of one threshold")
+    args = parser.parse_args()
+
+    rec = load_recording(args.recording)
+    print("=" * 60)
+    print("   SENTINEL-GUARD — Feature Replay")
+    print("=" * 60)
+    face = int(np.asarray(rec["columns"]["face"]).sum())
+    print(f"  Recording : {rec['rows']} frames, {face} with a face")
+
+    base = rescore(rec)
+    recorded = np.asarray(rec["columns"]["risk"], dtype=np.float64)
+    mismatch = np.abs(np.minimum(100, np.round(base["risk"], 1)) - recorded) > 0.05
+    print(f"  Sanity    : recorded thresholds reproduce live risk on "
+          f"{rec['rows'] - int(mismatch.sum())}/{rec['rows']} frames")
+
+    overrides = parse_assignments(args.set)
+    t0    = time.perf_counter()
+    new   = rescore(rec, overrides)
+    ms    = (time.perf_counter() - t0) * 1000
+    old_c = level_counts(base["level"])
+    new_c = level_counts(new["level"])
+    print(f"\n  {'level':<18}{'recorded':>10}{'replayed':>10}")
+    for name in LEVELS:
+        print(f"  {name:<18}{old_c[name]:>10}{new_c[name]:>10}")
+    changed = int((base["level"] != new["level"]).sum())
+    print(f"\n  Overrides : {overrides or 'none'} | {changed} frames change level | "
+          f"re-scored in {ms:.1f} ms")
+
+    if args.sweep:
+        key, _, rng = args.sweep.partition("=")
+        start, stop, step = (float(v) for v in rng.split(":"))
+        parse_assignments([f"{key}={start}"])
+        print(f"\n  Sweep {key}: share of face frames flagged")
+        for value in np.arange(start, stop + step / 2, step):
+            lv = rescore(rec, {**overrides, key: float(value)})["level"]
+            sus = np.mean(lv[lv > 0] >= 3) * 100 if face else 0.0
+            fake = np.mean(lv[lv > 0] == 4) * 100 if face else 0.0
+            print(f"  {key} = {value:>8.3f} | suspicious+ {sus:5.1f}% | deepfake {fake:5.1f}%")
@@ -0,0 +1,90 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import threading
+from config import (VIDEO_LANDMARK_MODEL, VIDEO_RES10_PROTO, VIDEO_RES10_MODEL,
+                    VIDEO_YUNET_MODEL, VIDEO_DNN_CONFIDENCE)
+
+class SharedResources:
+    """
+    Immutable models shared by any number of DeepfakeDetector instances.
+
+    A CascadeClassifier must not be used from two threads at once, so each
+    thread that touches one gets its own copy, loaded lazily on first use
+    and reused for every stream that thread analyzes. The same holds for
+    the optional LBF landmark model and DNN face detectors. Per-stream
+    state (histories, tracks, blink counters) stays on the detector.
+    """
+
+    def __init__(self, cascade_dir: str = None, landmark_model: str = VIDEO_LANDMARK_MODEL,
+                 res10_proto: str = VIDEO_RES10_PROTO, res10_model: str = VIDEO_RES10_MODEL,
+                 yunet_model: str = VIDEO_YUNET_MODEL):
+        base                = cascade_dir or cv2.data.haarcascades
+        self.face_xml       = os.path.join(base, "haarcascade_frontalface_default.xml")
+        self.eye_xml        = os.path.join(base, "haarcascade_eye.xml")
+        self.landmark_model = landmark_model
+        self.res10_proto    = res10_proto
+        self.res10_model    = res10_model
+        self.yunet_model    = yunet_model
+        self._local         = threading.local()
+        # Fail fast in the creating thread rather than inside a worker
+        if self.face_cascade.empty() or self.eye_cascade.empty():
+            raise RuntimeError("Could not load cascade classifiers.")
+
+    def _get(self, name: str, load):
+        model = getattr(self._local, name, None)
+        if model is None:
+            model = load()
+            setattr(self._local, name, model)
+        return model
+
+    @staticmethod
+    def _require(path: str, what: str, setting: str):
+        if not path or not os.path.exists(path):
+            raise RuntimeError(f"{what} not found: {path} (set {setting}).")
+
+    @property
+    def face_cascade(self):
+        return self._get("face", lambda: cv2.CascadeClassifier(self.face_xml))
+
+    @property
+    def eye_cascade(self):
+        return self._get("eye", lambda: cv2.CascadeClassifier(self.eye_xml))
+
+    @property
+    def facemark(self):
+        """cv2.face LBF facemark (68 points); only needed by the "lbf" blink engine."""
+        return self._get("facemark", self._load_facemark)
+
+    def _load_facemark(self):
+        if not hasattr(cv2, "face"):
+            raise RuntimeError("cv2.face not available — pip install opencv-contrib-python "
+                               "to enable landmark blink detection.")
+        self._require(self.landmark_model, "LBF landmark model", "VIDEO_LANDMARK_MODEL")
+        model = cv2.face.createFacemarkLBF()
+        model.loadModel(self.landmark_model)
+        return model
+
+    @property
+    def res10_net(self):
+        """res10 300x300 SSD face detector (Caffe) for the "res10" face backend."""
+        return self._get("res10", self._load_res10)
+
+    def _load_res10(self):
+        self._require(self.res10_proto, "res10 deploy.prototxt", "VIDEO_RES10_PROTO")
+        self._require(self.res10_model, "res10 caffemodel", "VIDEO_RES10_MODEL")
+        net = cv2.dnn.readNetFromCaffe(self.res10_proto, self.res10_model)
+        net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        return net
+
+    @property
+    def yunet(self):
+        """cv2.FaceDetectorYN for the "yunet" face backend (input size set per call)."""
+        return self._get("yunet", self._load_yunet)
+
+    def _load_yunet(self):
+        self._require(self.yunet_model, "YuNet model", "VIDEO_YUNET_MODEL")
+        return cv2.FaceDetectorYN.create(self.yunet_model, "", (320, 320), VIDEO_DNN_CONFIDENCE)
@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+from collections import deque
+
+class RollingStats:
+    """
+    Fixed-size rolling window with O(1) statistics.
+
+    Values live in a preallocated NumPy ring. A running sum and sum of
+    squares give mean / variance without touching the window, and two
+    monotonic deques give min / max in amortized constant time. Sums are
+    re-derived from the ring every so often so float error cannot build up
+    over a long session.
+    """
+
+    RESYNC_EVERY = 64          # full windows between exact re-sums
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._buf     = np.zeros(self.capacity, dtype=np.float64)
+        self.clear()
+
+    def clear(self):
+        self._count  = 0           # values currently in the window
+        self._head   = 0           # next write slot
+        self._pushed = 0           # total values ever appended
+        self._sum    = 0.0
+        self._sumsq  = 0.0
+        self._minq   = deque()     # (push index, value), values increasing
+        self._maxq   = deque()     # (push index, value), values decreasing
+
+    def append(self, value):
+        x = float(value)
+        if self._count == self.capacity:
+            old = self._buf[self._head]
+            self._sum   -= old
+            self._sumsq -= old * old
+        else:
+            self._count += 1
+        self._buf[self._head] = x
+        self._sum   += x
+        self._sumsq += x * x
+
+        i = self._pushed
+        while self._minq and self._minq[-1][1] >= x:
+            self._minq.pop()
+        self._minq.append((i, x))
+        while self._maxq and self._maxq[-1][1] <= x:
+            self._maxq.pop()
+        self._maxq.append((i, x))
+        expired = i - self.capacity
+        if self._minq[0][0] <= expired:
+            self._minq.popleft()
+        if self._maxq[0][0] <= expired:
+            self._maxq.popleft()
+
+        self._head    = (self._head + 1) % self.capacity
+        self._pushed += 1
+        if self._pushed % (self.capacity * self.RESYNC_EVERY) == 0:
+            window      = self._buf[:self._count]
+            self._sum   = float(window.sum())
+            self._sumsq = float(np.dot(window, window))
+
+    def __len__(self):
+        return self._count
+
+    # ── Statistics ───────────────────────────────────────────
+    def mean(self, default: float = 0.0) -> float:
+        return self._sum / self._count if self._count else default
+
+    def var(self, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        m = self._sum / self._count
+        return max(0.0, self._sumsq / self._count - m * m)
+
+    def std(self, default: float = 0.0) -> float:
+        return float(np.sqrt(self.var(default)))
+
+    def min(self, default: float = 0.0) -> float:
+        return self._minq[0][1] if self._count else default
+
+    def max(self, default: float = 0.0) -> float:
+        return self._maxq[0][1] if self._count else default
+
+    def last(self, default: float = 0.0) -> float:
+        return float(self._buf[self._head - 1]) if self._count else default
+
+    def values(self) -> np.ndarray:
+        """Window contents, oldest first (a copy)."""
+        if self._count < self.capacity:
+            return self._buf[:self._count].copy()
+        return np.roll(self._buf, -self._head)
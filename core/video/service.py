@@ -0,0 +1,236 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import time
+import queue
+import argparse
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from config import VIDEO_BUS_SLOTS, VIDEO_RESULT_QUEUE
+
+# Header: [latest_slot, latest_seq, height, width, slots, gen_0 … gen_{n-1}]
+_HEAD = 5
+
+class FrameBus:
+    """
+    Ring of BGR frame slots in one shared-memory block, one writer.
+
+    Each slot has a generation counter used as a seqlock: the writer makes
+    it odd while filling the slot and even when done, then points
+    latest_slot at it. Readers get a numpy view straight onto the shared
+    buffer (no copy, no pickling) and call still_valid() after using it to
+    detect the rare case where the writer lapped the ring meanwhile.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm    = shm
+        self.owner  = owner
+        n           = int(np.ndarray((_HEAD,), np.int64, shm.buf)[4])
+        self.header = np.ndarray((_HEAD + n,), np.int64, shm.buf)
+        h, w        = int(self.header[2]), int(self.header[3])
+        self.shape  = (h, w, 3)
+        self.slots  = np.ndarray((n, h, w, 3), np.uint8, shm.buf, offset=(_HEAD + n) * 8)
+
+    @classmethod
+    def create(cls, width: int, height: int, slots: int = VIDEO_BUS_SLOTS) -> "FrameBus":
+        size = (_HEAD + slots) * 8 + slots * height * width * 3
+        shm  = shared_memory.SharedMemory(create=True, size=size)
+        head = np.ndarray((_HEAD + slots,), np.int64, shm.buf)
+        head[:] = 0
+        head[0], head[2], head[3], head[4] = slots - 1, height, width, slots
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameBus":
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # ── Writer ───────────────────────────────────────────────
+    def publish(self, frame, draw=None):
+        """
+        Copy frame into the next slot and annotate it there with draw(view).
+        At the bus size this is the only copy; other sizes are drawn on a
+        private copy first (overlay coordinates are in frame pixels) and
+        resized into the slot.
+        """
+        head = self.header
+        slot = (int(head[0]) + 1) % len(self.slots)
+        view = self.slots[slot]
+        head[_HEAD + slot] += 1                 # odd: being written
+        if frame.shape == self.shape:
+            np.copyto(view, frame)
+            if draw:
+                draw(view)
+        else:
+            if draw:
+                frame = frame.copy()
+                draw(frame)
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=view,
+                       interpolation=cv2.INTER_AREA)
+        head[_HEAD + slot] += 1                 # even: complete
+        head[0]  = slot
+        head[1] += 1
+
+    # ── Reader ───────────────────────────────────────────────
+    def read_latest(self):
+        """→ (seq, view, token), or (0, None, None) before the first frame."""
+        head = self.header
+        seq  = int(head[1])
+        if seq == 0:
+            return 0, None, None
+        slot = int(head[0])
+        gen  = int(head[_HEAD + slot])
+        if gen & 1:
+            return 0, None, None
+        return seq, self.slots[slot], (slot, gen)
+
+    def still_valid(self, token) -> bool:
+        slot, gen = token
+        return int(self.header[_HEAD + slot]) == gen
+
+    def close(self):
+        # Views must be dropped before the mapping can be closed.
+        self.header = self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ── Service process ──────────────────────────────────────────
+RESULT_KEYS = ("risk_score", "risk_level", "flags", "face_detected", "fake_probability",
+               "blink_rate", "alert")
+
+def _service_main(bus_name, results, stop_event, source, width, height, options):
+    from core.video.deepfake import DeepfakeDetector
+    from core.video.pipeline import PipelinedRunner
+
+    bus      = FrameBus.attach(bus_name)
+    detector = DeepfakeDetector(**options)
+
+    def on_result(analysis):
+        msg = {k: analysis.get(k) for k in RESULT_KEYS}
+        msg["t"] = time.time()
+        try:
+            results.put_nowait(msg)
+        except queue.Full:
+            pass                                # UI is behind; it only needs the latest
+
+    runner = PipelinedRunner(detector, source, width, height, mirror=isinstance(source, int),
+                             on_result=on_result, sink=bus, stop_event=stop_event)
+    try:
+        runner.run()
+    finally:
+        stop_event.set()
+        bus.close()
+
+
+class VideoService:
+    """
+    Runs the deepfake pipeline in a worker process for the dashboard.
+
+    Annotated frames arrive through a FrameBus in shared memory and small
+    analysis dicts through a bounded queue, so the UI process never
+    unpickles frames. The UI keeps one VideoService across reruns and
+    calls latest_frame() / poll_results() on each refresh.
+    """
+
+    def __init__(self, source=0, width: int = 1280, height: int = 720,
+                 slots: int = VIDEO_BUS_SLOTS, **detector_options):
+        self.source   = source
+        self.width    = width
+        self.height   = height
+        self.slots    = slots
+        self.options  = detector_options
+        self.bus      = None
+        self.process  = None
+        self.results  = None
+        self.stop_evt = None
+        self.last     = None                    # newest result seen by poll_results()
+
+    def start(self):
+        if self.running:
+            return
+        self.bus      = FrameBus.create(self.width, self.height, self.slots)
+        self.results  = mp.Queue(maxsize=VIDEO_RESULT_QUEUE)
+        self.stop_evt = mp.Event()
+        self.process  = mp.Process(target=_service_main, daemon=True, name="sentinel-video",
+                                   args=(self.bus.name, self.results, self.stop_evt, self.source,
+                                         self.width, self.height, self.options))
+        self.process.start()
+        print(f"[✓] Video service started (pid {self.process.pid}, bus {self.bus.name})")
+
+    @property
+    def running(self) -> bool:
+        return self.process is not None and self.process.is_alive() and not self.stop_evt.is_set()
+
+    def latest_frame(self):
+        """→ (seq, BGR view into shared memory, token) — see FrameBus.read_latest."""
+        if self.bus is None:
+            return 0, None, None
+        return self.bus.read_latest()
+
+    def frame_valid(self, token) -> bool:
+        return self.bus is not None and token is not None and self.bus.still_valid(token)
+
+    def poll_results(self) -> list:
+        """Drain every result queued since the last call (non-blocking)."""
+        out = []
+        if self.results is None:
+            return out
+        while True:
+            try:
+                out.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        if out:
+            self.last = out[-1]
+        return out
+
+    def stop(self):
+        if self.process is None:
+            return
+        self.stop_evt.set()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.results.close()
+        self.bus.close()
+        self.process = self.bus = self.results = None
+        print("[✓] Video service stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SENTINEL-GUARD video service (frame bus demo)")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    print("=" * 60)
+    print("   SENTINEL-GUARD — Video Service")
+    print("=" * 60)
+    service = VideoService(source)
+    service.start()
+    frames, results, last_seq = 0, 0, 0
+    t0 = time.perf_counter()
+    try:
+        while time.perf_counter() - t0 < args.duration and service.process.is_alive():
+            seq, view, token = service.latest_frame()
+            if seq != last_seq and service.frame_valid(token):
+                frames  += 1
+                last_seq = seq
+            results += len(service.poll_results())
+            time.sleep(0.05)
+    finally:
+        last = service.last
+        service.stop()
+    print(f"  Frames read : {frames} | results {results}")
+    if last:
+        print(f"  Last result : {last['risk_level']} ({last['risk_score']}%) {last['flags']}")
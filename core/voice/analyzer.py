@@ -11,25 +11,49 @@ import sounddevice as sd
 from datetime import datetime
 from faster_whisper import WhisperModel
 from core.nlp.scam_detector import ScamDetector
-from config import LOG_PATH
+from core.voice.language import LanguagePinner
+from core.voice.audio_io import iter_audio_windows, format_offset
+from core.voice.multichannel import ChannelTranscriber
+from core.voice.resample import StreamingResampler, device_input_rate
+from core.timing import StageTimer
+from config import (LOG_PATH, AUDIO_FILE_WINDOW_SECS, STAGE_TIMER_WINDOW,
+                    CALL_CHANNELS, CALLER_CHANNEL, MIC_CAPTURE_RATE)
 
 class VoiceAnalyzer:
-    def __init__(self):
+    def __init__(self, channels=CALL_CHANNELS, caller_channel=CALLER_CHANNEL):
+        """
+        channels: 1 for a single mixed feed, 2+ for call recordings with
+                  each party on its own channel.
+        caller_channel: the channel scored by the NLP scam detector.
+        """
         print("[*] Loading Whisper model... (first time takes 1-2 mins)")
-        self.model = WhisperModel("base", device="cpu", compute_type="int8")
+        self.model = WhisperModel("base", device="cpu", compute_type="int8",
+                                  num_workers=max(1, channels))
         self.detector = ScamDetector()
+        self.language_pin = LanguagePinner(self.detector)
+        self.channels = channels
+        self.caller_channel = caller_channel
+        self.channel_transcriber = (ChannelTranscriber(self.model, channels, self.detector)
+                                    if channels > 1 else None)
         self.is_recording = False
         self.sample_rate = 16000
         self.chunk_duration = 5      # analyze every 5 seconds
         self.results = []
+        self.timer = StageTimer(STAGE_TIMER_WINDOW)
+        self.resampler = None
         print("[✓] Voice Analyzer ready.")
 
     def _record_chunk(self) -> np.ndarray:
-        """Record a chunk of audio from microphone."""
-        frames = int(self.sample_rate * self.chunk_duration)
-        audio = sd.rec(frames, samplerate=self.sample_rate, channels=1, dtype='float32')
+        """Record a chunk at the mic's native rate, resampled to 16 kHz."""
+        if self.resampler is None:
+            rate = MIC_CAPTURE_RATE or device_input_rate()
+            self.resampler = StreamingResampler(rate, self.sample_rate)
+        rate = self.resampler.in_rate
+        frames = int(rate * self.chunk_duration)
+        audio = sd.rec(frames, samplerate=rate, channels=self.channels, dtype='float32')
         sd.wait()
-        return audio.flatten()
+        audio = audio[:, 0] if self.channels == 1 else audio
+        return self.resampler.process(audio)
 
     def _save_temp_wav(self, audio: np.ndarray) -> str:
         """Save numpy audio array to a temp WAV file for Whisper."""
@@ -43,20 +67,63 @@ class VoiceAnalyzer:
 
     def analyze_chunk(self, audio: np.ndarray) -> dict:
         """Transcribe audio and run scam detection."""
-        wav_path = self._save_temp_wav(audio)
+        if audio.ndim == 2:
+            return self.analyze_call_chunk(audio)
 
-        # Transcribe with Whisper
-        segments, _ = self.model.transcribe(wav_path, beam_size=5)
-        transcript = " ".join([seg.text for seg in segments]).strip()
+        audio_secs = len(audio) / self.sample_rate
+        with self.timer.stage("wav"):
+            wav_path = self._save_temp_wav(audio)
 
-        os.unlink(wav_path)  # clean up temp file
+        # Transcribe with Whisper (language pinned once the call is known)
+        try:
+            with self.timer.stage("transcribe"):
+                segments, info = self.model.transcribe(
+                    wav_path, beam_size=5, **self.language_pin.transcribe_kwargs()
+                )
+                transcript = " ".join([seg.text for seg in segments]).strip()
+        finally:
+            os.unlink(wav_path)  # clean up temp file, even if Whisper fails
+        self.language_pin.update(info, transcript)
 
         if not transcript:
-            return {"transcript": "", "risk_level": "SAFE", "alert": False}
+            return {"transcript": "", "risk_level": "SAFE", "alert": False,
+                    "latency": self.timer.end_chunk(audio_secs)}
 
         # Run through NLP scam detector
-        result = self.detector.analyze_text(transcript)
+        with self.timer.stage("nlp"):
+            result = self.detector.analyze_text(transcript)
+        result["transcript"] = transcript
+        result["pinned_language"] = self.language_pin.language
+        result["latency"] = self.timer.end_chunk(audio_secs)
+        self.results.append(result)
+
+        return result
+
+    def analyze_call_chunk(self, audio: np.ndarray) -> dict:
+        """
+        Multi-channel chunk: every party is transcribed concurrently, but
+        only the caller's channel is run through the scam detector.
+        """
+        audio_secs  = len(audio) / self.sample_rate
+        transcriber = self.channel_transcriber or ChannelTranscriber(
+            self.model, audio.shape[1], self.detector)
+        self.channel_transcriber = transcriber
+
+        with self.timer.stage("transcribe"):
+            texts = transcriber.transcribe(audio)
+        transcript = texts[self.caller_channel]
+
+        if not transcript:
+            return {"transcript": "", "risk_level": "SAFE", "alert": False,
+                    "channel_transcripts": texts,
+                    "latency": self.timer.end_chunk(audio_secs)}
+
+        with self.timer.stage("nlp"):
+            result = self.detector.analyze_text(transcript)
         result["transcript"] = transcript
+        result["channel_transcripts"] = texts
+        result["pinned_language"] = transcriber.pinners[self.caller_channel].language
+        result["latency"] = self.timer.end_chunk(audio_secs)
         self.results.append(result)
 
         return result
@@ -70,12 +137,15 @@ class VoiceAnalyzer:
         try:
             while self.is_recording:
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] Listening...")
-                audio = self._record_chunk()
+                with self.timer.stage("record"):
+                    audio = self._record_chunk()
                 result = self.analyze_chunk(audio)
 
                 if result["transcript"]:
                     print(f"  Transcript  : {result['transcript']}")
                     print(f"  Risk Level  : {result['risk_level']}")
+                    print(f"  Latency     : {result['latency']['total_ms']} ms "
+                          f"(RTF {result['latency'].get('rtf', 0)})")
                     if result["alert"]:
                         print("  ⚠️  🚨 SCAM DETECTED — TRIGGERING ALERT 🚨 ⚠️")
                     print()
@@ -85,17 +155,78 @@ class VoiceAnalyzer:
             print("\n[✓] Monitoring stopped.")
             print(self.detector.get_risk_summary(self.results))
 
+    def get_latency_stats(self) -> dict:
+        """Rolling p50/p95/p99 per pipeline stage and real-time factor."""
+        return self.timer.summary()
+
+    def stream_audio_file(self, file_path: str, window_secs: float = AUDIO_FILE_WINDOW_SECS):
+        """
+        Analyze a recording window by window with constant memory.
+        Yields one timestamped result per window with speech, as soon as
+        that window is transcribed. Raises RuntimeError if no audio could
+        be decoded at all, so an unreadable file is never scored as safe.
+        """
+        language_pin = LanguagePinner(self.detector)
+        transcriber  = (ChannelTranscriber(self.model, self.channels, self.detector)
+                        if self.channels > 1 else None)
+
+        decoded = 0
+        for start, audio in iter_audio_windows(file_path, self.sample_rate, window_secs,
+                                               channels=self.channels):
+            decoded += 1
+            texts    = None
+            if transcriber:
+                texts      = transcriber.transcribe(audio)
+                transcript = texts[self.caller_channel]
+            else:
+                segments, info = self.model.transcribe(
+                    audio, beam_size=5, **language_pin.transcribe_kwargs()
+                )
+                transcript = " ".join([seg.text for seg in segments]).strip()
+                language_pin.update(info, transcript)
+
+            if not transcript:
+                continue
+
+            end    = start + len(audio) / self.sample_rate
+            result = self.detector.analyze_text(transcript)
+            result["transcript"]   = transcript
+            result["start"]        = round(start, 2)
+            result["end"]          = round(end, 2)
+            result["offset"]       = format_offset(start)
+            if texts:
+                result["channel_transcripts"] = texts
+
+            if result["alert"]:
+                print(f"  [🚨 {result['offset']}] {result['risk_level']}: {transcript[:80]}")
+
+            yield result
+
+        if not decoded:
+            raise RuntimeError(f"No audio decoded from {file_path} — refusing to score it.")
+
     def analyze_audio_file(self, file_path: str) -> dict:
         """Analyze a pre-recorded audio file (useful for demo)."""
         print(f"[*] Analyzing file: {file_path}")
-        segments, _ = self.model.transcribe(file_path, beam_size=5)
-        transcript = " ".join([seg.text for seg in segments]).strip()
+        windows = list(self.stream_audio_file(file_path))
 
-        if not transcript:
+        if not windows:
             return {"transcript": "", "risk_level": "SAFE", "alert": False}
 
-        result = self.detector.analyze_text(transcript)
-        result["transcript"] = transcript
+        order  = {"SAFE": 0, "SUSPICIOUS": 1, "DANGER": 2}
+        worst  = max(windows, key=lambda r: (order[r["risk_level"]], r["total_score"]))
+        result = dict(worst)
+        result["transcript"]     = " ".join(r["transcript"] for r in windows)
+        result["found_keywords"] = list(dict.fromkeys(
+            kw for r in windows for kw in r["found_keywords"]))
+        result["found_patterns"] = list(dict.fromkeys(
+            p for r in windows for p in r["found_patterns"]))
+        result["alert"]          = any(r["alert"] for r in windows)
+        result["alerts"]         = [
+            {"offset": r["offset"], "start": r["start"], "end": r["end"],
+             "risk_level": r["risk_level"], "found_keywords": r["found_keywords"]}
+            for r in windows if r["risk_level"] != "SAFE"
+        ]
         return result
 
 
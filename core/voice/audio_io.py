@@ -0,0 +1,209 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import struct
+import threading
+import subprocess
+import numpy as np
+from core.voice.resample import StreamingResampler
+
+WAVE_FORMAT_PCM        = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# ── WAV header parsing ───────────────────────────────────────
+def _wav_layout(path: str):
+    """
+    Locate the sample data inside a RIFF/WAVE file.
+    Returns dict(offset, frames, channels, rate, dtype) or None if the
+    file is not a WAV we can memory-map directly.
+    """
+    try:
+        with open(path, "rb") as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+                return None
+
+            fmt = None
+            while True:
+                hdr = f.read(8)
+                if len(hdr) < 8:
+                    return None
+                chunk_id   = hdr[:4]
+                chunk_size = struct.unpack("<I", hdr[4:])[0]
+
+                if chunk_id == b"fmt ":
+                    body = f.read(chunk_size)
+                    tag, channels, rate, _, _, bits = struct.unpack("<HHIIHH", body[:16])
+                    if tag == WAVE_FORMAT_EXTENSIBLE and len(body) >= 26:
+                        tag = struct.unpack("<H", body[24:26])[0]
+                    fmt = (tag, channels, rate, bits)
+                    f.seek(chunk_size & 1, 1)
+
+                elif chunk_id == b"data":
+                    if fmt is None:
+                        return None
+                    tag, channels, rate, bits = fmt
+                    if tag == WAVE_FORMAT_PCM and bits == 16:
+                        dtype = np.dtype("<i2")
+                    elif tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+                        dtype = np.dtype("<f4")
+                    else:
+                        return None
+                    offset = f.tell()
+                    # Streamed WAVs often leave the size as 0 / 0xFFFFFFFF
+                    available  = os.path.getsize(path) - offset
+                    data_bytes = chunk_size if 0 < chunk_size <= available else available
+                    frames     = data_bytes // (dtype.itemsize * channels)
+                    return {
+                        "offset"  : offset,
+                        "frames"  : frames,
+                        "channels": channels,
+                        "rate"    : rate,
+                        "dtype"   : dtype,
+                    }
+                else:
+                    f.seek(chunk_size + (chunk_size & 1), 1)
+    except (OSError, struct.error):
+        return None
+
+
+def _to_float32(block: np.ndarray, downmix: bool = True) -> np.ndarray:
+    """
+    (frames, channels) block → float32 in [-1, 1]. Downmixed to mono by
+    default; otherwise the (frames, channels) layout is kept.
+    """
+    if block.dtype == np.int16:
+        scale = 1.0 / 32768.0
+    else:
+        scale = 1.0
+    if not downmix:
+        out = block.astype(np.float32)
+    elif block.shape[1] == 1:
+        out = block[:, 0].astype(np.float32)
+    else:
+        out = block.mean(axis=1, dtype=np.float32)
+    if scale != 1.0:
+        out *= scale
+    return out
+
+
+def split_channels(audio: np.ndarray) -> list:
+    """
+    (frames, channels) array → one strided 1-D view per channel.
+    No samples are copied; each view steps over the interleaved buffer.
+    """
+    if audio.ndim == 1:
+        return [audio]
+    return [audio[:, c] for c in range(audio.shape[1])]
+
+
+# ── Window readers ───────────────────────────────────────────
+def iter_wav_windows(path: str, layout: dict, window_secs: float,
+                     downmix: bool = True, sample_rate: int = None):
+    """
+    Memory-mapped WAV reader. Only the current window is ever copied.
+    If sample_rate differs from the file's rate, windows are passed
+    through a streaming resampler.
+    """
+    rate      = layout["rate"]
+    window    = int(rate * window_secs)
+    resampler = (StreamingResampler(rate, sample_rate)
+                 if sample_rate and sample_rate != rate else None)
+    data      = np.memmap(path, dtype=layout["dtype"], mode="r",
+                          offset=layout["offset"],
+                          shape=(layout["frames"], layout["channels"]))
+    try:
+        for start in range(0, layout["frames"], window):
+            audio = _to_float32(data[start:start + window], downmix)
+            if resampler:
+                audio = resampler.process(audio)
+            yield start / rate, audio
+    finally:
+        del data
+
+
+def iter_ffmpeg_windows(path: str, sample_rate: int, window_secs: float,
+                        channels: int = 1):
+    """
+    Stream-decode any format ffmpeg understands to 16-bit PCM and yield
+    fixed windows. A single preallocated buffer is reused throughout.
+    Multi-channel windows come back as (frames, channels).
+    """
+    cmd = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", path,
+        "-f", "s16le", "-ac", str(channels), "-ar", str(sample_rate),
+        "-",
+    ]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found — install it to analyze non-WAV recordings.")
+
+    # Drain stderr alongside stdout so a chatty decoder can't block on a full pipe
+    errors = bytearray()
+    drain  = threading.Thread(target=lambda: errors.extend(proc.stderr.read()), daemon=True)
+    drain.start()
+
+    window     = int(sample_rate * window_secs)
+    frame_size = 2 * channels
+    buf        = bytearray(window * frame_size)
+    view       = memoryview(buf)
+    start      = 0
+    at_eof     = False
+    try:
+        while True:
+            got = 0
+            while got < len(buf):
+                n = proc.stdout.readinto(view[got:])
+                if not n:
+                    at_eof = True
+                    break
+                got += n
+            frames = got // frame_size
+            if frames == 0:
+                break
+            pcm   = np.frombuffer(buf, dtype=np.int16, count=frames * channels)
+            audio = pcm.astype(np.float32) * (1.0 / 32768.0)
+            if channels > 1:
+                audio = audio.reshape(frames, channels)
+            yield start / sample_rate, audio
+            start += frames
+            if at_eof:
+                break
+    finally:
+        proc.stdout.close()
+        if not at_eof:                  # generator closed early: stop decoding
+            proc.kill()
+        proc.wait()
+        drain.join()
+        proc.stderr.close()
+
+    if proc.returncode != 0:
+        msg = errors.decode(errors="replace").strip() or f"exit status {proc.returncode}"
+        raise RuntimeError(f"ffmpeg could not decode {path}: {msg}")
+
+
+def iter_audio_windows(path: str, sample_rate: int = 16000, window_secs: float = 30,
+                       channels: int = 1):
+    """
+    Yield (start_secs, float32 audio) windows from an audio file: mono
+    1-D arrays for channels=1, (frames, channels) arrays otherwise.
+    PCM/float WAVs are memory-mapped (and resampled in-process if needed);
+    everything else, and WAVs with other channel counts, is stream-decoded
+    by ffmpeg.
+    """
+    layout = _wav_layout(path)
+    if layout is not None and (channels == 1 or layout["channels"] == channels):
+        yield from iter_wav_windows(path, layout, window_secs,
+                                    downmix=channels == 1, sample_rate=sample_rate)
+    else:
+        yield from iter_ffmpeg_windows(path, sample_rate, window_secs, channels)
+
+
+def format_offset(secs: float) -> str:
+    """Seconds → HH:MM:SS offset within a recording."""
+    secs = int(secs)
+    return f"{secs // 3600:02d}:{secs % 3600 // 60:02d}:{secs % 60:02d}"
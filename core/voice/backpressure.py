@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import time
+import threading
+import numpy as np
+from collections import deque
+
+POLICIES = ("drop_oldest", "merge", "degrade")
+
+class AudioChunk:
+    __slots__ = ("audio", "secs", "captured_at", "record_ms")
+
+    def __init__(self, audio: np.ndarray, sample_rate: int, record_ms: float = 0.0):
+        self.audio       = audio
+        self.secs        = len(audio) / sample_rate
+        self.captured_at = time.monotonic()   # end of this chunk's audio
+        self.record_ms   = record_ms
+
+
+class ChunkQueue:
+    """
+    Bounded hand-off between mic capture and Whisper inference.
+
+    When inference falls behind, the queue fills and the overflow policy
+    decides what happens to new audio:
+      drop_oldest — discard the oldest queued chunk (counted in dropped_secs)
+      merge       — concatenate the two oldest chunks into one longer
+                    Whisper call, up to max_merge_secs; then drop oldest
+      degrade     — drop oldest on overflow, and signal the consumer to
+                    switch to a cheaper model while the backlog persists
+    """
+
+    def __init__(self, sample_rate: int, max_chunks: int = 3,
+                 policy: str = "drop_oldest", max_merge_secs: float = 15.0):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}'. Use one of {POLICIES}.")
+        self.sample_rate    = sample_rate
+        self.max_chunks     = max(1, max_chunks)
+        self.policy         = policy
+        self.max_merge_secs = max_merge_secs
+
+        self._chunks = deque()
+        self._cond   = threading.Condition()
+
+        self.dropped_secs  = 0.0
+        self.dropped       = 0
+        self.merged        = 0
+        self.degraded      = False
+
+    # ── Producer side ────────────────────────────────────────
+    def put(self, audio: np.ndarray, record_ms: float = 0.0):
+        chunk = AudioChunk(audio, self.sample_rate, record_ms)
+        with self._cond:
+            if len(self._chunks) >= self.max_chunks:
+                self._overflow()
+            self._chunks.append(chunk)
+            if self.policy == "degrade" and len(self._chunks) >= self.max_chunks:
+                self.degraded = True
+            self._cond.notify()
+
+    def _overflow(self):
+        if self.policy == "merge" and len(self._chunks) >= 2:
+            first, second = self._chunks[0], self._chunks[1]
+            if first.secs + second.secs <= self.max_merge_secs:
+                second.audio     = np.concatenate((first.audio, second.audio))
+                second.secs     += first.secs
+                second.record_ms += first.record_ms
+                self._chunks.popleft()
+                self.merged += 1
+                return
+        oldest = self._chunks.popleft()
+        self.dropped_secs += oldest.secs
+        self.dropped      += 1
+
+    # ── Consumer side ────────────────────────────────────────
+    def get(self, timeout: float = None):
+        """Oldest queued chunk, or None if nothing arrived within timeout."""
+        with self._cond:
+            if not self._chunks:
+                self._cond.wait(timeout)
+            if not self._chunks:
+                return None
+            chunk = self._chunks.popleft()
+            if not self._chunks:
+                self.degraded = False   # backlog cleared
+            return chunk
+
+    def stats(self, chunk: AudioChunk = None) -> dict:
+        """Backlog counters; pass the chunk being processed to get its lag."""
+        with self._cond:
+            depth       = len(self._chunks)
+            queued_secs = sum(c.secs for c in self._chunks)
+        lag = time.monotonic() - chunk.captured_at if chunk else 0.0
+        return {
+            "queue_depth" : depth,
+            "queued_secs" : round(queued_secs, 2),
+            "lag_secs"    : round(lag, 2),
+            "dropped_secs": round(self.dropped_secs, 2),
+            "dropped"     : self.dropped,
+            "merged"      : self.merged,
+            "degraded"    : self.degraded,
+            "policy"      : self.policy,
+        }
+
+    def clear(self):
+        with self._cond:
+            self._chunks.clear()
+            self.dropped_secs = 0.0
+            self.dropped      = 0
+            self.merged       = 0
+            self.degraded     = False
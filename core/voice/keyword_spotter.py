@@ -0,0 +1,209 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import re
+import glob
+import time
+import numpy as np
+from core.voice.audio_io import iter_audio_windows
+from config import (KWS_TEMPLATE_DIR, KWS_THRESHOLD, KWS_SILENCE_RMS,
+                    KWS_SAMPLE_EVERY, KWS_HOLD_CHUNKS, KWS_ESCALATE_BEAM)
+
+# ── MFCC front end ───────────────────────────────────────────
+class MFCC:
+    """Minimal NumPy MFCC extractor (25 ms frames, 10 ms hop, CMVN)."""
+
+    def __init__(self, sample_rate=16000, n_fft=512, n_mels=26, n_mfcc=13):
+        self.sample_rate = sample_rate
+        self.frame_len   = int(0.025 * sample_rate)
+        self.hop         = int(0.010 * sample_rate)
+        self.n_fft       = n_fft
+        self.window      = np.hamming(self.frame_len).astype(np.float32)
+        self.mel_fb      = self._mel_filterbank(n_mels)
+        # DCT-II basis, precomputed once
+        k = np.arange(n_mfcc)[:, None]
+        n = np.arange(n_mels)[None, :]
+        self.dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)).astype(np.float32)
+
+    def _mel_filterbank(self, n_mels):
+        def hz_to_mel(f):
+            return 2595.0 * np.log10(1.0 + f / 700.0)
+
+        def mel_to_hz(m):
+            return 700.0 * (10 ** (m / 2595.0) - 1.0)
+
+        mels  = np.linspace(hz_to_mel(0), hz_to_mel(self.sample_rate / 2), n_mels + 2)
+        bins  = np.floor((self.n_fft + 1) * mel_to_hz(mels) / self.sample_rate).astype(int)
+        fb    = np.zeros((n_mels, self.n_fft // 2 + 1), dtype=np.float32)
+        for m in range(1, n_mels + 1):
+            lo, mid, hi = bins[m - 1], bins[m], bins[m + 1]
+            if mid > lo:
+                fb[m - 1, lo:mid] = (np.arange(lo, mid) - lo) / (mid - lo)
+            if hi > mid:
+                fb[m - 1, mid:hi] = (hi - np.arange(mid, hi)) / (hi - mid)
+        return fb
+
+    def __call__(self, audio: np.ndarray) -> np.ndarray:
+        """audio (float32 mono) → (frames, n_mfcc) normalized features."""
+        if len(audio) < self.frame_len:
+            return np.zeros((0, self.dct.shape[0]), dtype=np.float32)
+        emph   = np.append(audio[:1], audio[1:] - 0.97 * audio[:-1]).astype(np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(emph, self.frame_len)[::self.hop]
+        spec   = np.abs(np.fft.rfft(frames * self.window, n=self.n_fft)) ** 2
+        logmel = np.log(spec @ self.mel_fb.T + 1e-10)
+        feats  = logmel @ self.dct.T
+        feats -= feats.mean(axis=0)
+        feats /= feats.std(axis=0) + 1e-8
+        return feats
+
+
+# ── Template matching ────────────────────────────────────────
+def _unit_rows(x: np.ndarray) -> np.ndarray:
+    return x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-8)
+
+
+def subsequence_dtw(template: np.ndarray, query: np.ndarray) -> float:
+    """
+    Best normalized DTW cost of `template` against any span of `query`.
+    Steps (1,1), (1,2), (2,1) bound the warp to 0.5x–2x speed, which lets
+    each template row be computed as one vectorized NumPy operation.
+    """
+    n, m = len(template), len(query)
+    if n == 0 or m < n // 2:
+        return np.inf
+    cost = 1.0 - template @ query.T          # cosine distance, (n, m)
+
+    prev2 = None
+    prev  = cost[0].copy()
+    best  = np.empty(m, dtype=cost.dtype)
+    for i in range(1, n):
+        best.fill(np.inf)
+        best[1:] = prev[:-1]
+        np.minimum(best[2:], prev[:-2], out=best[2:])
+        if prev2 is not None:
+            np.minimum(best[1:], prev2[:-1], out=best[1:])
+        prev2, prev = prev, cost[i] + best
+    return float(prev.min() / n)
+
+
+class KeywordSpotter:
+    """
+    MFCC template matcher for high-value phrases ("digital arrest", "CBI",
+    "transfer"...). Templates are short 16 kHz recordings of each phrase
+    in KWS_TEMPLATE_DIR, named after the phrase (digital_arrest.wav,
+    digital_arrest_2.wav, ...), or added at runtime with enroll().
+    """
+
+    def __init__(self, template_dir=KWS_TEMPLATE_DIR, threshold=KWS_THRESHOLD,
+                 sample_rate=16000):
+        self.sample_rate = sample_rate
+        self.threshold   = threshold
+        self.mfcc        = MFCC(sample_rate)
+        self.templates   = []          # (phrase, unit-normalized MFCCs)
+        if template_dir and os.path.isdir(template_dir):
+            self.load_templates(template_dir)
+
+    def load_templates(self, template_dir: str):
+        for path in sorted(glob.glob(os.path.join(template_dir, "*"))):
+            stem   = os.path.splitext(os.path.basename(path))[0]
+            phrase = re.sub(r"_\d+$", "", stem).replace("_", " ")
+            try:
+                audio = np.concatenate([w for _, w in
+                                        iter_audio_windows(path, self.sample_rate, 10)])
+            except (RuntimeError, ValueError) as e:
+                print(f"[!] Skipping keyword template {path}: {e}")
+                continue
+            self.enroll(phrase, audio)
+        print(f"[✓] Keyword spotter: {len(self.templates)} templates loaded.")
+
+    def enroll(self, phrase: str, audio: np.ndarray):
+        feats = self.mfcc(audio)
+        if len(feats):
+            self.templates.append((phrase, _unit_rows(feats)))
+
+    def scan(self, audio: np.ndarray):
+        """Return (phrase, cost) of the best match under threshold, else None."""
+        if not self.templates:
+            return None
+        query = _unit_rows(self.mfcc(audio))
+        best  = None
+        for phrase, template in self.templates:
+            cost = subsequence_dtw(template, query)
+            if cost < self.threshold and (best is None or cost < best[1]):
+                best = (phrase, round(cost, 3))
+        return best
+
+
+# ── Escalation policy ────────────────────────────────────────
+class TranscriptionGate:
+    """
+    Decides how much Whisper each live chunk gets:
+      full    — a keyword fired (or recent NLP risk): high beam width
+      sampled — benign stretch: cheap greedy pass on every Nth chunk
+      skip    — silence, or a benign chunk between samples
+    With no templates loaded every chunk is transcribed as before.
+    """
+
+    def __init__(self, spotter: KeywordSpotter, sample_every=KWS_SAMPLE_EVERY,
+                 hold_chunks=KWS_HOLD_CHUNKS, full_beam=KWS_ESCALATE_BEAM,
+                 silence_rms=KWS_SILENCE_RMS):
+        self.spotter      = spotter
+        self.sample_every = max(1, sample_every)
+        self.hold_chunks  = hold_chunks
+        self.full_beam    = full_beam
+        self.silence_rms  = silence_rms
+        self.reset()
+
+    def reset(self):
+        self.hold     = 0
+        self.since    = 0
+        self.counts   = {"full": 0, "sampled": 0, "skip": 0}
+        self.kws_ms   = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.spotter and self.spotter.templates)
+
+    def decide(self, audio: np.ndarray) -> dict:
+        if not self.enabled:
+            return self._count({"mode": "full", "beam_size": 5, "keyword": None})
+
+        rms = float(np.sqrt(np.mean(np.square(audio)))) if len(audio) else 0.0
+        if rms < self.silence_rms:
+            return self._count({"mode": "skip", "beam_size": 0, "keyword": None})
+
+        t0  = time.perf_counter()
+        hit = self.spotter.scan(audio)
+        self.kws_ms += (time.perf_counter() - t0) * 1000
+
+        if hit:
+            self.hold = self.hold_chunks
+            return self._count({"mode": "full", "beam_size": self.full_beam,
+                                "keyword": hit[0], "kws_cost": hit[1]})
+        if self.hold > 0:
+            self.hold -= 1
+            return self._count({"mode": "full", "beam_size": self.full_beam, "keyword": None})
+
+        self.since += 1
+        if self.since >= self.sample_every:
+            self.since = 0
+            return self._count({"mode": "sampled", "beam_size": 1, "keyword": None})
+        return self._count({"mode": "skip", "beam_size": 0, "keyword": None})
+
+    def feedback(self, result: dict):
+        """Keep full transcription going while the NLP engine sees risk."""
+        if self.enabled and result.get("risk_level", "SAFE") != "SAFE":
+            self.hold = max(self.hold, self.hold_chunks)
+
+    def _count(self, decision: dict) -> dict:
+        self.counts[decision["mode"]] += 1
+        return decision
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values()) or 1
+        return {
+            **self.counts,
+            "transcribed_ratio": round((self.counts["full"] + self.counts["sampled"]) / total, 3),
+            "kws_ms_per_chunk" : round(self.kws_ms / total, 2),
+        }
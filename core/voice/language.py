@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.nlp.scam_detector import ScamDetector
+from config import (LANGUAGE_PIN_CONFIRM_CHUNKS, LANGUAGE_PIN_MIN_PROB,
+                    LANGUAGE_PIN_RECHECK_CHUNKS)
+
+# Script family each pinnable language is written in (see
+# ScamDetector.detect_script). Languages not listed expect Latin or
+# another script the detector doesn't recognise.
+LANGUAGE_SCRIPTS = {
+    "hi": "devanagari", "mr": "devanagari", "ne": "devanagari", "sa": "devanagari",
+    "kn": "kannada",
+    "ta": "tamil",
+}
+
+class LanguagePinner:
+    """
+    Call-level language pinning for Whisper.
+
+    Whisper runs a language-detection decoder pass on every transcribe()
+    call. A call rarely switches language, so once a few confident chunks
+    agree we pass `language=` explicitly and skip that pass. The pin is
+    dropped when the transcript's script disagrees with it, and Whisper is
+    allowed to re-detect once every `recheck_every` pinned chunks.
+    """
+
+    def __init__(self, detector=None,
+                 confirm_chunks=LANGUAGE_PIN_CONFIRM_CHUNKS,
+                 min_prob=LANGUAGE_PIN_MIN_PROB,
+                 recheck_every=LANGUAGE_PIN_RECHECK_CHUNKS):
+        self.detector       = detector or ScamDetector()
+        self.confirm_chunks = confirm_chunks
+        self.min_prob       = min_prob
+        self.recheck_every  = recheck_every
+        self.reset()
+
+    def reset(self):
+        self.language      = None    # pinned Whisper language code
+        self.candidate     = None
+        self.streak        = 0
+        self.pinned_chunks = 0
+        self._forced       = False
+
+    # ── Before transcribe ────────────────────────────────────
+    def transcribe_kwargs(self) -> dict:
+        """Extra kwargs for model.transcribe() on the next chunk."""
+        self._forced = (self.language is not None
+                        and self.pinned_chunks < self.recheck_every)
+        return {"language": self.language} if self._forced else {}
+
+    # ── After transcribe ─────────────────────────────────────
+    def update(self, info, text: str):
+        """Feed back Whisper's TranscriptionInfo and the chunk transcript."""
+        if not text or info is None:
+            return   # silence says nothing about the language
+
+        if self._forced:
+            self.pinned_chunks += 1
+            if self._script_changed(text):
+                print(f"[*] Script change detected — unpinning '{self.language}'")
+                self.reset()
+            return
+
+        detected = info.language
+        prob     = info.language_probability or 0.0
+
+        if self.language is not None:
+            # Periodic re-check of an existing pin
+            if detected == self.language or prob < self.min_prob:
+                self.pinned_chunks = 0
+                return
+            print(f"[*] Language changed {self.language} → {detected} — unpinning")
+            self.reset()
+
+        if prob < self.min_prob:
+            self.candidate, self.streak = None, 0
+            return
+
+        if detected == self.candidate:
+            self.streak += 1
+        else:
+            self.candidate, self.streak = detected, 1
+
+        if self.streak >= self.confirm_chunks:
+            self.language      = detected
+            self.pinned_chunks = 0
+            print(f"[✓] Language pinned: {detected}")
+
+    def _script_changed(self, text: str) -> bool:
+        """True when the transcript is written in another script family."""
+        script = self.detector.detect_script(text)
+        # Romanized speech is common under any pin, so only a native-script
+        # hit that differs from the pinned language's family is a switch.
+        return script is not None and script != LANGUAGE_SCRIPTS.get(self.language)
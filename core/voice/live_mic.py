@@ -11,31 +11,85 @@ import sounddevice as sd
 from datetime import datetime
 from faster_whisper import WhisperModel
 from core.nlp.scam_detector import ScamDetector
-from config import LOG_PATH
+from core.voice.language import LanguagePinner
+from core.timing import StageTimer
+from core.voice.backpressure import ChunkQueue
+from core.voice.keyword_spotter import KeywordSpotter, TranscriptionGate
+from core.voice.multichannel import ChannelTranscriber
+from core.voice.resample import StreamingResampler, device_input_rate
+from config import (LOG_PATH, STAGE_TIMER_WINDOW, MIC_QUEUE_MAX_CHUNKS,
+                    MIC_QUEUE_POLICY, MIC_MAX_MERGE_SECS, MIC_DEGRADE_MODEL,
+                    CALL_CHANNELS, CALLER_CHANNEL, MIC_CAPTURE_RATE)
 
 class LiveMicDetector:
-    def __init__(self, callback=None):
+    def __init__(self, callback=None, queue_policy=MIC_QUEUE_POLICY,
+                 max_queue=MIC_QUEUE_MAX_CHUNKS, channels=CALL_CHANNELS,
+                 caller_channel=CALLER_CHANNEL):
         """
         callback: function called with result dict after each chunk analysis.
-                  Used by dashboard to update UI in real-time.
+                  Used by dashboard to update UI in real-time. Every result
+                  carries a "backlog" dict (queue depth, lag, dropped secs);
+                  silent and skipped chunks come through with an empty
+                  transcript so the backlog is reported for them too.
+        queue_policy: what to do when Whisper falls behind the mic —
+                  "drop_oldest", "merge" or "degrade" (see ChunkQueue).
+        channels: capture channels; with 2+ each party is transcribed in
+                  parallel and only caller_channel is scored.
         """
         print("[*] Loading Whisper model (base)...")
-        self.model        = WhisperModel("base", device="cpu", compute_type="int8")
+        workers           = max(1, channels)
+        self.model        = WhisperModel("base", device="cpu", compute_type="int8",
+                                         num_workers=workers)
+        self.fallback_model = None
+        if queue_policy == "degrade":
+            print(f"[*] Loading fallback Whisper model ({MIC_DEGRADE_MODEL})...")
+            self.fallback_model = WhisperModel(MIC_DEGRADE_MODEL, device="cpu",
+                                               compute_type="int8", num_workers=workers)
+        self.channels       = channels
+        self.caller_channel = caller_channel
         self.detector     = ScamDetector()
+        self.language_pin = LanguagePinner(self.detector)
+        self.channel_transcriber = (ChannelTranscriber(self.model, channels, self.detector)
+                                    if channels > 1 else None)
         self.callback     = callback
         self.is_running   = False
+        self.capture_error  = None     # set by the capture thread if it dies
         self.sample_rate  = 16000
         self.chunk_secs   = 5        # analyze every 5 seconds
         self.results      = []
+        self.timer        = StageTimer(STAGE_TIMER_WINDOW,
+                                       realtime_exclude=("record", "queue"))
+        self.queue        = ChunkQueue(self.sample_rate, max_queue,
+                                       queue_policy, MIC_MAX_MERGE_SECS)
+        self.gate         = TranscriptionGate(KeywordSpotter(sample_rate=self.sample_rate))
+        if not self.gate.enabled:
+            print("[*] No keyword templates — transcribing every chunk.")
         print("[✓] Live Mic Detector ready.")
 
     # ── Audio helpers ────────────────────────────────────────
-    def _record_chunk(self) -> np.ndarray:
-        frames = int(self.sample_rate * self.chunk_secs)
-        audio  = sd.rec(frames, samplerate=self.sample_rate,
-                        channels=1, dtype="float32")
-        sd.wait()
-        return audio.flatten()
+    def _capture_loop(self):
+        """
+        Record back-to-back chunks into the queue until stopped. Capture
+        runs at the device's native rate; a streaming resampler brings it
+        to 16 kHz without seams between chunks. Any failure (no device,
+        PortAudio error) stops the session and is re-raised by start().
+        """
+        try:
+            rate      = MIC_CAPTURE_RATE or device_input_rate()
+            resampler = StreamingResampler(rate, self.sample_rate)
+            frames    = int(rate * self.chunk_secs)
+            with sd.InputStream(samplerate=rate, channels=self.channels,
+                                dtype="float32") as stream:
+                while self.is_running:
+                    t0 = time.perf_counter()
+                    audio, _ = stream.read(frames)
+                    audio    = audio[:, 0] if self.channels == 1 else audio
+                    audio    = resampler.process(audio).copy()
+                    self.queue.put(audio, (time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            # Hand the error to start(), which would otherwise wait forever
+            self.capture_error = e
+            self.is_running    = False
 
     def _save_wav(self, audio: np.ndarray) -> str:
         tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
@@ -46,18 +100,50 @@ class LiveMicDetector:
             wf.writeframes((audio * 32767).astype(np.int16).tobytes())
         return tmp.name
 
-    def _transcribe(self, wav_path: str) -> str:
-        segments, _ = self.model.transcribe(wav_path, beam_size=5)
-        return " ".join(seg.text for seg in segments).strip()
+    def _transcribe(self, wav_path: str, degraded: bool = False,
+                    beam_size: int = 5) -> str:
+        model = self.fallback_model if degraded else self.model
+        segments, info = model.transcribe(
+            wav_path, beam_size=1 if degraded else beam_size,
+            **self.language_pin.transcribe_kwargs()
+        )
+        text = " ".join(seg.text for seg in segments).strip()
+        self.language_pin.update(info, text)
+        return text
 
     # ── Single chunk pipeline ────────────────────────────────
-    def process_chunk(self, audio: np.ndarray) -> dict:
-        wav  = self._save_wav(audio)
-        text = self._transcribe(wav)
-        os.unlink(wav)
+    def process_chunk(self, audio: np.ndarray, chunk=None) -> dict:
+        """chunk: the queued AudioChunk this audio came from, if any."""
+        timer = self.timer
+        if chunk is not None:
+            timer.add("record", chunk.record_ms)
+            timer.add("queue", (time.monotonic() - chunk.captured_at) * 1000)
+        degraded = self.queue.degraded and self.fallback_model is not None
+
+        multichannel = audio.ndim == 2
+        caller_audio = audio[:, self.caller_channel] if multichannel else audio
+
+        with timer.stage("kws"):
+            decision = self.gate.decide(caller_audio)
+
+        text, texts = "", None
+        if decision["mode"] != "skip" and multichannel:
+            with timer.stage("transcribe"):
+                texts = self.channel_transcriber.transcribe(
+                    audio, 1 if degraded else decision["beam_size"],
+                    self.fallback_model if degraded else None)
+            text = texts[self.caller_channel]
+        elif decision["mode"] != "skip":
+            with timer.stage("wav"):
+                wav = self._save_wav(audio)
+            try:
+                with timer.stage("transcribe"):
+                    text = self._transcribe(wav, degraded, decision["beam_size"])
+            finally:
+                os.unlink(wav)
 
         if not text:
-            return {
+            result = {
                 "transcript" : "",
                 "risk_level" : "SAFE",
                 "total_score": 0,
@@ -65,14 +151,28 @@ class LiveMicDetector:
                 "found_keywords": [],
                 "found_patterns": [],
                 "timestamp"  : datetime.now().strftime("%H:%M:%S"),
+                "latency"    : timer.end_chunk(len(audio) / self.sample_rate),
+                "backlog"    : self.queue.stats(chunk),
+                "kws"        : decision,
+                "channel_transcripts": texts,
             }
+        else:
+            with timer.stage("nlp"):
+                result = self.detector.analyze_text(text)
+            result["transcript"] = text
+            result["timestamp"]  = datetime.now().strftime("%H:%M:%S")
+            result["pinned_language"] = (
+                self.channel_transcriber.pinners[self.caller_channel].language
+                if multichannel else self.language_pin.language)
+            result["latency"]    = timer.end_chunk(len(audio) / self.sample_rate)
+            result["backlog"]    = self.queue.stats(chunk)
+            result["kws"]        = decision
+            result["channel_transcripts"] = texts
+            self.gate.feedback(result)
+            self.results.append(result)
 
-        result              = self.detector.analyze_text(text)
-        result["transcript"] = text
-        result["timestamp"]  = datetime.now().strftime("%H:%M:%S")
-        self.results.append(result)
-
-        # Fire callback for live UI updates
+        # Fire callback for live UI updates — every chunk, so backlog
+        # growth shows up during silence and skipped chunks too
         if self.callback:
             self.callback(result)
 
@@ -80,14 +180,33 @@ class LiveMicDetector:
 
     # ── Main loop ────────────────────────────────────────────
     def start(self):
-        self.is_running = True
+        self.is_running    = True
+        self.capture_error = None
+        self.language_pin.reset()
+        if self.channel_transcriber:
+            self.channel_transcriber.reset()
+        self.queue.clear()
+        self.gate.reset()
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
         print("\n[🎙️] Listening... Press Ctrl+C to stop.\n")
         try:
             while self.is_running:
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] Recording chunk...")
-                audio  = self._record_chunk()
-                result = self.process_chunk(audio)
+                chunk = self.queue.get(timeout=0.5)
+                if chunk is None:
+                    continue
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Processing chunk...")
+                result  = self.process_chunk(chunk.audio, chunk)
+                backlog = result["backlog"]
+                if backlog["lag_secs"] > self.chunk_secs or backlog["dropped"]:
+                    print(f"  [!] {backlog['lag_secs']}s behind live | "
+                          f"queued {backlog['queue_depth']} | "
+                          f"dropped {backlog['dropped_secs']}s"
+                          f"{' | degraded model' if backlog['degraded'] else ''}")
 
+                if result["kws"]["mode"] == "skip":
+                    print("  [~] Skipped (no keyword / silence).\n")
+                    continue
                 if not result["transcript"]:
                     print("  [~] No speech detected.\n")
                     continue
@@ -96,6 +215,8 @@ class LiveMicDetector:
                 print(f"  Transcript : {result['transcript']}")
                 print(f"  Risk Level : {rl}")
                 print(f"  Score      : {result['total_score']}")
+                print(f"  Latency    : {result['latency']['total_ms']} ms "
+                      f"(RTF {result['latency'].get('rtf', 0)})")
                 if result["alert"]:
                     print("  ⚠️  🚨 SCAM DETECTED 🚨 ⚠️")
                 print()
@@ -104,10 +225,31 @@ class LiveMicDetector:
             self.is_running = False
             print("\n[✓] Monitoring stopped.")
             print(self.detector.get_risk_summary(self.results))
+            if self.gate.enabled:
+                print(f"Keyword gate: {self.gate.stats()}")
+        except Exception:
+            self.is_running = False             # stop the capture thread too
+            raise
+
+        if self.capture_error is not None:
+            print(f"\n[!] Audio capture failed: {self.capture_error}")
+            raise self.capture_error
 
     def stop(self):
         self.is_running = False
 
+    def get_latency_stats(self) -> dict:
+        """Rolling p50/p95/p99 per pipeline stage and real-time factor."""
+        return self.timer.summary()
+
+    def get_backlog_stats(self) -> dict:
+        """Current queue depth and dropped/merged counters."""
+        return self.queue.stats()
+
+    def get_gate_stats(self) -> dict:
+        """How many chunks got full / sampled / no transcription."""
+        return self.gate.stats()
+
     # ── Background thread version (for dashboard) ────────────
     def start_background(self):
         self.thread = threading.Thread(target=self.start, daemon=True)
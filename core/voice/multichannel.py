@@ -0,0 +1,52 @@
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from core.voice.audio_io import split_channels
+from core.voice.language import LanguagePinner
+
+class ChannelTranscriber:
+    """
+    Transcribes each channel of a multi-channel call recording in
+    parallel. Channels are handed to Whisper as strided views of the
+    interleaved buffer, and each party keeps its own language pin.
+
+    The WhisperModel should be created with num_workers >= channels so
+    CTranslate2 actually runs the concurrent transcribe() calls in
+    parallel instead of serializing them.
+    """
+
+    def __init__(self, model, channels: int, detector=None):
+        self.model    = model
+        self.channels = channels
+        self.pinners  = [LanguagePinner(detector) for _ in range(channels)]
+        self.pool     = ThreadPoolExecutor(max_workers=channels,
+                                           thread_name_prefix="whisper-ch")
+
+    def _transcribe_one(self, model, channel: int, audio: np.ndarray,
+                        beam_size: int) -> str:
+        pin = self.pinners[channel]
+        segments, info = model.transcribe(
+            audio, beam_size=beam_size, **pin.transcribe_kwargs()
+        )
+        text = " ".join(seg.text for seg in segments).strip()
+        pin.update(info, text)
+        return text
+
+    def transcribe(self, audio: np.ndarray, beam_size: int = 5, model=None) -> list:
+        """(frames, channels) float32 audio → one transcript per channel."""
+        model   = model or self.model
+        futures = [
+            self.pool.submit(self._transcribe_one, model, c, view, beam_size)
+            for c, view in enumerate(split_channels(audio))
+        ]
+        return [f.result() for f in futures]
+
+    def languages(self) -> list:
+        return [p.language for p in self.pinners]
+
+    def reset(self):
+        for p in self.pinners:
+            p.reset()
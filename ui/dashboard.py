@@ -8,6 +8,7 @@ import streamlit as st
 from datetime import datetime
 from core.nlp.scam_detector import ScamDetector
 from core.document.forensics import DocumentForensics
+from config import STAGE_TIMER_WINDOW, MIC_CAPTURE_RATE
 
 # ── Page config ──────────────────────────────────────────────
 st.set_page_config(
@@ -884,6 +885,8 @@ with tab6:
             if st.button("▶ START MONITORING", use_container_width=True, type="primary"):
                 st.session_state.mic_running = True
                 st.session_state.mic_results = []
+                if "mic_lang_pin" in st.session_state:
+                    st.session_state.mic_lang_pin.reset()
                 st.rerun()
         else:
             if st.button("⏹ STOP MONITORING", use_container_width=True):
@@ -921,6 +924,22 @@ with tab6:
             st.metric("🚨 DANGER Alerts", danger_m)
             st.metric("⚠️ Suspicious",    sus_m)
 
+        if "mic_timer" in st.session_state and st.session_state.mic_timer.history:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("#### ⏱️ Stage Latency")
+            lat = st.session_state.mic_timer.summary()
+            rows = "".join(
+                f"<tr><td style='color:#94a3b8; padding-right:12px;'>{stage}</td>"
+                f"<td>{v['p50']}</td><td>{v['p95']}</td><td>{v['p99']}</td></tr>"
+                for stage, v in lat.items()
+            )
+            st.markdown(f"""
+            <table style='font-family:monospace; font-size:0.75rem; color:#e2e8f0; width:100%;'>
+                <tr style='color:#475569;'><td>stage (ms)</td><td>p50</td><td>p95</td><td>p99</td></tr>
+                {rows}
+            </table>
+            """, unsafe_allow_html=True)
+
     with mic_col2:
         st.markdown("#### 📡 Live Detection Feed")
 
@@ -931,6 +950,9 @@ with tab6:
             import sounddevice as sd
             from faster_whisper import WhisperModel
             from core.nlp.scam_detector import ScamDetector
+            from core.voice.language import LanguagePinner
+            from core.timing import StageTimer
+            from core.voice.resample import StreamingResampler, device_input_rate
 
             # Load models once into session
             if "whisper_model" not in st.session_state:
@@ -940,6 +962,15 @@ with tab6:
                     )
             if "mic_nlp" not in st.session_state:
                 st.session_state.mic_nlp = ScamDetector()
+            if "mic_lang_pin" not in st.session_state:
+                st.session_state.mic_lang_pin = LanguagePinner(st.session_state.mic_nlp)
+            if "mic_timer" not in st.session_state:
+                st.session_state.mic_timer = StageTimer(STAGE_TIMER_WINDOW)
+            if "mic_resampler" not in st.session_state:
+                st.session_state.mic_resampler = StreamingResampler(
+                    MIC_CAPTURE_RATE or device_input_rate(), 16000
+                )
+            timer = st.session_state.mic_timer
 
             feed = st.empty()
             feed.markdown("""
@@ -952,11 +983,14 @@ with tab6:
             """, unsafe_allow_html=True)
 
             # Record
-            audio = sd.rec(
-                16000 * 6, samplerate=16000,
-                channels=1, dtype="float32"
-            )
-            sd.wait()
+            with timer.stage("record"):
+                rs    = st.session_state.mic_resampler
+                audio = sd.rec(
+                    rs.in_rate * 6, samplerate=rs.in_rate,
+                    channels=1, dtype="float32"
+                )
+                sd.wait()
+                audio = rs.process(audio[:, 0])
 
             feed.markdown("""
             <div style='background:#0d1b2a; border:1px solid #3b82f6;
@@ -967,14 +1001,15 @@ with tab6:
             """, unsafe_allow_html=True)
 
             # Save wav
-            tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-            with wave_module.open(tmp.name, "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(16000)
-                wf.writeframes(
-                    (audio.flatten() * 32767).astype(np.int16).tobytes()
-                )
+            with timer.stage("wav"):
+                tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+                with wave_module.open(tmp.name, "wb") as wf:
+                    wf.setnchannels(1)
+                    wf.setsampwidth(2)
+                    wf.setframerate(16000)
+                    wf.writeframes(
+                        (audio.flatten() * 32767).astype(np.int16).tobytes()
+                    )
 
             # Transcribe
             hallucinations = [
@@ -982,16 +1017,20 @@ with tab6:
                 "please subscribe", "subtitles by", "www.",
             ]
             try:
-                segments, info = st.session_state.whisper_model.transcribe(
-                    tmp.name,
-                    beam_size=5,
-                    vad_filter=False,
-                    condition_on_previous_text=False,
-                    no_speech_threshold=0.6,
-                )
-                transcript = " ".join(s.text for s in segments).strip()
-                if any(h in transcript.lower() for h in hallucinations):
-                    transcript = ""
+                with timer.stage("transcribe"):
+                    segments, info = st.session_state.whisper_model.transcribe(
+                        tmp.name,
+                        beam_size=5,
+                        vad_filter=False,
+                        condition_on_previous_text=False,
+                        no_speech_threshold=0.6,
+                        **st.session_state.mic_lang_pin.transcribe_kwargs(),
+                    )
+                    transcript = " ".join(s.text for s in segments).strip()
+                with timer.stage("filter"):
+                    if any(h in transcript.lower() for h in hallucinations):
+                        transcript = ""
+                st.session_state.mic_lang_pin.update(info, transcript)
             except Exception as e:
                 transcript = ""
             finally:
@@ -1001,9 +1040,11 @@ with tab6:
                     pass
 
             if transcript:
-                result = st.session_state.mic_nlp.analyze_text(transcript)
+                with timer.stage("nlp"):
+                    result = st.session_state.mic_nlp.analyze_text(transcript)
                 result["transcript"] = transcript
                 result["timestamp"]  = datetime.now().strftime("%H:%M:%S")
+                result["latency"]    = timer.end_chunk(6)
                 st.session_state.mic_results.append(result)
                 if result["alert"]:
                     st.session_state.total_alerts += 1
@@ -1033,6 +1074,7 @@ with tab6:
                 </div>
                 """, unsafe_allow_html=True)
             else:
+                timer.end_chunk(6)
                 feed.markdown("""
                 <div style='background:#0d1b2a; border:1px solid #1e3a5f;
                             border-radius:10px; padding:20px; text-align:center; color:#475569;'>
@@ -1264,6 +1306,17 @@ with tab8:
     st.markdown("### 📹 Live Deepfake Detector")
     st.caption("Real-time webcam analysis detecting AI-generated faces using blink rate, texture, lighting and movement signals.")
 
+    # Init session state
+    for key, val in [
+        ("video_service", None),
+        ("video_last", None),
+    ]:
+        if key not in st.session_state:
+            st.session_state[key] = val
+
+    video_service = st.session_state.video_service
+    video_running = video_service is not None and video_service.running
+
     st.markdown("""
     <div style='background:#0d1b2a; border:1px solid #1e3a5f;
                 border-radius:10px; padding:20px; margin-bottom:20px;'>
@@ -1276,18 +1329,19 @@ with tab8:
                     • Face texture smoothing<br>
                     • Lighting asymmetry<br>
                     • Unnatural stillness<br>
-                    • Face symmetry anomalies
+                    • Face symmetry anomalies<br>
+                    • GAN frequency artifacts
                 </div>
             </div>
             <div style='flex:1; min-width:180px;'>
                 <div style='color:#60a5fa; font-weight:700; margin-bottom:8px;'>
                     ⚡ How to use</div>
                 <div style='color:#94a3b8; font-size:0.85rem; line-height:2;'>
-                    1. Click Launch Detector<br>
-                    2. A new window opens<br>
+                    1. Click Start Detector<br>
+                    2. Live feed appears here<br>
                     3. Keep face in frame<br>
                     4. Wait 15s to calibrate<br>
-                    5. Press Q to quit
+                    5. Click Stop to end
                 </div>
             </div>
             <div style='flex:1; min-width:180px;'>
@@ -1309,12 +1363,25 @@ with tab8:
     with df_col1:
         st.markdown("#### 🎛️ Controls")
 
-        if st.button("▶ LAUNCH DETECTOR", use_container_width=True, type="primary"):
-            import subprocess
-            import sys
-            subprocess.Popen([sys.executable, "-m", "core.video.deepfake"])
-            st.success("✅ Deepfake Detector launched in new window!")
-            st.info("📌 Press Q in the detector window to close it.")
+        if not video_running:
+            if st.button("▶ START DETECTOR", use_container_width=True, type="primary"):
+                from core.video.service import VideoService
+                if video_service is not None:
+                    video_service.stop()         # camera closed or process exited
+                st.session_state.video_service = VideoService(0)
+                st.session_state.video_service.start()
+                st.session_state.video_last = None
+                st.rerun()
+            if video_service is not None:
+                st.warning("⚠️ Detector stopped — camera closed or unavailable.")
+        else:
+            if st.button("⏹ STOP DETECTOR", use_container_width=True):
+                video_service.stop()
+                st.session_state.video_service = None
+                st.rerun()
+
+        if video_running:
+            risk_box = st.empty()
 
         st.markdown("<br>", unsafe_allow_html=True)
         st.markdown("#### 📊 Detection Signals")
@@ -1322,9 +1389,11 @@ with tab8:
         signals = [
             ("Blink Rate",         "Normal: 12-20/min",  "#3b82f6"),
             ("Texture Score",      "Lower = smoother",   "#8b5cf6"),
+            ("Spectral Artifacts", "Higher = up-sampled","#ec4899"),
             ("Lighting Asymmetry", "Higher = suspicious","#f59e0b"),
             ("Face Symmetry",      "Higher = anomaly",   "#ef4444"),
             ("Movement Score",     "Lower = too still",  "#22c55e"),
+            ("Loop Detection",     "Repeats = replayed", "#14b8a6"),
         ]
         for signal, note, color in signals:
             st.markdown(f"""
@@ -1337,6 +1406,11 @@ with tab8:
             """, unsafe_allow_html=True)
 
     with df_col2:
+        if video_running:
+            st.markdown("#### 📡 Live Feed")
+            frame_box = st.empty()
+            st.markdown("<br>", unsafe_allow_html=True)
+
         st.markdown("#### 🧠 How It Works")
         st.markdown("""
         <div style='background:#0d1b2a; border:1px solid #1e3a5f;
@@ -1367,6 +1441,10 @@ with tab8:
             AI blending around jaw/hairline breaks natural
             face symmetry. We detect this via pixel comparison.<br><br>
 
+            <span style='color:#ef4444;'>🚩 Loops</span> —
+            Pre-recorded clips played on repeat show the same
+            scene again at a fixed period. We match frame hashes.<br><br>
+
             <span style='color:#22c55e; font-weight:700;'>
             Risk threshold: 55+ = DEEPFAKE DETECTED</span>
 
@@ -1391,3 +1469,40 @@ with tab8:
             </div>
         </div>
         """, unsafe_allow_html=True)
+
+    # Frames are read straight from the service's shared-memory ring;
+    # only small result dicts cross the process boundary.
+    if video_running:
+        last_seq = 0
+        for _ in range(40):                      # ~2 s of live view, then rerun for counters
+            seq, view, token = video_service.latest_frame()
+            if seq != last_seq:
+                frame_box.image(view, channels="BGR")
+                if video_service.frame_valid(token):
+                    last_seq = seq               # torn by the writer → redraw next tick
+
+            for r in video_service.poll_results():
+                st.session_state.video_last = r
+                if r["alert"]:
+                    st.session_state.total_alerts += 1
+
+            r = st.session_state.video_last
+            if r:
+                rl    = r["risk_level"]
+                color = "#ef4444" if "DEEPFAKE" in rl else "#f59e0b" if rl=="SUSPICIOUS" else "#22c55e"
+                risk_box.markdown(f"""
+                <div style='background:#0d1b2a; border:2px solid {color};
+                            border-radius:10px; padding:16px; text-align:center; margin-top:12px;'>
+                    <div style='color:{color}; font-weight:700; font-size:1.1rem;'>{rl}</div>
+                    <div style='color:#e2e8f0; font-size:2rem; font-weight:700;'>{r['risk_score']}%</div>
+                    <div style='color:#64748b; font-family:monospace; font-size:0.8rem;'>
+                        blink {r['blink_rate']}/min</div>
+                    {"<div style='color:#ef4444; margin-top:8px; font-size:0.8rem;'>🚩 " +
+                     '<br>🚩 '.join(r['flags']) + "</div>" if r['flags'] else ""}
+                </div>
+                """, unsafe_allow_html=True)
+
+            if not video_service.running:
+                break
+            time.sleep(0.05)
+        st.rerun()